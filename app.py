@@ -5,17 +5,39 @@ Descrição: Sistema completo de portfólio com gestão de projetos e integraç
 """
 
 import os
+import json
+import base64
+import hmac
+import hashlib
+from functools import wraps
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import (Flask, render_template, request, redirect, url_for, flash, jsonify,
+                   make_response, session, abort)
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event, select
+from sqlalchemy.orm import load_only, noload
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
 
+import search
+import database
+import contact_queue
+import contact_guard
+import relacionados
+from page_cache import PageCache, backend_from_url
+
 # Configuração da aplicação Flask
 app = Flask(__name__)
 
+# No Heroku o router adiciona o IP real do cliente em X-Forwarded-For
+if os.environ.get('DYNO'):
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1)
+
 # Configurações de segurança
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+# Token das rotas /admin/metricas/* (sem ele as rotas respondem 404)
+app.config['METRICAS_TOKEN'] = os.environ.get('METRICAS_TOKEN')
 
 # Configuração do Database
 # Usa PostgreSQL em produção (Heroku) e SQLite em desenvolvimento
@@ -31,10 +53,57 @@ else:
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Pool de conexões (tamanho, recycle, timeouts, pre-ping) via variáveis DB_*
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database.engine_options(
+    app.config['SQLALCHEMY_DATABASE_URI']
+)
+
+def calcular_versao_deploy():
+    """
+    Versão do deploy: entra no ETag para invalidar caches quando templates
+    ou arquivos estáticos mudam
+
+    Precisa ser igual em todos os workers e entre reinícios com o mesmo
+    código; por isso usa a release/commit do ambiente ou, localmente, um
+    hash do conteúdo de templates/ e static/.
+
+    Returns:
+        String identificando a versão
+    """
+    for variavel in ('HEROKU_RELEASE_VERSION', 'SOURCE_VERSION'):
+        if os.environ.get(variavel):
+            return os.environ[variavel]
+
+    digest = hashlib.sha256()
+    for pasta in (app.template_folder, app.static_folder):
+        pasta = os.path.join(app.root_path, pasta)
+        for raiz, dirs, arquivos in os.walk(pasta):
+            dirs.sort()
+            for nome in sorted(arquivos):
+                caminho = os.path.join(raiz, nome)
+                digest.update(os.path.relpath(caminho, app.root_path).encode('utf-8'))
+                with open(caminho, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+app.config['VERSAO_DEPLOY'] = calcular_versao_deploy()
+
 # Inicialização de extensões
 db = SQLAlchemy(app)
 migrate = Migrate(app, db)
 
+with app.app_context():
+    database.instrument(db.engine)
+    database.set_statement_timeout(db.engine)
+
+# Cache de páginas renderizadas: Redis se PAGE_CACHE_URL estiver definida,
+# senão LRU em memória (por processo)
+page_cache = PageCache(backend_from_url(
+    os.environ.get('PAGE_CACHE_URL'),
+    max_entries=int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 500))
+))
+
 # =============================================================================
 # MODELOS DE DATABASE
 # =============================================================================
@@ -54,25 +123,286 @@ class Projeto(db.Model):
     data_criacao = db.Column(db.DateTime, default=datetime.utcnow)
     destaque = db.Column(db.Boolean, default=False)
     categoria = db.Column(db.String(50), default='Web')
+    # Id do repositório no GitHub (projetos importados por update_projects.py)
+    github_id = db.Column(db.BigInteger, unique=True, index=True)
+
+    # Tecnologias normalizadas (sincronizadas a partir de `tecnologias`)
+    vinculos_tecnologia = db.relationship(
+        'ProjetoTecnologia',
+        order_by='ProjetoTecnologia.posicao',
+        cascade='all, delete-orphan',
+        lazy='selectin',
+        back_populates='projeto'
+    )
+
+    __table_args__ = (
+        # Paginação por cursor em /api/projetos
+        db.Index('ix_projetos_data_criacao_id', 'data_criacao', 'id'),
+    )
+
+    # Campos que podem ser pedidos via ?fields= na API
+    CAMPOS_API = ('id', 'titulo', 'descricao', 'descricao_curta', 'tecnologias',
+                  'github_url', 'demo_url', 'imagem', 'data_criacao', 'destaque',
+                  'categoria')
 
     def __repr__(self):
         return f'<Projeto {self.titulo}>'
 
-    def to_dict(self):
-        """Converte objeto para dicionário (útil para API)"""
-        return {
-            'id': self.id,
-            'titulo': self.titulo,
-            'descricao': self.descricao,
-            'descricao_curta': self.descricao_curta,
-            'tecnologias': self.tecnologias.split(','),
-            'github_url': self.github_url,
-            'demo_url': self.demo_url,
-            'imagem': self.imagem,
-            'data_criacao': self.data_criacao.strftime('%Y-%m-%d'),
-            'destaque': self.destaque,
-            'categoria': self.categoria
-        }
+    @property
+    def lista_tecnologias(self):
+        """Nomes das tecnologias, na ordem cadastrada"""
+        return [v.tecnologia.nome for v in self.vinculos_tecnologia]
+
+    def to_dict(self, campos=None):
+        """
+        Converte objeto para dicionário (útil para API)
+
+        Args:
+            campos: Subconjunto de CAMPOS_API a incluir (padrão: todos)
+        """
+        campos = campos or self.CAMPOS_API
+        dados = {}
+        for campo in campos:
+            if campo == 'tecnologias':
+                dados[campo] = self.lista_tecnologias
+            elif campo == 'data_criacao':
+                dados[campo] = self.data_criacao.strftime('%Y-%m-%d')
+            else:
+                dados[campo] = getattr(self, campo)
+        return dados
+
+
+class Tecnologia(db.Model):
+    """Tecnologia usada em projetos (ex: Python, Flask)"""
+    __tablename__ = 'tecnologias'
+
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(50), nullable=False)
+    slug = db.Column(db.String(50), nullable=False, unique=True, index=True)
+
+    def __repr__(self):
+        return f'<Tecnologia {self.nome}>'
+
+
+class ProjetoTecnologia(db.Model):
+    """Associação projeto ↔ tecnologia (mantém a ordem de exibição)"""
+    __tablename__ = 'projeto_tecnologia'
+
+    projeto_id = db.Column(db.Integer, db.ForeignKey('projetos.id', ondelete='CASCADE'),
+                           primary_key=True)
+    tecnologia_id = db.Column(db.Integer, db.ForeignKey('tecnologias.id', ondelete='CASCADE'),
+                              primary_key=True)
+    posicao = db.Column(db.Integer, nullable=False, default=0)
+
+    projeto = db.relationship('Projeto', back_populates='vinculos_tecnologia')
+    tecnologia = db.relationship('Tecnologia', lazy='joined')
+
+    __table_args__ = (
+        # Filtro por tecnologia: tecnologia_id → projetos
+        db.Index('ix_projeto_tecnologia_tecnologia', 'tecnologia_id', 'projeto_id'),
+    )
+
+
+def normalizar_tecnologia(nome):
+    """Chave de comparação de tecnologias ('  Flask ' → 'flask')"""
+    return ' '.join(nome.split()).lower()
+
+
+def separar_tecnologias(tecnologias):
+    """Converte 'Python, Flask' em ['Python', 'Flask'] (sem repetições)"""
+    nomes = {}
+    for nome in (tecnologias or '').split(','):
+        nome = ' '.join(nome.split())
+        if nome:
+            nomes.setdefault(normalizar_tecnologia(nome), nome)
+    return list(nomes.values())
+
+
+@event.listens_for(db.session, 'before_flush')
+def sincronizar_tecnologias(session, flush_context, instances):
+    """
+    Atualiza as associações de tecnologias de projetos novos ou cuja
+    coluna `tecnologias` mudou, criando tecnologias que ainda não existem
+    """
+    projetos = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Projeto)
+        and (obj in session.new or db.inspect(obj).attrs.tecnologias.history.has_changes())
+    ]
+    if not projetos:
+        return
+
+    nomes = {normalizar_tecnologia(n): n for p in projetos for n in separar_tecnologias(p.tecnologias)}
+
+    with session.no_autoflush:
+        existentes = {
+            t.slug: t for t in session.scalars(
+                select(Tecnologia).where(Tecnologia.slug.in_(list(nomes)))
+            )
+        } if nomes else {}
+
+        for slug, nome in nomes.items():
+            if slug not in existentes:
+                existentes[slug] = Tecnologia(nome=nome, slug=slug)
+                session.add(existentes[slug])
+
+        for projeto in projetos:
+            atuais = {v.tecnologia.slug: v for v in projeto.vinculos_tecnologia}
+            novos = []
+            for posicao, nome in enumerate(separar_tecnologias(projeto.tecnologias)):
+                slug = normalizar_tecnologia(nome)
+                vinculo = atuais.pop(slug, None) or ProjetoTecnologia(tecnologia=existentes[slug])
+                vinculo.posicao = posicao
+                novos.append(vinculo)
+            projeto.vinculos_tecnologia = novos
+
+
+def sincronizar_tecnologias_em_massa(connection, tecnologias_por_projeto):
+    """
+    Equivalente de sincronizar_tecnologias para escritas sem o ORM
+    (importação em massa), usando poucas queries para todos os projetos
+
+    Args:
+        connection: Conexão da transação atual
+        tecnologias_por_projeto: Dict projeto_id → texto de `tecnologias`
+    """
+    if not tecnologias_por_projeto:
+        return
+
+    tecnologias = Tecnologia.__table__
+    vinculos = ProjetoTecnologia.__table__
+    listas = {projeto_id: separar_tecnologias(texto)
+              for projeto_id, texto in tecnologias_por_projeto.items()}
+    nomes = {normalizar_tecnologia(n): n for lista in listas.values() for n in lista}
+
+    ids = {}
+    if nomes:
+        connection.execute(
+            database.dialect_insert(connection, tecnologias)
+            .on_conflict_do_nothing(index_elements=['slug']),
+            [{'nome': nome, 'slug': slug} for slug, nome in nomes.items()]
+        )
+        ids = dict(connection.execute(
+            select(tecnologias.c.slug, tecnologias.c.id)
+            .where(tecnologias.c.slug.in_(list(nomes)))
+        ).all())
+
+    connection.execute(vinculos.delete().where(vinculos.c.projeto_id.in_(list(listas))))
+    linhas = [
+        {'projeto_id': projeto_id, 'tecnologia_id': ids[normalizar_tecnologia(nome)],
+         'posicao': posicao}
+        for projeto_id, lista in listas.items()
+        for posicao, nome in enumerate(lista)
+    ]
+    if linhas:
+        connection.execute(vinculos.insert(), linhas)
+
+
+@event.listens_for(Projeto, 'after_insert')
+@event.listens_for(Projeto, 'after_update')
+def sincronizar_busca(mapper, connection, projeto):
+    """Mantém o índice de busca textual em dia com a tabela de projetos"""
+    search.sync_projeto(connection, projeto)
+
+
+@event.listens_for(Projeto, 'after_delete')
+def remover_da_busca(mapper, connection, projeto):
+    """Remove o projeto excluído do índice de busca textual"""
+    search.remove_projeto(connection, projeto.id)
+
+
+class ProjetoRelacionado(db.Model):
+    """Ranking pré-calculado de projetos relacionados (ver relacionados.py)"""
+    __tablename__ = 'projetos_relacionados'
+
+    projeto_id = db.Column(db.Integer, db.ForeignKey('projetos.id', ondelete='CASCADE'),
+                           primary_key=True)
+    posicao = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    relacionado_id = db.Column(db.Integer, db.ForeignKey('projetos.id', ondelete='CASCADE'),
+                               nullable=False)
+    pontuacao = db.Column(db.Float, nullable=False)
+
+
+@event.listens_for(db.session, 'after_flush')
+def atualizar_relacionados(session, flush_context):
+    """Recalcula os relacionados afetados por projetos novos/alterados/excluídos"""
+    alterados = {
+        obj.id for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Projeto) and (
+            obj in session.new or any(
+                db.inspect(obj).attrs[campo].history.has_changes()
+                for campo in ('categoria', 'tecnologias', 'data_criacao')
+            )
+        )
+    }
+    removidos = {obj.id for obj in session.deleted if isinstance(obj, Projeto)}
+    if not alterados and not removidos:
+        return
+
+    recalculados = relacionados.refresh(session.connection(), alterados, removidos)
+    # Páginas de detalhe cujos relacionados mudaram
+    session.info.setdefault('page_cache_tags', set()).update(
+        f'projeto:{projeto_id}' for projeto_id in recalculados
+    )
+
+
+class VersaoDados(db.Model):
+    """Contador incrementado a cada alteração de projetos (usado nos ETags)"""
+    __tablename__ = 'versao_dados'
+
+    id = db.Column(db.Integer, primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=0)
+
+
+@event.listens_for(db.session, 'after_flush')
+def incrementar_versao_dados(session, flush_context):
+    """Incrementa a versão dos dados quando projetos são criados/alterados/excluídos"""
+    alterados = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, (Projeto, ProjetoTecnologia)) for obj in alterados):
+        incrementar_versao(session.connection())
+
+
+@event.listens_for(db.session, 'after_flush')
+def coletar_invalidacoes(session, flush_context):
+    """Anota quais páginas do cache dependem dos projetos alterados"""
+    tags = session.info.setdefault('page_cache_tags', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, Projeto):
+            continue
+        # projeto:<id> também marca as páginas que o exibem como relacionado
+        tags.update({'projetos', f'projeto:{obj.id}', f'categoria:{obj.categoria}'})
+        # /projetos?categoria=<anterior> deixa de listar o projeto
+        categoria = db.inspect(obj).attrs.categoria.history
+        tags.update(f'categoria:{anterior}' for anterior in categoria.deleted)
+        # O seletor de categorias aparece em todas as páginas filtradas
+        if obj in session.new or obj in session.deleted or categoria.deleted:
+            tags.add('categorias')
+        destaque = db.inspect(obj).attrs.destaque.history
+        if obj in session.new or obj in session.deleted or obj.destaque or destaque.deleted:
+            tags.add('index')
+
+
+@event.listens_for(db.session, 'after_commit')
+def invalidar_paginas(session):
+    """Invalida as páginas afetadas depois que a transação é confirmada"""
+    tags = session.info.pop('page_cache_tags', None)
+    if tags:
+        page_cache.invalidate(*tags)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def descartar_invalidacoes(session):
+    session.info.pop('page_cache_tags', None)
+
+
+def incrementar_versao(connection):
+    """Incrementa versao_dados (também usado após operações em massa)"""
+    tabela = VersaoDados.__table__
+    resultado = connection.execute(
+        tabela.update().where(tabela.c.id == 1).values(versao=tabela.c.versao + 1)
+    )
+    if resultado.rowcount == 0:
+        connection.execute(tabela.insert().values(id=1, versao=1))
 
 
 class Contato(db.Model):
@@ -91,11 +421,94 @@ class Contato(db.Model):
         return f'<Contato {self.nome} - {self.assunto}>'
 
 
+def gravar_contatos(linhas):
+    """Grava um lote de contatos da fila em uma única transação (executemany)"""
+    for linha in linhas:
+        linha['data_envio'] = datetime.fromisoformat(linha['data_envio'])
+    with app.app_context():
+        db.session.execute(Contato.__table__.insert(), linhas)
+        db.session.commit()
+
+
+# Mensagens de contato: spool local + gravação em lotes em segundo plano
+fila_contatos = contact_queue.create_queue(
+    gravar_contatos, os.path.join(app.instance_path, 'contatos_spool.db')
+)
+
+# Anti-spam do /contato (limites em mensagens por hora)
+filtro_contatos = contact_guard.ContactGuard(
+    contact_guard.buckets_from_url(os.environ.get('RATE_LIMIT_URL')),
+    ip_rate=float(os.environ.get('CONTATO_LIMITE_IP', 10)),
+    email_rate=float(os.environ.get('CONTATO_LIMITE_EMAIL', 5))
+)
+
+
+# =============================================================================
+# CACHE HTTP (ETag / 304)
+# =============================================================================
+
+def versao_projetos():
+    """Versão atual dos dados de projetos (0 se nunca houve escrita)"""
+    versao = db.session.execute(
+        select(VersaoDados.versao).where(VersaoDados.id == 1)
+    ).scalar()
+    return versao or 0
+
+
+def cache_http(max_age=0, depende_dos_dados=True, vary='Accept-Encoding'):
+    """
+    Decorator que adiciona ETag/Cache-Control à rota e responde 304 antes
+    de executar a view quando o cliente já tem a versão atual
+
+    O ETag é derivado da versão do deploy, da versão dos dados (se a rota
+    depende do banco), da URL e dos argumentos da rota.
+
+    Args:
+        max_age: Segundos que o navegador pode reutilizar sem revalidar
+        depende_dos_dados: Se a resposta muda quando projetos mudam
+        vary: Valor do header Vary
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Mensagens flash dependem da sessão: não cachear
+            if session.get('_flashes'):
+                response = make_response(view(*args, **kwargs))
+                response.headers['Cache-Control'] = 'no-store'
+                return response
+
+            partes = [
+                app.config['VERSAO_DEPLOY'],
+                str(versao_projetos()) if depende_dos_dados else '',
+                request.path,
+                '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True))),
+            ]
+            etag = hashlib.sha256('|'.join(partes).encode('utf-8')).hexdigest()[:32]
+            cache_control = f'public, max-age={max_age}, must-revalidate'
+
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            if vary:
+                response.headers['Vary'] = vary
+            return response
+        return wrapper
+    return decorator
+
+
 # =============================================================================
 # ROTAS PRINCIPAIS
 # =============================================================================
 
 @app.route('/')
+@cache_http()
+@page_cache.cached(tags=('index',))
 def index():
     """Homepage - Mostra projetos em destaque"""
     projetos_destaque = Projeto.query.filter_by(destaque=True).order_by(
@@ -110,6 +523,8 @@ def index():
 
 
 @app.route('/projetos')
+@cache_http()
+@page_cache.cached()
 def projetos():
     """Página com todos os projetos - suporta filtros e busca"""
     # Filtros
@@ -117,6 +532,13 @@ def projetos():
     tecnologia = request.args.get('tecnologia')
     busca = request.args.get('busca')
 
+    # Páginas de uma categoria só mudam com projetos dessa categoria (ou
+    # quando o conjunto de categorias muda)
+    if categoria and categoria != 'todas':
+        page_cache.tag(f'categoria:{categoria}', 'categorias')
+    else:
+        page_cache.tag('projetos')
+
     # Query base
     query = Projeto.query
 
@@ -125,9 +547,23 @@ def projetos():
         query = query.filter_by(categoria=categoria)
 
     if tecnologia:
-        query = query.filter(Projeto.tecnologias.contains(tecnologia))
-
-    if busca:
+        # Junção indexada: slug → tecnologia_id → projetos
+        query = query.filter(Projeto.id.in_(
+            select(ProjetoTecnologia.projeto_id)
+            .join(Tecnologia)
+            .where(Tecnologia.slug == normalizar_tecnologia(tecnologia))
+        ))
+
+    # Busca textual (FTS5/tsvector); None = índice indisponível
+    ids_busca = search.search_ids(db.engine, busca) if busca else None
+
+    if busca and ids_busca is not None:
+        query = query.filter(Projeto.id.in_(ids_busca))
+        # Ordenar por relevância
+        if ids_busca:
+            relevancia = {pid: pos for pos, pid in enumerate(ids_busca)}
+            query = query.order_by(db.case(relevancia, value=Projeto.id))
+    elif busca:
         query = query.filter(
             db.or_(
                 Projeto.titulo.contains(busca),
@@ -151,15 +587,21 @@ def projetos():
 
 
 @app.route('/projeto/<int:id>')
+@cache_http()
+@page_cache.cached()
 def projeto_detalhe(id):
     """Página de detalhes de um projeto específico"""
     projeto = Projeto.query.get_or_404(id)
 
-    # Projetos relacionados (mesma categoria, exceto o atual)
-    projetos_relacionados = Projeto.query.filter(
-        Projeto.categoria == projeto.categoria,
-        Projeto.id != projeto.id
-    ).order_by(db.func.random()).limit(3).all()
+    # Projetos relacionados pré-calculados (busca pela chave primária)
+    projetos_relacionados = Projeto.query.join(
+        ProjetoRelacionado, ProjetoRelacionado.relacionado_id == Projeto.id
+    ).filter(
+        ProjetoRelacionado.projeto_id == projeto.id
+    ).order_by(ProjetoRelacionado.posicao).all()
+
+    page_cache.tag(f'projeto:{projeto.id}',
+                   *(f'projeto:{p.id}' for p in projetos_relacionados))
 
     return render_template('projeto-detalhe.html',
                          projeto=projeto,
@@ -167,6 +609,8 @@ def projeto_detalhe(id):
 
 
 @app.route('/sobre')
+@cache_http(max_age=3600, depende_dos_dados=False)
+@page_cache.cached(ttl=None)
 def sobre():
     """Página Sobre Mim - biografia, habilidades, experiência"""
     habilidades = {
@@ -208,10 +652,26 @@ def sobre():
                          educacao=educacao)
 
 
+def rejeitar_contato(espera):
+    """Resposta 429 para envios acima do limite"""
+    flash('Muitas mensagens enviadas. Aguarde um pouco e tente novamente.', 'error')
+    resposta = make_response(render_template('contato.html'), 429)
+    resposta.headers['Retry-After'] = str(max(int(espera) + 1, 1))
+    return resposta
+
+
 @app.route('/contato', methods=['GET', 'POST'])
 def contato():
     """Página de contato com formulário funcional"""
     if request.method == 'POST':
+        # Robôs (honeypot) e excesso de envios por IP: rejeita antes de tudo
+        motivo, espera = filtro_contatos.check_request(request.form, request.remote_addr)
+        if motivo == 'honeypot':
+            # Não avisa o robô de que foi detectado
+            return redirect(url_for('contato'))
+        if motivo:
+            return rejeitar_contato(espera)
+
         # Capturar dados do formulário
         nome = request.form.get('nome')
         email = request.form.get('email')
@@ -220,24 +680,33 @@ def contato():
 
         # Validação básica
         if not all([nome, email, assunto, mensagem]):
+            filtro_contatos.count('incompleta')
             flash('Por favor, preencha todos os campos!', 'error')
             return redirect(url_for('contato'))
 
-        # Criar novo contato
-        novo_contato = Contato(
-            nome=nome,
-            email=email,
-            assunto=assunto,
-            mensagem=mensagem
-        )
+        motivo, espera = filtro_contatos.check_message(nome, email, assunto, mensagem)
+        if motivo == 'duplicada':
+            # Reenvio da mesma mensagem: a primeira já foi aceita
+            flash('Mensagem enviada com sucesso! Entrarei em contato em breve.', 'success')
+            return redirect(url_for('contato'))
+        if motivo:
+            return rejeitar_contato(espera)
 
+        # Enfileirar novo contato (gravado no banco em lote, em segundo plano)
         try:
-            db.session.add(novo_contato)
-            db.session.commit()
+            fila_contatos.enqueue({
+                'nome': nome,
+                'email': email,
+                'assunto': assunto,
+                'mensagem': mensagem,
+                'data_envio': datetime.utcnow().isoformat(),
+                'lido': False
+            })
+            # Só depois de enfileirada: se falhar, o reenvio não é "repetido"
+            filtro_contatos.record_message(email, assunto, mensagem)
             flash('Mensagem enviada com sucesso! Entrarei em contato em breve.', 'success')
             return redirect(url_for('contato'))
         except Exception as e:
-            db.session.rollback()
             flash('Erro ao enviar mensagem. Tente novamente.', 'error')
             app.logger.error(f'Erro ao salvar contato: {e}')
 
@@ -291,14 +760,133 @@ def add_project():
 # API ENDPOINTS (Opcional - para uso futuro)
 # =============================================================================
 
+API_LIMITE_PADRAO = 20
+API_LIMITE_MAXIMO = 100
+
+
+def codificar_cursor(projeto):
+    """Cursor opaco com a posição (data_criacao, id) do último item"""
+    valor = json.dumps([projeto.data_criacao.isoformat(), projeto.id])
+    return base64.urlsafe_b64encode(valor.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    """Inverso de codificar_cursor; ValueError se o cursor for inválido"""
+    try:
+        valor = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data, projeto_id = json.loads(valor)
+        return datetime.fromisoformat(data), int(projeto_id)
+    except Exception:
+        raise ValueError('cursor inválido')
+
+
 @app.route('/api/projetos')
+@cache_http(max_age=60)
 def api_projetos():
-    """Retorna todos os projetos em formato JSON"""
-    projetos_lista = Projeto.query.all()
-    return jsonify([p.to_dict() for p in projetos_lista])
+    """
+    Retorna projetos em formato JSON, paginados por cursor
+
+    Query string:
+        limit: itens por página (padrão 20, máximo 100)
+        cursor: valor recebido no header Link rel="next"
+        fields: campos separados por vírgula (ex: id,titulo,tecnologias)
+    """
+    try:
+        limite = int(request.args.get('limit', API_LIMITE_PADRAO))
+    except ValueError:
+        return jsonify({'erro': 'limit deve ser um número inteiro'}), 400
+    limite = max(1, min(limite, API_LIMITE_MAXIMO))
+
+    campos = None
+    if request.args.get('fields'):
+        campos = [c.strip() for c in request.args['fields'].split(',') if c.strip()]
+        invalidos = [c for c in campos if c not in Projeto.CAMPOS_API]
+        if invalidos:
+            return jsonify({'erro': f"campos inválidos: {', '.join(invalidos)}"}), 400
+
+    query = Projeto.query.order_by(Projeto.data_criacao.desc(), Projeto.id.desc())
+
+    # Projeção: só as colunas pedidas (+ as usadas pelo cursor)
+    if campos:
+        colunas = {'id', 'data_criacao'} | {c for c in campos if c != 'tecnologias'}
+        query = query.options(load_only(*[getattr(Projeto, c) for c in colunas]))
+        if 'tecnologias' not in campos:
+            query = query.options(noload(Projeto.vinculos_tecnologia))
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            data, projeto_id = decodificar_cursor(cursor)
+        except ValueError:
+            return jsonify({'erro': 'cursor inválido'}), 400
+        query = query.filter(db.tuple_(Projeto.data_criacao, Projeto.id) < (data, projeto_id))
+
+    # Um item a mais indica se existe próxima página
+    projetos_lista = query.limit(limite + 1).all()
+    tem_proxima = len(projetos_lista) > limite
+    projetos_lista = projetos_lista[:limite]
+
+    response = jsonify([p.to_dict(campos) for p in projetos_lista])
+
+    if tem_proxima:
+        proximo = codificar_cursor(projetos_lista[-1])
+        args = {k: v for k, v in request.args.items() if k != 'cursor'}
+        link = url_for('api_projetos', _external=True, cursor=proximo, **args)
+        response.headers['Link'] = f'<{link}>; rel="next"'
+        response.headers['X-Next-Cursor'] = proximo
+
+    return response
+
+
+def requer_token_metricas(view):
+    """
+    Decorator das rotas de métricas: exige o header
+    Authorization: Bearer <METRICAS_TOKEN>
+
+    Sem METRICAS_TOKEN configurado as rotas ficam desativadas (404).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = app.config.get('METRICAS_TOKEN')
+        if not token:
+            abort(404)
+
+        enviado = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(enviado.encode('utf-8'), f'Bearer {token}'.encode('utf-8')):
+            response = jsonify({'erro': 'token inválido'})
+            response.status_code = 401
+            response.headers['WWW-Authenticate'] = 'Bearer'
+            return response
+
+        response = make_response(view(*args, **kwargs))
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    return wrapper
+
+
+@app.route('/admin/metricas/cache')
+@requer_token_metricas
+def metricas_cache():
+    """Taxa de acerto do cache de páginas por rota (deste processo)"""
+    return jsonify(page_cache.metrics())
+
+
+@app.route('/admin/metricas/banco')
+@requer_token_metricas
+def metricas_banco():
+    """Uso do pool de conexões deste worker"""
+    return jsonify(database.pool_metrics(db.engine))
+
+
+@app.route('/admin/metricas/contatos')
+@requer_token_metricas
+def metricas_contatos():
+    """Fila de contatos (enfileiradas, gravadas, spool) e rejeições por motivo"""
+    return jsonify(dict(fila_contatos.metrics(), rejeicoes=filtro_contatos.metrics()))
 
 
 @app.route('/api/projeto/<int:id>')
+@cache_http(max_age=60)
 def api_projeto(id):
     """Retorna um projeto específico em formato JSON"""
     projeto = Projeto.query.get_or_404(id)
@@ -364,6 +952,7 @@ if __name__ == '__main__':
     # Criar tabelas se não existirem
     with app.app_context():
         db.create_all()
+        search.create_index(db.engine)
 
     # Executar aplicação
     port = int(os.environ.get('PORT', 5000))
@@ -6,9 +6,10 @@ Autor: Natália Barros
 """
 
 import os
-import json
+import threading
 from flask import Flask, render_template
 from datetime import datetime
+import frontend_data
 
 # ============================================
 # APP
@@ -21,21 +22,159 @@ app.config['SECRET_KEY'] = 'static-site-key'
 # FUNÇÕES AUXILIARES
 # ============================================
 
+# No layout split (frontend_data.py) o projects.json não existe e os
+# dados vêm do projects.index.json + projects/<id>.json do mesmo diretório
+PROJECTS_JSON = 'static/data/projects.json'
+
+# Whitelist de projetos que devem SEMPRE aparecer como destaque
+# independentemente de estrelas ou outras métricas
+FORCED_FEATURED_NAMES = {"NPX-PDF-BRASIL", "plataforma-de-agendamento-com-IA", "customerpulse-ai", "IMOBIA"}
+FEATURED_LIMIT = 6
+
+# Cards no HTML da página de projetos; os demais são montados pelo JS
+# (a partir de static/data/projects.json ou, no layout split, dos
+# projects/<id>.json) ao rolar ou filtrar
+PROJECTS_PAGE_SIZE = 12
+
+# Cache do JSON por processo: só relê quando mtime/tamanho mudam
+_projects_cache = {'key': None, 'data': None, 'index': None}
+_projects_cache_stats = {'hits': 0, 'reloads': 0, 'errors': 0}
+_projects_cache_lock = threading.Lock()
+
+
 def load_projects_data():
     """
     Carrega dados dos projetos do arquivo JSON
-    """
-    json_path = 'static/data/projects.json'
 
-    if not os.path.exists(json_path):
-        return {'projects': [], 'stats': {}}
+    Aceita os dois layouts de frontend_data. O resultado fica em memória e
+    só é relido quando o mtime ou o tamanho do arquivo (projects.json ou
+    projects.index.json) mudam. Se o arquivo sumir ou não puder ser lido/parseado,
+    continua servindo a última versão boa (só retorna vazio se nunca
+    houve uma). O dicionário retornado é compartilhado: não alterar.
+    """
+    empty = {'projects': [], 'stats': {}}
+    directory = os.path.dirname(PROJECTS_JSON)
 
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Erro ao carregar projetos: {e}")
-        return {'projects': [], 'stats': {}}
+        source = frontend_data.data_file(directory)
+        st = os.stat(source)
+    except (OSError, TypeError):
+        return _projects_cache['data'] or empty
+
+    key = (source, st.st_mtime_ns, st.st_size)
+
+    with _projects_cache_lock:
+        if _projects_cache['key'] == key:
+            _projects_cache_stats['hits'] += 1
+            return _projects_cache['data']
+
+        try:
+            data = frontend_data.load_data(directory)
+        except Exception as e:
+            # Não guarda a chave: tenta de novo na próxima requisição
+            _projects_cache_stats['errors'] += 1
+            print(f"Erro ao carregar projetos (mantendo a última versão): {e}")
+            return _projects_cache['data'] or empty
+
+        _projects_cache['key'] = key
+        _projects_cache['data'] = data
+        _projects_cache['index'] = None
+        _projects_cache_stats['reloads'] += 1
+        return data
+
+
+def invalidate_projects_cache():
+    """
+    Força a releitura do JSON na próxima chamada de load_projects_data
+
+    A última versão carregada continua guardada como reserva caso a
+    releitura falhe.
+    """
+    with _projects_cache_lock:
+        _projects_cache['key'] = None
+
+
+class ProjectsIndex:
+    """
+    Estruturas derivadas dos projetos, calculadas uma vez por carga do JSON
+
+    Os handlers das rotas só fazem consultas nestas estruturas, em vez de
+    percorrer a lista de projetos a cada requisição.
+    """
+
+    def __init__(self, data):
+        self.projects = data.get('projects', [])
+        self.stats = data.get('stats', {})
+        self.layout = data.get('layout', 'single')
+        self.by_id = {p['id']: p for p in self.projects}
+
+        # Linguagens e tecnologias distintas (filtros da página de projetos)
+        self.languages = sorted({lang for p in self.projects for lang in p.get('languages', [])})
+        self.technologies = sorted({tech for p in self.projects
+                                    for tech in p.get('technologies', [])})
+
+        # Ordem por estrelas e, no empate, atualização mais recente
+        self.by_stars = sorted(
+            self.projects,
+            key=lambda p: (p.get('stars', 0), p.get('updated_at', '')),
+            reverse=True
+        )
+
+        self.featured = self._resolve_featured()
+
+    def _resolve_featured(self):
+        # IDs vindos do JSON (mais estrelas / definidos manualmente)
+        featured_ids = self.stats.get('featured_projects', [])
+
+        # Encontrar projetos forçados por nome
+        forced_featured_ids = [
+            p['id'] for p in self.projects if p.get('name') in FORCED_FEATURED_NAMES
+        ]
+
+        # Combinar IDs de projetos com mais estrelas com IDs forçados
+        all_featured_ids = list(dict.fromkeys(featured_ids + forced_featured_ids))
+
+        featured = [self.by_id[pid] for pid in all_featured_ids if pid in self.by_id]
+
+        # Completar até FEATURED_LIMIT projetos
+        if len(featured) < FEATURED_LIMIT:
+            chosen = {p['id'] for p in featured}
+            for p in self.projects:
+                if len(featured) >= FEATURED_LIMIT:
+                    break
+                if p['id'] not in chosen:
+                    featured.append(p)
+                    chosen.add(p['id'])
+
+        # Fallback absoluto
+        if not featured:
+            featured = self.projects[:FEATURED_LIMIT]
+
+        return featured
+
+
+def load_projects_index():
+    """
+    Retorna o ProjectsIndex dos dados atuais (recalculado só quando o
+    JSON é relido)
+    """
+    data = load_projects_data()
+    with _projects_cache_lock:
+        index = _projects_cache['index']
+        if index is not None and _projects_cache['data'] is data:
+            return index
+
+    index = ProjectsIndex(data)
+    with _projects_cache_lock:
+        if _projects_cache['data'] is data:
+            _projects_cache['index'] = index
+    return index
+
+
+def projects_cache_info():
+    """Contadores do cache de projetos (hits vs. releituras do disco)"""
+    with _projects_cache_lock:
+        return dict(_projects_cache_stats)
 
 # ============================================
 # CONTEXT PROCESSORS
@@ -57,9 +196,9 @@ def inject_portfolio_info():
 
 @app.context_processor
 def inject_projects_count():
-    data = load_projects_data()
+    stats = load_projects_index().stats
     return {
-        'total_projetos': data.get('stats', {}).get('total_projects', 0)
+        'total_projetos': stats.get('total_projects', 0)
     }
 
 # ============================================
@@ -69,72 +208,29 @@ def inject_projects_count():
 @app.route('/')
 def index():
     """Homepage com projetos em destaque"""
-    data = load_projects_data()
-    projects = data.get('projects', [])
-    stats = data.get('stats', {})
-
-    # IDs vindos do JSON (mais estrelas / definidos manualmente)
-    featured_ids = stats.get('featured_projects', [])
-
-    # Whitelist de projetos que devem SEMPRE aparecer como destaque
-    # independentemente de estrelas ou outras métricas
-    forced_featured_names = {"NPX-PDF-BRASIL", "plataforma-de-agendamento-com-IA", "customerpulse-ai", "IMOBIA"}
-
-    # Encontrar projetos forçados por nome
-    forced_featured = [p for p in projects if p.get('name') in forced_featured_names]
-    forced_featured_ids = [p['id'] for p in forced_featured]
-
-    # Combinar IDs de projetos com mais estrelas com IDs forçados
-    all_featured_ids = list(dict.fromkeys(featured_ids + forced_featured_ids))
-
-    # Mapear projetos por ID
-    projects_by_id = {p['id']: p for p in projects}
-
-    featured_projects = [
-        projects_by_id[pid]
-        for pid in all_featured_ids
-        if pid in projects_by_id
-    ]
-
-    # Completar até 6 projetos
-    if len(featured_projects) < 6:
-        remaining = [
-            p for p in projects
-            if p['id'] not in [fp['id'] for fp in featured_projects]
-        ]
-        featured_projects.extend(remaining[:6 - len(featured_projects)])
-
-    # Fallback absoluto
-    if not featured_projects:
-        featured_projects = projects[:6]
+    projects_index = load_projects_index()
 
     return render_template(
         'index_static.html',
-        projetos=featured_projects,
-        stats=stats
+        projetos=projects_index.featured,
+        stats=projects_index.stats
     )
 
 @app.route('/projetos/')
 @app.route('/projetos/index.html')
 def projetos():
-    data = load_projects_data()
-    projects = data.get('projects', [])
-    stats = data.get('stats', {})
-
-    linguagens = sorted(
-        {lang for p in projects for lang in p.get('languages', [])}
-    )
-
-    tecnologias = sorted(
-        {tech for p in projects for tech in p.get('technologies', [])}
-    )
+    projects_index = load_projects_index()
 
     return render_template(
         'projetos_static.html',
-        projetos=projects,
-        stats=stats,
-        linguagens=linguagens,
-        tecnologias=tecnologias
+        # Primeira página, na ordem padrão do seletor (mais stars)
+        projetos=projects_index.by_stars[:PROJECTS_PAGE_SIZE],
+        total=len(projects_index.projects),
+        page_size=PROJECTS_PAGE_SIZE,
+        stats=projects_index.stats,
+        linguagens=projects_index.languages,
+        tecnologias=projects_index.technologies,
+        data_layout=projects_index.layout
     )
 
 @app.route('/sobre/')
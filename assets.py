@@ -0,0 +1,726 @@
+"""
+Pipeline de assets do site estático (etapa final do freeze.py)
+Troca os CSS/JS de CDN e os arquivos locais sem minificação por dois
+bundles com hash no nome:
+
+1. Vendoring: Bootstrap, Bootstrap Icons e Google Fonts são baixados
+   para static/vendor/ (python assets.py --vendor, ou pelo próprio
+   freeze.py quando falta algum arquivo), junto com as fontes
+   referenciadas pelo CSS. Faça commit de static/vendor/ para builds
+   sem internet
+2. Purge: regras cujas classes/ids não aparecem nas páginas geradas nem
+   nos scripts são removidas; @font-face de faixas unicode que o site não
+   usa também (e, com fontTools instalado, a fonte de ícones fica só com
+   os glifos usados)
+3. Minificação e concatenação: docs/static/dist/app.<hash>.css e
+   app.<hash>.js, fontes em docs/static/dist/fonts/
+4. CSS crítico: regras usadas no topo de cada página (navbar + primeira
+   seção) vão inline no <head>; o bundle completo carrega sem bloquear
+5. Cache: nomes com hash do conteúdo + docs/_headers com Cache-Control
+   immutable (para hosts que leem o arquivo, como Netlify/Cloudflare
+   Pages; o GitHub Pages ignora e usa o cache padrão de 10 minutos)
+
+Os blocos trocados ficam entre os comentários <!-- assets:css --> e
+<!-- assets:js --> de templates/base.html. O freeze.py chama
+ensure_vendor antes de gerar as páginas: se um asset de CDN não tem
+cópia local e não pode ser baixado, o build falha (AssetsError) sem
+tocar em docs/; com allow_cdn=True (freeze.py --cdn) ele continua vindo
+do CDN, como antes.
+
+rcssmin/rjsmin e fontTools são usados se estiverem instalados.
+
+Autor: Natália Barros
+Uso: python assets.py --vendor   (baixa/atualiza static/vendor)
+"""
+
+import io
+import os
+import re
+import sys
+import gzip
+import hashlib
+from urllib.parse import urljoin, urlparse
+
+try:
+    import rcssmin  # Dependência opcional
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin  # Dependência opcional
+except ImportError:
+    rjsmin = None
+
+try:
+    from fontTools import subset as font_subset  # Dependência opcional
+    from fontTools.ttLib import TTFont
+except ImportError:
+    font_subset = None
+
+# ============================================
+# CONFIGURAÇÕES
+# ============================================
+
+STATIC_DIR = 'static'
+VENDOR_DIR = os.path.join(STATIC_DIR, 'vendor')
+DIST_DIR = 'static/dist'  # Relativo ao destino do freeze (docs/)
+HEADERS_FILE = '_headers'
+
+CSS_BLOCK = ('<!-- assets:css -->', '<!-- /assets:css -->')
+JS_BLOCK = ('<!-- assets:js -->', '<!-- /assets:js -->')
+
+# O Google Fonts só entrega woff2 para navegadores modernos
+BROWSER_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+
+# (arquivo em static/, URL do CDN ou None para arquivos do projeto),
+# na mesma ordem de templates/base.html (ordem da cascata/execução)
+CSS_ASSETS = [
+    ('vendor/bootstrap.css',
+     'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css'),
+    ('vendor/bootstrap-icons.css',
+     'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/bootstrap-icons.css'),
+    ('vendor/fonts.css',
+     'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700'
+     '&family=Poppins:wght@600;700&display=swap'),
+    ('css/style.css', None),
+]
+JS_ASSETS = [
+    ('vendor/bootstrap.bundle.js',
+     'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js'),
+    ('js/script.js', None),
+]
+
+# Fonte de ícones: subset pelos glifos das classes .bi-* que sobraram
+ICONS_ASSET = 'vendor/bootstrap-icons.css'
+
+# Dicas de conexão mantidas quando o asset continua vindo do CDN
+CDN_PRECONNECT = {
+    'vendor/fonts.css': ['<link rel="preconnect" href="https://fonts.googleapis.com">',
+                         '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'],
+}
+
+CACHE_HEADERS = f"""/{DIST_DIR}/*
+  Cache-Control: public, max-age=31536000, immutable
+"""
+
+CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+TOKEN_RE = re.compile(r'[\w-]+')
+STYLE_RE = re.compile(r'<style\b[^>]*>.*?</style>', re.S | re.I)
+UNICODE_RANGE_RE = re.compile(r'unicode-range:([^;}]+)')
+ICON_CONTENT_RE = re.compile(r'content:\s*"\\([0-9a-fA-F]+)"')
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _write_if_changed(path, content):
+    """Escreve bytes apenas se o conteúdo mudou"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.isfile(path) and _read(path) == content:
+        return False
+    with open(path, 'wb') as f:
+        f.write(content)
+    return True
+
+
+def _short_hash(content):
+    return hashlib.sha256(content).hexdigest()[:10]
+
+
+def _gzip_size(content):
+    return len(gzip.compress(content, compresslevel=9, mtime=0))
+
+
+class AssetsError(RuntimeError):
+    """Assets de CDN sem cópia local que não puderam ser baixados"""
+
+
+# ============================================
+# VENDORING
+# ============================================
+
+def download(url):
+    """Baixa uma URL (bytes)"""
+    import requests  # Só necessário para vendorizar
+
+    response = requests.get(url, headers={'User-Agent': BROWSER_USER_AGENT}, timeout=20)
+    response.raise_for_status()
+    return response.content
+
+
+def vendor_asset(name, url):
+    """
+    Baixa um asset do CDN para static/vendor
+
+    Em CSS, as fontes/imagens referenciadas com url() também são baixadas
+    para static/vendor/fonts e as referências passam a ser locais.
+    """
+    content = download(url)
+
+    if name.endswith('.css'):
+        def localize(match):
+            ref = match.group(2)
+            if ref.startswith('data:'):
+                return match.group(0)
+            absolute = urljoin(url, ref)
+            stem, ext = os.path.splitext(os.path.basename(urlparse(absolute).path))
+            # Nomes do Google Fonts se repetem entre famílias: sufixo com hash da URL
+            filename = f"{stem[:40]}-{hashlib.sha1(absolute.encode('utf-8')).hexdigest()[:8]}{ext}"
+            _write_if_changed(os.path.join(VENDOR_DIR, 'fonts', filename), download(absolute))
+            return f'url(fonts/{filename})'
+
+        content = CSS_URL_RE.sub(localize, content.decode('utf-8')).encode('utf-8')
+
+    _write_if_changed(os.path.join(STATIC_DIR, name), content)
+    return len(content)
+
+
+def ensure_vendor(allow_cdn=False):
+    """
+    Baixa os assets de CDN que ainda não têm cópia em static/vendor
+
+    Args:
+        allow_cdn: Se True, assets que não puderam ser baixados continuam
+            vindo do CDN; se False, levanta AssetsError
+
+    Returns:
+        Nomes dos assets que continuam no CDN
+    """
+    failed = vendor_all(only_missing=True)
+    if failed and not allow_cdn:
+        raise AssetsError(
+            f"sem cópia local de {', '.join(failed)} e o download falhou. "
+            "Execute python assets.py --vendor com internet e faça commit de "
+            "static/vendor/, ou use freeze.py --cdn para manter esses assets no CDN"
+        )
+    return failed
+
+
+def vendor_all(only_missing=False):
+    """
+    Baixa os assets de CDN para static/vendor
+
+    Args:
+        only_missing: Se True, baixa só os que ainda não têm cópia local
+
+    Returns:
+        Nomes dos assets que falharam
+    """
+    failures = []
+    for name, url in CSS_ASSETS + JS_ASSETS:
+        if url is None:
+            continue
+        if only_missing and os.path.isfile(os.path.join(STATIC_DIR, name)):
+            continue
+        try:
+            size = vendor_asset(name, url)
+            print(f"✅ {name}: {size / 1024:.1f} KB")
+        except Exception as e:
+            failures.append(name)
+            print(f"❌ {name}: {e}")
+    return failures
+
+
+# ============================================
+# MINIFICAÇÃO
+# ============================================
+
+def minify_css(css):
+    """
+    Remove comentários e espaços desnecessários do CSS
+
+    Usa rcssmin se estiver instalado; o fallback é conservador (não mexe
+    em strings nem no espaço antes de '(', que muda o sentido em @media).
+    """
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+
+    out = []
+    i, n = 0, len(css)
+    while i < n:
+        c = css[i]
+        if c in '"\'':
+            end = i + 1
+            while end < n and css[end] != c:
+                end += 2 if css[end] == '\\' else 1
+            out.append(css[i:end + 1])
+            i = end + 1
+        elif css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        elif c.isspace():
+            while i < n and css[i].isspace():
+                i += 1
+            previous = out[-1][-1:] if out else ''
+            following = css[i:i + 1]
+            if previous and previous not in '{};,>' and following and following not in '{};,>)':
+                out.append(' ')
+        elif c == '}' and out and out[-1] == ';':
+            out[-1] = '}'
+            i += 1
+        else:
+            out.append(c)
+            i += 1
+    return ''.join(out).strip()
+
+
+def minify_js(js):
+    """
+    Minifica JS com rjsmin; sem ele, só remove indentação, linhas vazias
+    e comentários de linha inteira (fora de template strings)
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(js)
+
+    lines = []
+    in_template = in_comment = False
+    for line in js.splitlines():
+        stripped = line.strip()
+        if in_template:
+            lines.append(line)
+        elif in_comment:
+            in_comment = '*/' not in stripped
+            continue
+        elif not stripped or stripped.startswith('//'):
+            continue
+        elif stripped.startswith('/*') and '*/' not in stripped:
+            in_comment = True
+            continue
+        elif stripped.startswith('/*') and stripped.endswith('*/'):
+            continue
+        else:
+            lines.append(stripped)
+        if line.count('`') % 2:
+            in_template = not in_template
+    return '\n'.join(lines)
+
+
+# ============================================
+# PURGE
+# ============================================
+
+NESTED_AT_RULES = ('@media', '@supports', '@container', '@layer', '@document')
+
+
+def split_rules(css):
+    """
+    Divide CSS (sem comentários) em regras de nível superior
+
+    Returns:
+        Lista de (prelúdio, corpo); corpo None para regras com ';' (@import)
+    """
+    rules = []
+    depth, start, open_at = 0, 0, 0
+    i, n = 0, len(css)
+    while i < n:
+        c = css[i]
+        if c in '"\'':
+            i += 1
+            while i < n and css[i] != c:
+                i += 2 if css[i] == '\\' else 1
+        elif c == '{':
+            if depth == 0:
+                open_at = i
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((css[start:open_at].strip(), css[open_at + 1:i]))
+                start = i + 1
+        elif c == ';' and depth == 0:
+            rules.append((css[start:i].strip(), None))
+            start = i + 1
+        i += 1
+    return rules
+
+
+def split_selectors(prelude):
+    """Seletores de uma lista separada por vírgulas (fora de parênteses)"""
+    selectors, depth, start = [], 0, 0
+    for i, c in enumerate(prelude):
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+    selectors.append(prelude[start:].strip())
+    return [s for s in selectors if s]
+
+
+def selector_used(selector, tokens):
+    """True se todas as classes/ids do seletor aparecem em `tokens`"""
+    # Classes dentro de :not() e valores de atributos não precisam existir
+    selector = re.sub(r'\[[^\]]*\]', '', selector)
+    while ':not(' in selector:
+        reduced = re.sub(r':not\([^()]*\)', '', selector)
+        if reduced == selector:
+            break
+        selector = reduced
+    names = re.findall(r'[.#](-?[_a-zA-Z][\w-]*)', selector)
+    return all(name in tokens for name in names)
+
+
+def parse_unicode_range(value):
+    """'U+0000-00FF, U+0131, U+4??' → lista de (início, fim)"""
+    ranges = []
+    for part in value.split(','):
+        part = part.strip().upper().replace('U+', '')
+        if not part:
+            continue
+        if '?' in part:
+            ranges.append((int(part.replace('?', '0'), 16), int(part.replace('?', 'F'), 16)))
+        elif '-' in part:
+            low, high = part.split('-', 1)
+            ranges.append((int(low, 16), int(high, 16)))
+        else:
+            ranges.append((int(part, 16), int(part, 16)))
+    return ranges
+
+
+def font_face_used(body, codepoints):
+    """@font-face sem unicode-range, ou cuja faixa tem algum caractere usado"""
+    match = UNICODE_RANGE_RE.search(body)
+    if not match:
+        return True
+    ranges = parse_unicode_range(match.group(1))
+    return any(low <= cp <= high for cp in codepoints for low, high in ranges)
+
+
+def purge_css(css, tokens, codepoints=None, font_faces=True):
+    """
+    Remove regras que não casam com nada do site
+
+    Args:
+        css: CSS minificado
+        tokens: Conjunto de palavras das páginas/scripts (classes, ids...)
+        codepoints: Caracteres usados (para descartar @font-face de outras
+            faixas unicode); None mantém todas
+        font_faces: Se False, remove todos os @font-face (CSS crítico)
+
+    Returns:
+        CSS só com as regras usadas
+    """
+    out = []
+    for prelude, body in split_rules(css):
+        if body is None:
+            out.append(prelude + ';')
+        elif prelude.startswith(NESTED_AT_RULES):
+            inner = purge_css(body, tokens, codepoints, font_faces)
+            if inner:
+                out.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@font-face'):
+            if font_faces and (codepoints is None or font_face_used(body, codepoints)):
+                out.append(f'{prelude}{{{body}}}')
+        elif prelude.startswith('@'):
+            out.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [s for s in split_selectors(prelude) if selector_used(s, tokens)]
+            if selectors:
+                out.append(f"{','.join(selectors)}{{{body}}}")
+    return ''.join(out)
+
+
+def subset_font(content, codepoints, flavor):
+    """Fonte só com os glifos de `codepoints` (requer fontTools)"""
+    font = TTFont(io.BytesIO(content))
+    options = font_subset.Options()
+    options.flavor = flavor
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    output = io.BytesIO()
+    font.flavor = flavor
+    font.save(output)
+    return output.getvalue()
+
+
+# ============================================
+# BUNDLES
+# ============================================
+
+class AssetBundle:
+    """
+    Bundles gerados para um destino (docs/)
+
+    Args:
+        destination: Diretório do site gerado
+    """
+
+    def __init__(self, destination):
+        self.destination = destination
+        self.files = {}          # caminho relativo ao destino → bytes
+        self.missing = []        # (nome, url) sem cópia local: continuam no CDN
+        self.source_sizes = {}   # nome → (bytes, gzip) do asset original
+        self.css = ''
+        self.css_path = self.js_path = None
+
+    def _add_file(self, name, content):
+        stem, ext = os.path.splitext(name)
+        path = f"{DIST_DIR}/{stem}.{_short_hash(content)}{ext}"
+        self.files[path] = content
+        return path
+
+    def _load(self, name, url):
+        path = os.path.join(STATIC_DIR, name)
+        if not os.path.isfile(path):
+            self.missing.append((name, url))
+            return None
+        content = _read(path)
+        self.source_sizes[name] = (len(content), _gzip_size(content))
+        return content.decode('utf-8')
+
+    def _bundle_fonts(self, css, name, codepoints=None):
+        """Copia as fontes referenciadas para dist/fonts com hash no nome"""
+        source_dir = os.path.dirname(os.path.join(STATIC_DIR, name))
+
+        def relocate(match):
+            ref = match.group(2)
+            if ref.startswith(('data:', 'http:', 'https:', '//')):
+                return match.group(0)
+            path = os.path.normpath(os.path.join(source_dir, ref.split('?')[0].split('#')[0]))
+            if not os.path.isfile(path):
+                return match.group(0)
+            content = _read(path)
+            ext = os.path.splitext(path)[1].lower()
+            if codepoints and font_subset is not None and ext in ('.woff2', '.woff'):
+                content = subset_font(content, codepoints, ext[1:])
+            bundled = self._add_file(f"fonts/{os.path.basename(path)}", content)
+            return f"url({os.path.relpath(bundled, DIST_DIR).replace(os.sep, '/')})"
+
+        return CSS_URL_RE.sub(relocate, css)
+
+    def build(self, tokens, codepoints):
+        """
+        Monta app.<hash>.css e app.<hash>.js
+
+        Args:
+            tokens: Palavras usadas nas páginas e scripts (purge)
+            codepoints: Caracteres usados nas páginas (subset de fontes)
+        """
+        parts = []
+        for name, url in CSS_ASSETS:
+            css = self._load(name, url)
+            if css is None:
+                continue
+            css = purge_css(minify_css(css), tokens, codepoints)
+            glyphs = None
+            if name == ICONS_ASSET:
+                glyphs = {int(cp, 16) for cp in ICON_CONTENT_RE.findall(css)}
+            parts.append(self._bundle_fonts(css, name, glyphs))
+        self.css = '\n'.join(parts)
+        self.css_path = self._add_file('app.css', self.css.encode('utf-8'))
+
+        scripts = []
+        for name, url in JS_ASSETS:
+            js = self._load(name, url)
+            if js is not None:
+                # ';' separa arquivos que terminam sem ponto e vírgula
+                scripts.append(minify_js(js).rstrip().rstrip(';') + ';')
+        self.js_path = self._add_file('app.js', '\n'.join(scripts).encode('utf-8'))
+
+    def write(self):
+        """Grava os bundles e _headers; remove bundles de builds anteriores"""
+        written = 0
+        for path, content in self.files.items():
+            written += _write_if_changed(os.path.join(self.destination, path), content)
+        _write_if_changed(os.path.join(self.destination, HEADERS_FILE),
+                          CACHE_HEADERS.encode('utf-8'))
+
+        dist = os.path.join(self.destination, DIST_DIR)
+        keep = {os.path.normpath(os.path.join(self.destination, p)) for p in self.files}
+        for root, _, files in os.walk(dist):
+            for name in files:
+                path = os.path.normpath(os.path.join(root, name))
+                if path not in keep:
+                    os.remove(path)
+        return written
+
+
+# ============================================
+# PÁGINAS
+# ============================================
+
+def find_pages(destination):
+    """Páginas HTML geradas que usam o base.html (têm os marcadores)"""
+    pages = []
+    for root, _, files in os.walk(destination):
+        for name in files:
+            if name.endswith('.html'):
+                path = os.path.join(root, name)
+                with open(path, 'r', encoding='utf-8') as f:
+                    html = f.read()
+                if CSS_BLOCK[0] in html and JS_BLOCK[0] in html:
+                    pages.append((path, html))
+    return sorted(pages)
+
+
+def page_markup(html):
+    """
+    HTML sem os blocos de assets e sem <style> inline
+
+    Páginas que o freeze incremental não regravou ainda têm o CSS crítico
+    e as tags do build anterior; sem isso, seletores e valores de
+    propriedades (ex: 'visible') manteriam regras no purge para sempre.
+    """
+    for markers in (CSS_BLOCK, JS_BLOCK):
+        if markers[0] in html and markers[1] in html:
+            html = replace_block(html, markers, '')
+    return STYLE_RE.sub('', html)
+
+
+def above_the_fold(html):
+    """Trecho do <body> até o fim da primeira <section> (navbar + topo)"""
+    start = html.find('<body')
+    end = html.find('</section>', start)
+    if start < 0:
+        return html
+    return html[start:end] if end > 0 else html[start:start + 8000]
+
+
+def replace_block(html, markers, content):
+    """Troca o conteúdo entre os marcadores (mantidos para o próximo build)"""
+    start = html.index(markers[0]) + len(markers[0])
+    end = html.index(markers[1], start)
+    return f"{html[:start]}\n{content}\n{html[end:]}"
+
+
+def _fallback_tags(missing, extension):
+    tags = []
+    for name, url in missing:
+        if name.endswith(extension):
+            if extension == '.css':
+                tags.extend(CDN_PRECONNECT.get(name, []))
+                tags.append(f'<link rel="stylesheet" href="{url}">')
+            else:
+                tags.append(f'<script src="{url}"></script>')
+    return tags
+
+
+def build_assets(destination='docs'):
+    """
+    Executa o pipeline sobre o site gerado em `destination`
+
+    Assets sem cópia em static/vendor continuam vindo do CDN (chame
+    ensure_vendor antes de gerar as páginas).
+
+    Returns:
+        Dict com o relatório (tamanhos, requests por página) ou None se
+        nenhuma página usa os marcadores
+    """
+    pages = find_pages(destination)
+    if not pages:
+        return None
+
+    # Tudo o que as páginas e os scripts mencionam (classes adicionadas
+    # por JS, como 'show' ou 'active', aparecem como strings nos scripts)
+    corpus = [page_markup(html) for _, html in pages]
+    for name, _ in JS_ASSETS:
+        path = os.path.join(STATIC_DIR, name)
+        if os.path.isfile(path):
+            corpus.append(_read(path).decode('utf-8'))
+    tokens = set(TOKEN_RE.findall('\n'.join(corpus)))
+    codepoints = {ord(c) for text in corpus for c in set(text)}
+
+    bundle = AssetBundle(destination)
+    bundle.build(tokens, codepoints)
+
+    report = {
+        'pages': [],
+        'missing': [name for name, _ in bundle.missing],
+        'headers': HEADERS_FILE,
+        'sources': bundle.source_sizes,
+        'css': (len(bundle.files[bundle.css_path]), _gzip_size(bundle.files[bundle.css_path])),
+        'js': (len(bundle.files[bundle.js_path]), _gzip_size(bundle.files[bundle.js_path])),
+    }
+
+    # Antes: cada asset é uma requisição que bloqueia a renderização
+    requests_before = len(CSS_ASSETS) + len(JS_ASSETS)
+    bytes_before = sum(size for size, _ in bundle.source_sizes.values())
+    gzip_before = sum(size for _, size in bundle.source_sizes.values())
+
+    for path, html in pages:
+        critical = purge_css(bundle.css, set(TOKEN_RE.findall(page_markup(above_the_fold(html)))),
+                             font_faces=False)
+        # Fontes/imagens do CSS crítico são relativas à página, não ao dist/
+        page_dir = os.path.dirname(path)
+
+        def href(asset):
+            return os.path.relpath(os.path.join(destination, asset), page_dir).replace(os.sep, '/')
+
+        critical = CSS_URL_RE.sub(
+            lambda m: m.group(0) if m.group(2).startswith(('data:', 'http', '//'))
+            else f"url({href(DIST_DIR + '/' + m.group(2))})", critical)
+
+        css_href, js_href = href(bundle.css_path), href(bundle.js_path)
+        css_tags = _fallback_tags(bundle.missing, '.css') + [
+            f'<style>{critical}</style>',
+            f'<link rel="preload" href="{css_href}" as="style" '
+            f'onload="this.onload=null;this.rel=\'stylesheet\'">',
+            f'<noscript><link rel="stylesheet" href="{css_href}"></noscript>',
+        ]
+        js_tags = _fallback_tags(bundle.missing, '.js') + [f'<script src="{js_href}"></script>']
+
+        html = replace_block(html, CSS_BLOCK, '\n'.join(css_tags))
+        html = replace_block(html, JS_BLOCK, '\n'.join(js_tags))
+        _write_if_changed(path, html.encode('utf-8'))
+
+        critical_bytes = critical.encode('utf-8')
+        report['pages'].append({
+            'page': os.path.relpath(path, destination).replace(os.sep, '/'),
+            'requests_before': requests_before,
+            'requests_after': 2 + len(bundle.missing),
+            'bytes_before': bytes_before,
+            'gzip_before': gzip_before,
+            'bytes_after': report['css'][0] + report['js'][0] + len(critical_bytes),
+            'gzip_after': report['css'][1] + report['js'][1] + _gzip_size(critical_bytes),
+            'critical': len(critical_bytes),
+        })
+
+    bundle.write()
+    return report
+
+
+def print_report(report):
+    """Resumo do pipeline: bytes economizados e requests por página"""
+    if report is None:
+        print("⚠️  Assets: nenhuma página com os marcadores <!-- assets:css -->")
+        return
+
+    print("\n🎨 Assets (CSS/JS):")
+    for name, (size, gz) in sorted(report['sources'].items()):
+        print(f"  • {name}: {size / 1024:.1f} KB ({gz / 1024:.1f} KB gzip)")
+    print(f"  • → app.css: {report['css'][0] / 1024:.1f} KB ({report['css'][1] / 1024:.1f} KB gzip)")
+    print(f"  • → app.js: {report['js'][0] / 1024:.1f} KB ({report['js'][1] / 1024:.1f} KB gzip)")
+    if report['missing']:
+        print(f"  ⚠️  Sem cópia local (continuam no CDN): {', '.join(report['missing'])}")
+        print("     Execute: python assets.py --vendor")
+    print(f"  • {report['headers']}: Cache-Control immutable para static/dist/ só em hosts "
+          f"que leem o arquivo (Netlify, Cloudflare Pages); no GitHub Pages não tem efeito "
+          f"e vale o cache padrão (max-age=600) — os nomes com hash só evitam conteúdo velho")
+
+    print(f"\n  {'página':<28} {'requests':>10} {'KB (gzip) antes':>16} "
+          f"{'KB (gzip) depois':>17} {'crítico':>9}")
+    for page in report['pages']:
+        print(f"  {page['page']:<28} "
+              f"{page['requests_before']:>4} → {page['requests_after']:<3} "
+              f"{page['gzip_before'] / 1024:>16.1f} {page['gzip_after'] / 1024:>17.1f} "
+              f"{page['critical'] / 1024:>7.1f}KB")
+
+    if report['pages']:
+        page = report['pages'][0]
+        saved = page['bytes_before'] - page['bytes_after']
+        saved_gzip = page['gzip_before'] - page['gzip_after']
+        print(f"  • Economia por página (primeira visita): {saved / 1024:.1f} KB "
+              f"({saved_gzip / 1024:.1f} KB gzip)")
+
+
+if __name__ == '__main__':
+    if '--vendor' not in sys.argv:
+        print("Uso: python assets.py --vendor  (baixa os assets de CDN para static/vendor)")
+        sys.exit(1)
+    sys.exit(1 if vendor_all() else 0)
@@ -0,0 +1,86 @@
+"""
+Benchmark do app estático: tempo por requisição x quantidade de projetos
+Gera datasets sintéticos e mede as rotas / e /projetos/ com o test client.
+
+Autor: Natália Barros
+Uso: python bench_app_static.py [n1 n2 ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import app_static
+
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'HTML', 'CSS', 'Go', 'Rust']
+TECHNOLOGIES = ['Flask', 'Django', 'React', 'Next.js', 'Docker', 'PostgreSQL', 'Redis']
+
+
+def make_dataset(count):
+    """Gera um projects.json sintético com `count` projetos"""
+    projects = []
+    for i in range(count):
+        projects.append({
+            'id': i,
+            'name': f'projeto-{i}',
+            'title': f'Projeto {i}',
+            'description': f'Descrição do projeto {i}',
+            'language': LANGUAGES[i % len(LANGUAGES)],
+            'languages': [LANGUAGES[(i + k) % len(LANGUAGES)] for k in range(3)],
+            'technologies': [TECHNOLOGIES[(i + k) % len(TECHNOLOGIES)] for k in range(4)],
+            'github_url': f'https://github.com/exemplo/projeto-{i}',
+            'demo_url': None,
+            'stars': i % 50,
+            'forks': i % 7,
+            'watchers': i % 50,
+            'created_at': '2025-01-01',
+            'updated_at': '2025-06-01',
+            'topics': [],
+            'has_wiki': False,
+            'has_pages': False,
+            'is_recent': False,
+            'size': 100,
+        })
+    stats = {
+        'total_projects': count,
+        'featured_projects': [p['id'] for p in projects[:6]],
+    }
+    return {'projects': projects, 'stats': stats}
+
+
+def time_route(client, url, repeat):
+    """Tempo médio (ms) de uma rota, já com o cache aquecido"""
+    client.get(url)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url)
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(sizes, repeat=20):
+    client = app_static.app.test_client()
+    original_path = app_static.PROJECTS_JSON
+
+    print(f"{'projetos':>10} {'/ (ms)':>10} {'/projetos/ (ms)':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        app_static.PROJECTS_JSON = os.path.join(tmp, 'projects.json')
+        try:
+            for size in sizes:
+                with open(app_static.PROJECTS_JSON, 'w', encoding='utf-8') as f:
+                    json.dump(make_dataset(size), f)
+                app_static.invalidate_projects_cache()
+
+                home = time_route(client, '/', repeat)
+                listing = time_route(client, '/projetos/', max(1, repeat // 4))
+                print(f"{size:>10} {home:>10.2f} {listing:>16.2f}")
+        finally:
+            app_static.PROJECTS_JSON = original_path
+            app_static.invalidate_projects_cache()
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 5000]
+    main(sizes)
@@ -0,0 +1,156 @@
+"""
+Teste de estresse: leitores concorrentes x rebuilds repetidos dos dados
+Processos leitores (como workers do gunicorn) leem static/data/projects.json
+enquanto o processo principal regrava o arquivo em loop. Compara a
+gravação atômica de frontend_data com a gravação direta antiga
+(open('w') + json.dump).
+
+Cada leitor conta leituras cruas que falharam (JSON truncado) e chamadas
+de app_static.load_projects_data que retornaram um portfólio vazio.
+
+Autor: Natália Barros
+Uso: python bench_atomic_writes.py [--modos atomico,direto] [--leitores 4]
+                                   [--rebuilds 200] [--projetos 500]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+import app_static
+import frontend_data
+from bench_app_static import make_dataset
+
+
+# ============================================
+# GRAVAÇÃO
+# ============================================
+
+def write_direct(directory, data):
+    """Gravação antiga: trunca o arquivo e escreve por cima"""
+    with open(os.path.join(directory, frontend_data.FULL_FILE), 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def write_atomic(directory, data):
+    """Gravação atual (frontend_data.emit)"""
+    frontend_data.emit(data['projects'], data['stats'], data['generated_at'],
+                       directory=directory)
+
+
+WRITERS = {'atomico': write_atomic, 'direto': write_direct}
+
+
+# ============================================
+# LEITORES
+# ============================================
+
+def reader(path, ready, stop, results):
+    """Lê o arquivo em loop até `stop`; devolve os contadores em `results`"""
+    sys.stdout = open(os.devnull, 'w')  # Erros de leitura já são contados
+    app_static.PROJECTS_JSON = path
+    counts = {'raw': 0, 'raw_errors': 0, 'loads': 0, 'empty': 0}
+
+    # Primeiro snapshot carregado antes dos rebuilds começarem
+    app_static.load_projects_data()
+    ready.wait()
+
+    while not stop.is_set():
+        counts['raw'] += 1
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+        except ValueError:
+            counts['raw_errors'] += 1
+
+        counts['loads'] += 1
+        if not app_static.load_projects_data()['projects']:
+            counts['empty'] += 1
+
+    counts['errors'] = app_static.projects_cache_info()['errors']
+    results.put(counts)
+
+
+# ============================================
+# EXECUÇÃO
+# ============================================
+
+def run(mode, readers, rebuilds, count):
+    """
+    Executa `rebuilds` gravações com `readers` processos lendo
+
+    Returns:
+        Contadores somados dos leitores + tempo total
+    """
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, frontend_data.FULL_FILE)
+
+    # Dois datasets de tamanhos diferentes: cada rebuild muda o arquivo
+    datasets = [make_dataset(count), make_dataset(count // 2 or 1)]
+    for i, data in enumerate(datasets):
+        data['generated_at'] = f'build-{i}'
+    write_atomic(directory, datasets[0])
+
+    context = multiprocessing.get_context('spawn')
+    ready = context.Barrier(readers + 1)
+    stop = context.Event()
+    results = context.Queue()
+    processes = [context.Process(target=reader, args=(path, ready, stop, results))
+                 for _ in range(readers)]
+    for process in processes:
+        process.start()
+    ready.wait()
+
+    start = time.perf_counter()
+    for i in range(rebuilds):
+        WRITERS[mode](directory, datasets[i % 2])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    totals = {}
+    for _ in processes:
+        for key, value in results.get().items():
+            totals[key] = totals.get(key, 0) + value
+    for process in processes:
+        process.join()
+
+    totals['elapsed'] = elapsed
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Leitores concorrentes x rebuilds do projects.json')
+    parser.add_argument('--modos', default='atomico,direto')
+    parser.add_argument('--leitores', type=int, default=4)
+    parser.add_argument('--rebuilds', type=int, default=200)
+    parser.add_argument('--projetos', type=int, default=500)
+    args = parser.parse_args()
+
+    modos = [m for m in args.modos.split(',') if m]
+    for modo in modos:
+        if modo not in WRITERS:
+            parser.error(f"modo desconhecido: {modo} (use {','.join(WRITERS)})")
+
+    print(f"📦 {args.projetos} projetos | {args.leitores} leitores | {args.rebuilds} rebuilds")
+    print(f"\n{'modo':>8} {'leituras':>9} {'truncadas':>10} {'loads':>8} "
+          f"{'vazios':>7} {'erros':>6} {'rebuild (ms)':>13}")
+
+    falhou = False
+    for modo in modos:
+        t = run(modo, args.leitores, args.rebuilds, args.projetos)
+        print(f"{modo:>8} {t['raw']:>9} {t['raw_errors']:>10} {t['loads']:>8} "
+              f"{t['empty']:>7} {t['errors']:>6} {t['elapsed'] / args.rebuilds * 1000:>13.1f}")
+        if modo == 'atomico' and (t['raw_errors'] or t['empty']):
+            falhou = True
+
+    if falhou:
+        print("\n❌ Leitores viram dados incompletos com a gravação atômica")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
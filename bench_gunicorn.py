@@ -0,0 +1,188 @@
+"""
+Teste de carga: gunicorn com workers sync x gthread (x gevent)
+Sobe o app com gunicorn.conf.py em cada modo, usando um SQLite temporário
+com projetos sintéticos, e mede req/s e latência p99 de /, /projetos e
+/api/projetos. Clientes lentos (que enviam a requisição aos poucos)
+simulam o caso que trava workers sync.
+
+Autor: Natália Barros
+Uso: python bench_gunicorn.py [--modos sync,gthread,gevent] [--concorrencia 16]
+                              [--duracao 5] [--lentos 2] [--projetos 200]
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import importlib.util
+import subprocess
+import http.client
+import threading
+
+ENDPOINTS = ['/', '/projetos', '/api/projetos']
+
+
+# ============================================
+# SERVIDOR
+# ============================================
+
+def preparar_banco(quantidade):
+    """Cria um SQLite temporário com `quantidade` projetos"""
+    caminho = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    codigo = f"""
+from app import app, db, Projeto
+import search
+with app.app_context():
+    db.create_all()
+    search.create_index(db.engine)
+    db.session.add_all([
+        Projeto(titulo=f'Projeto {{i}}', descricao='Projeto sintético',
+                descricao_curta='Projeto sintético', tecnologias='Python, Flask, Redis',
+                categoria=['Web', 'API', 'Automação'][i % 3], destaque=i < 6)
+        for i in range({quantidade})
+    ])
+    db.session.commit()
+"""
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{caminho}')
+    subprocess.run([sys.executable, '-c', codigo], env=env, check=True)
+    return caminho
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def iniciar_gunicorn(modo, banco, workers):
+    """Sobe o gunicorn no modo pedido e espera responder"""
+    porta = porta_livre()
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{banco}', PORT=str(porta),
+               GUNICORN_WORKER_CLASS=modo, WEB_CONCURRENCY=str(workers),
+               GUNICORN_LOG_LEVEL='warning')
+    processo = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    limite = time.time() + 20
+    while time.time() < limite:
+        try:
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=1)
+            conexao.request('GET', '/sobre')
+            if conexao.getresponse().status == 200:
+                return processo, porta
+        except OSError:
+            time.sleep(0.2)
+    processo.kill()
+    raise RuntimeError(f"gunicorn ({modo}) não respondeu")
+
+
+# ============================================
+# CARGA
+# ============================================
+
+def cliente_lento(porta, parar):
+    """Envia uma requisição byte a byte, ocupando uma conexão o tempo todo"""
+    while not parar.is_set():
+        try:
+            with socket.create_connection(('127.0.0.1', porta), timeout=60) as s:
+                for byte in b'GET / HTTP/1.1\r\nHost: localhost\r\n':
+                    if parar.is_set():
+                        return
+                    s.send(bytes([byte]))
+                    time.sleep(0.5)
+        except OSError:
+            time.sleep(0.1)
+
+
+def carga(porta, caminho, concorrencia, duracao):
+    """
+    Dispara requisições em `concorrencia` threads por `duracao` segundos
+
+    Returns:
+        (requisições por segundo, latência p99 em ms, erros)
+    """
+    latencias = []
+    erros = [0]
+    lock = threading.Lock()
+    fim = time.time() + duracao
+
+    def trabalhador():
+        conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=10)
+        locais = []
+        while time.time() < fim:
+            inicio = time.perf_counter()
+            try:
+                conexao.request('GET', caminho)
+                resposta = conexao.getresponse()
+                resposta.read()
+                if resposta.status != 200:
+                    raise http.client.HTTPException(resposta.status)
+                locais.append(time.perf_counter() - inicio)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    erros[0] += 1
+                conexao.close()
+                conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=10)
+        with lock:
+            latencias.extend(locais)
+
+    threads = [threading.Thread(target=trabalhador) for _ in range(concorrencia)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if not latencias:
+        return 0.0, float('nan'), erros[0]
+    latencias.sort()
+    p99 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+    return len(latencias) / duracao, p99 * 1000, erros[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga sync x gthread x gevent')
+    parser.add_argument('--modos', default='sync,gthread,gevent')
+    parser.add_argument('--concorrencia', type=int, default=16)
+    parser.add_argument('--duracao', type=float, default=5)
+    parser.add_argument('--lentos', type=int, default=2,
+                        help='Clientes lentos simultâneos durante o teste')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--projetos', type=int, default=200)
+    args = parser.parse_args()
+
+    modos = [m for m in args.modos.split(',') if m]
+    if 'gevent' in modos and importlib.util.find_spec('gevent') is None:
+        print("⚠️  gevent não instalado: modo gevent ignorado")
+        modos.remove('gevent')
+
+    banco = preparar_banco(args.projetos)
+    print(f"📦 {args.projetos} projetos | {args.workers} workers | "
+          f"{args.concorrencia} clientes | {args.lentos} clientes lentos | {args.duracao:.0f}s por rota")
+
+    print(f"\n{'modo':>8} {'rota':>14} {'req/s':>9} {'p99 (ms)':>10} {'erros':>6}")
+    try:
+        for modo in modos:
+            processo, porta = iniciar_gunicorn(modo, banco, args.workers)
+            parar = threading.Event()
+            lentos = [threading.Thread(target=cliente_lento, args=(porta, parar), daemon=True)
+                      for _ in range(args.lentos)]
+            for t in lentos:
+                t.start()
+            try:
+                for caminho in ENDPOINTS:
+                    rps, p99, erros = carga(porta, caminho, args.concorrencia, args.duracao)
+                    print(f"{modo:>8} {caminho:>14} {rps:>9.1f} {p99:>10.1f} {erros:>6}")
+            finally:
+                parar.set()
+                processo.terminate()
+                processo.wait()
+    finally:
+        os.remove(banco)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark do filtro por tecnologia: LIKE em string x junção indexada
+Popula um SQLite temporário com projetos sintéticos e compara as consultas.
+
+Autor: Natália Barros
+Uso: python bench_tecnologias.py [quantidade_de_projetos]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Banco isolado para o benchmark (precisa ser definido antes de importar o app)
+BENCH_DB = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{BENCH_DB}'
+
+from sqlalchemy import select
+
+from app import app, db, Projeto, ProjetoTecnologia, Tecnologia, normalizar_tecnologia
+
+TECNOLOGIAS = ['Python', 'Flask', 'Django', 'FastAPI', 'JavaScript', 'Java', 'React',
+               'TypeScript', 'PostgreSQL', 'Redis', 'Docker', 'Go', 'Rust', 'Vue.js']
+
+
+def popular(quantidade):
+    """Cria `quantidade` projetos com 3 tecnologias cada"""
+    projetos = []
+    for i in range(quantidade):
+        nomes = [TECNOLOGIAS[(i + k * 5) % len(TECNOLOGIAS)] for k in range(3)]
+        projetos.append(Projeto(
+            titulo=f'Projeto {i}',
+            descricao='Projeto sintético',
+            tecnologias=', '.join(nomes),
+            categoria='Web'
+        ))
+    db.session.add_all(projetos)
+    db.session.commit()
+
+
+def consulta_like(tecnologia):
+    return Projeto.query.filter(Projeto.tecnologias.contains(tecnologia))
+
+
+def consulta_join(tecnologia):
+    return Projeto.query.filter(Projeto.id.in_(
+        select(ProjetoTecnologia.projeto_id)
+        .join(Tecnologia)
+        .where(Tecnologia.slug == normalizar_tecnologia(tecnologia))
+    ))
+
+
+def medir(consulta, tecnologia, repeticoes=20):
+    """Tempo médio (ms) para buscar apenas os ids do resultado"""
+    query = consulta(tecnologia).with_entities(Projeto.id)
+    ids = query.all()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        query.all()
+    return (time.perf_counter() - inicio) / repeticoes * 1000, len(ids)
+
+
+def main(quantidade):
+    with app.app_context():
+        db.create_all()
+        print(f"📦 Criando {quantidade} projetos...")
+        popular(quantidade)
+
+        print(f"\n{'tecnologia':>12} {'LIKE (ms)':>10} {'linhas':>7} "
+              f"{'JOIN (ms)':>10} {'linhas':>7}")
+        for tecnologia in ('Java', 'Flask', 'Rust'):
+            like_ms, like_rows = medir(consulta_like, tecnologia)
+            join_ms, join_rows = medir(consulta_join, tecnologia)
+            print(f"{tecnologia:>12} {like_ms:>10.2f} {like_rows:>7} "
+                  f"{join_ms:>10.2f} {join_rows:>7}")
+
+        print("\nObs.: LIKE '%Java%' também retorna projetos com JavaScript.")
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
+    finally:
+        os.remove(BENCH_DB)
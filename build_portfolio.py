@@ -7,39 +7,25 @@ GitHub: nataliabarros1994
 """
 
 import os
+import sys
 import json
-import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-import time
+
+import frontend_data
+from github_cache import get_cache
+from github_pipeline import (BACKENDS, DEFAULT_BACKEND, DEFAULT_WORKERS, Pipeline, drain,
+                             log_error, log_info, log_success, log_warning)
 
 # ============================================
 # CONFIGURAÇÕES
 # ============================================
 
 GITHUB_USERNAME = "nataliabarros1994"
-GITHUB_API_URL = "https://api.github.com"
 CACHE_FILE = "projects_data.json"
 CACHE_DURATION = timedelta(hours=1)  # Cache válido por 1 hora
 
-# Mapeamento de linguagens para tecnologias/frameworks
-TECH_MAPPING = {
-    'Python': ['Python', 'Flask', 'Django', 'FastAPI', 'Pandas'],
-    'JavaScript': ['JavaScript', 'Node.js', 'React', 'Vue.js'],
-    'TypeScript': ['TypeScript', 'Angular', 'Next.js'],
-    'Java': ['Java', 'Spring Boot'],
-    'Go': ['Go', 'Gin'],
-    'Ruby': ['Ruby', 'Rails'],
-    'PHP': ['PHP', 'Laravel'],
-    'C#': ['C#', '.NET'],
-    'HTML': ['HTML5', 'CSS3', 'Bootstrap'],
-    'CSS': ['CSS3', 'Sass'],
-    'Jupyter Notebook': ['Python', 'Jupyter', 'Data Science'],
-    'R': ['R', 'Data Analysis'],
-    'Rust': ['Rust'],
-    'C++': ['C++'],
-    'C': ['C'],
-}
+# Tecnologias por linguagem: TECH_MAPPING em github_pipeline.py
 
 # Cores para badges de tecnologias
 TECH_COLORS = {
@@ -58,339 +44,157 @@ TECH_COLORS = {
 
 
 # ============================================
-# FUNÇÕES DE LOGGING
-# ============================================
-
-def log_info(message: str):
-    """Log informação"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] ℹ️  {message}")
-
-
-def log_success(message: str):
-    """Log sucesso"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] ✅ {message}")
-
-
-def log_error(message: str):
-    """Log erro"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] ❌ {message}")
-
-
-def log_warning(message: str):
-    """Log aviso"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] ⚠️  {message}")
-
-
-# ============================================
-# FUNÇÕES DA GITHUB API
+# CACHE
 # ============================================
 
-def fetch_github_repos(username: str) -> List[Dict]:
+def read_cache() -> Optional[Dict]:
     """
-    Busca todos os repositórios públicos de um usuário do GitHub
-
-    Args:
-        username: Nome de usuário do GitHub
-
-    Returns:
-        Lista de repositórios
-    """
-    log_info(f"Buscando repositórios de {username}...")
-
-    repos = []
-    page = 1
-    per_page = 100
-
-    while True:
-        url = f"{GITHUB_API_URL}/users/{username}/repos"
-        params = {
-            'page': page,
-            'per_page': per_page,
-            'sort': 'updated',
-            'direction': 'desc'
-        }
-
-        try:
-            response = requests.get(url, params=params, timeout=10)
-
-            # Verificar rate limit
-            remaining = response.headers.get('X-RateLimit-Remaining')
-            if remaining:
-                log_info(f"Rate limit restante: {remaining}")
-
-            response.raise_for_status()
-            page_repos = response.json()
-
-            if not page_repos:
-                break
-
-            repos.extend(page_repos)
-            log_info(f"Página {page}: {len(page_repos)} repositórios")
-
-            page += 1
-            time.sleep(0.5)  # Evitar rate limit
-
-        except requests.exceptions.RequestException as e:
-            log_error(f"Erro ao buscar repositórios: {e}")
-            break
-
-    log_success(f"Total de repositórios encontrados: {len(repos)}")
-    return repos
-
-
-def fetch_repo_languages(languages_url: str) -> Dict[str, int]:
-    """
-    Busca as linguagens de um repositório
-
-    Args:
-        languages_url: URL da API de linguagens
+    Lê o arquivo de cache sem verificar validade
 
     Returns:
-        Dicionário com linguagens e bytes de código
-    """
-    try:
-        response = requests.get(languages_url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except:
-        return {}
-
-
-def fetch_repo_topics(owner: str, repo: str) -> List[str]:
+        Dados do cache ou None
     """
-    Busca os topics de um repositório
-
-    Args:
-        owner: Dono do repositório
-        repo: Nome do repositório
+    if not os.path.exists(CACHE_FILE):
+        return None
 
-    Returns:
-        Lista de topics
-    """
     try:
-        url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/topics"
-        headers = {'Accept': 'application/vnd.github.mercy-preview+json'}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        return data.get('names', [])
-    except:
-        return []
-
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        log_error(f"Erro ao carregar cache: {e}")
+        return None
 
-# ============================================
-# PROCESSAMENTO DE DADOS
-# ============================================
 
-def should_include_repo(repo: Dict) -> bool:
+def load_cache() -> Optional[Dict]:
     """
-    Verifica se o repositório deve ser incluído no portfólio
-
-    Args:
-        repo: Dados do repositório
+    Carrega cache de projetos se existir e for válido
 
     Returns:
-        True se deve incluir, False caso contrário
+        Dados do cache ou None
     """
-    # Excluir forks
-    if repo.get('fork', False):
-        return False
-
-    # Excluir repositórios arquivados
-    if repo.get('archived', False):
-        return False
-
-    # Excluir repositórios vazios (sem código)
-    if repo.get('size', 0) == 0:
-        return False
+    cache = read_cache()
+    if not cache:
+        return None
 
-    # Excluir repositórios sem descrição (opcional)
-    # if not repo.get('description'):
-    #     return False
+    try:
+        # Verificar se cache ainda é válido
+        cached_time = datetime.fromisoformat(cache['timestamp'])
+        if datetime.now() - cached_time < CACHE_DURATION:
+            log_success(f"Cache válido encontrado ({cache['timestamp']})")
+            return cache
+        else:
+            log_warning("Cache expirado")
+            return None
 
-    return True
+    except Exception as e:
+        log_error(f"Erro ao carregar cache: {e}")
+        return None
 
 
-def determine_technologies(languages: Dict[str, int]) -> List[str]:
+def repo_version(repo: Dict) -> str:
     """
-    Determina as tecnologias baseado nas linguagens
+    Identifica a versão de um repositório (muda a cada push ou edição)
 
     Args:
-        languages: Dicionário com linguagens e bytes
+        repo: Dados brutos do repositório
 
     Returns:
-        Lista de tecnologias
+        String comparável com a versão salva no cache
     """
-    technologies = set()
-
-    # Ordenar linguagens por quantidade de bytes (mais usada primeiro)
-    sorted_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)
+    return f"{repo.get('pushed_at')}|{repo.get('updated_at')}"
 
-    for language, _ in sorted_languages[:3]:  # Top 3 linguagens
-        if language in TECH_MAPPING:
-            # Adicionar linguagem principal
-            technologies.add(language)
-            # Adicionar framework comum (se houver)
-            if len(TECH_MAPPING[language]) > 1:
-                technologies.add(TECH_MAPPING[language][1])
 
-    return sorted(list(technologies))
-
-
-def get_demo_url(repo: Dict) -> Optional[str]:
+def plan_incremental(repos: List[Dict], cache: Optional[Dict], complete: bool = True):
     """
-    Tenta encontrar URL de demonstração do projeto
+    Separa repositórios que precisam ser reprocessados dos que podem
+    reaproveitar o projeto salvo no cache
 
     Args:
-        repo: Dados do repositório
+        repos: Repositórios filtrados (ordem final do portfólio)
+        cache: Cache anterior (pode estar expirado) ou None
+        complete: False se a listagem do GitHub falhou no meio; projetos
+            do cache ausentes de `repos` não contam como removidos
 
     Returns:
-        URL de demo ou None
-    """
-    # Homepage do repositório
-    if repo.get('homepage') and repo['homepage'].startswith('http'):
-        return repo['homepage']
-
-    # GitHub Pages
-    if repo.get('has_pages', False):
-        owner = repo['owner']['login']
-        name = repo['name']
-        return f"https://{owner}.github.io/{name}"
-
-    return None
-
-
-def format_repo_title(name: str) -> str:
+        Tupla (projetos reaproveitados por id, repositórios a processar,
+        quantidade de projetos removidos)
     """
-    Formata o nome do repositório para um título legível
-
-    Args:
-        name: Nome do repositório
+    if not cache:
+        return {}, list(repos), 0
+
+    cached_projects = {p['id']: p for p in cache.get('projects', [])}
+    cached_versions = cache.get('repo_versions', {})
+    current_ids = {repo['id'] for repo in repos}
+
+    reused = {}
+    changed = []
+    for repo in repos:
+        project = cached_projects.get(repo['id'])
+        if project and cached_versions.get(str(repo['id'])) == repo_version(repo):
+            reused[repo['id']] = refresh_cached_project(project)
+        else:
+            changed.append(repo)
 
-    Returns:
-        Título formatado
-    """
-    # Substituir hífens e underscores por espaços
-    title = name.replace('-', ' ').replace('_', ' ')
-    # Capitalizar cada palavra
-    title = ' '.join(word.capitalize() for word in title.split())
-    return title
+    if not complete:
+        return reused, changed, 0
+    removed = len([pid for pid in cached_projects if pid not in current_ids])
+    return reused, changed, removed
 
 
-def process_repository(repo: Dict) -> Dict:
+def unlisted_projects(repos: List[Dict], cache: Optional[Dict]):
     """
-    Processa um repositório e extrai informações relevantes
+    Projetos do cache que não vieram em uma listagem incompleta
 
     Args:
-        repo: Dados brutos do repositório
+        repos: Repositórios filtrados da listagem parcial
+        cache: Cache anterior ou None
 
     Returns:
-        Dados processados do projeto
+        Tupla (projetos mantidos, versão de cada um por id)
     """
-    log_info(f"Processando: {repo['name']}")
-
-    # Buscar linguagens
-    languages = fetch_repo_languages(repo['languages_url'])
-
-    # Buscar topics
-    topics = fetch_repo_topics(repo['owner']['login'], repo['name'])
-
-    # Determinar tecnologias
-    technologies = determine_technologies(languages)
-
-    # Se não encontrou tecnologias e tem language principal
-    if not technologies and repo.get('language'):
-        technologies = [repo['language']]
-
-    # Processar datas
-    created_at = datetime.strptime(repo['created_at'], '%Y-%m-%dT%H:%M:%SZ')
-    updated_at = datetime.strptime(repo['updated_at'], '%Y-%m-%dT%H:%M:%SZ')
-
-    # Verificar se foi atualizado recentemente (últimos 30 dias)
-    is_recent = (datetime.now() - updated_at).days <= 30
-
-    project = {
-        'id': repo['id'],
-        'name': repo['name'],
-        'title': format_repo_title(repo['name']),
-        'description': repo.get('description', 'Projeto desenvolvido com dedicação'),
-        'language': repo.get('language', 'Outras'),
-        'languages': list(languages.keys()),
-        'technologies': technologies,
-        'github_url': repo['html_url'],
-        'demo_url': get_demo_url(repo),
-        'stars': repo['stargazers_count'],
-        'forks': repo['forks_count'],
-        'watchers': repo['watchers_count'],
-        'created_at': created_at.strftime('%Y-%m-%d'),
-        'updated_at': updated_at.strftime('%Y-%m-%d'),
-        'topics': topics,
-        'has_wiki': repo.get('has_wiki', False),
-        'has_pages': repo.get('has_pages', False),
-        'is_recent': is_recent,
-        'size': repo.get('size', 0),
-    }
-
-    time.sleep(0.3)  # Pequeno delay entre requisições
-
+    if not cache:
+        return [], {}
+
+    current_ids = {repo['id'] for repo in repos}
+    cached_versions = cache.get('repo_versions', {})
+    kept = [refresh_cached_project(p) for p in cache.get('projects', [])
+            if p['id'] not in current_ids]
+    versions = {p['id']: cached_versions.get(str(p['id'])) for p in kept}
+    return kept, versions
+
+
+def refresh_cached_project(project: Dict) -> Dict:
+    """Recalcula campos que dependem da data atual em um projeto do cache"""
+    project = dict(project)
+    updated_at = datetime.strptime(project['updated_at'], '%Y-%m-%d')
+    project['is_recent'] = (datetime.now() - updated_at).days <= 30
     return project
 
 
-# ============================================
-# CACHE
-# ============================================
-
-def load_cache() -> Optional[Dict]:
-    """
-    Carrega cache de projetos se existir e for válido
-
-    Returns:
-        Dados do cache ou None
-    """
-    if not os.path.exists(CACHE_FILE):
-        return None
-
-    try:
-        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-            cache = json.load(f)
-
-        # Verificar se cache ainda é válido
-        cached_time = datetime.fromisoformat(cache['timestamp'])
-        if datetime.now() - cached_time < CACHE_DURATION:
-            log_success(f"Cache válido encontrado ({cache['timestamp']})")
-            return cache
-        else:
-            log_warning("Cache expirado")
-            return None
-
-    except Exception as e:
-        log_error(f"Erro ao carregar cache: {e}")
-        return None
-
-
-def save_cache(projects: List[Dict], stats: Dict):
+def save_cache(projects: List[Dict], stats: Dict, repo_versions: Optional[Dict] = None):
     """
     Salva projetos em cache
 
     Args:
         projects: Lista de projetos
         stats: Estatísticas gerais
+        repo_versions: Versão (pushed_at/updated_at) de cada repositório,
+            usada pelo build incremental
     """
     cache = {
         'timestamp': datetime.now().isoformat(),
         'username': GITHUB_USERNAME,
         'projects': projects,
         'stats': stats,
-        'count': len(projects)
+        'count': len(projects),
+        'repo_versions': repo_versions or {}
     }
 
     try:
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, indent=2, ensure_ascii=False)
+        # Gravação atômica: um build interrompido não corrompe o cache
+        with frontend_data.atomic_open(CACHE_FILE) as f:
+            for chunk in frontend_data.iter_json(cache):
+                f.write(chunk)
         log_success(f"Cache salvo: {len(projects)} projetos")
     except Exception as e:
         log_error(f"Erro ao salvar cache: {e}")
@@ -448,12 +252,56 @@ def calculate_stats(projects: List[Dict]) -> Dict:
 # BUILD PRINCIPAL
 # ============================================
 
-def build_portfolio(force_refresh: bool = False):
+class JsonSink:
+    """
+    Sink do pipeline: cache projects_data.json + static/data/projects.json
+
+    Args:
+        repos: Repositórios selecionados (para salvar a versão de cada um)
+        layout: Layout dos dados do frontend ('single' ou 'split')
+        kept: Projetos mantidos do build anterior, gravados depois dos
+            que vieram do pipeline (listagem incompleta)
+        kept_versions: Versão salva de cada projeto mantido, por id
+    """
+
+    def __init__(self, repos: List[Dict], layout: str = 'single',
+                 kept: Optional[List[Dict]] = None, kept_versions: Optional[Dict] = None):
+        self.layout = layout
+        self.versions = {repo['id']: repo_version(repo) for repo in repos}
+        self.versions.update(kept_versions or {})
+        self.kept = kept or []
+        self.projects = []
+        self.stats = None
+
+    def add(self, project: Dict):
+        self.projects.append(project)
+
+    def close(self) -> Dict:
+        self.projects.extend(self.kept)
+        log_info("\n📊 Calculando estatísticas...")
+        self.stats = calculate_stats(self.projects)
+        repo_versions = {str(p['id']): self.versions[p['id']] for p in self.projects}
+        save_cache(self.projects, self.stats, repo_versions)
+        save_frontend_data(self.projects, self.stats, self.layout)
+        return self.stats
+
+
+def build_portfolio(force_refresh: bool = False, workers: int = DEFAULT_WORKERS,
+                    incremental: bool = True, backend: str = DEFAULT_BACKEND,
+                    sync_db: bool = False, layout: str = 'single'):
     """
     Função principal que constrói o portfólio
 
     Args:
         force_refresh: Se True, ignora cache e busca novos dados
+        workers: Número de threads para buscar linguagens e topics
+        incremental: Se True, reaproveita projetos do cache cujos
+            repositórios não mudaram (pushed_at/updated_at)
+        backend: Backend de busca ('rest' ou 'graphql')
+        sync_db: Se True, a mesma passada também sincroniza a tabela de
+            projetos do app Flask (ver update_projects.ProjetoSink)
+        layout: 'single' (só projects.json) ou 'split' (índice + um
+            arquivo de detalhes por projeto), ver frontend_data.py
     """
     print("\n" + "="*60)
     print("🚀 BUILD PORTFOLIO - INTEGRAÇÃO GITHUB")
@@ -466,41 +314,45 @@ def build_portfolio(force_refresh: bool = False):
             log_success("Usando dados do cache")
             return cache
 
-    # Buscar repositórios do GitHub
-    repos = fetch_github_repos(GITHUB_USERNAME)
+    # Buscar e filtrar repositórios do GitHub
+    pipeline = Pipeline(backend=backend, workers=workers)
+    filtered_repos = pipeline.fetch(GITHUB_USERNAME)
 
-    if not repos:
+    if not filtered_repos:
         log_error("Nenhum repositório encontrado!")
         return None
 
-    # Filtrar repositórios
-    log_info("Filtrando repositórios...")
-    filtered_repos = [repo for repo in repos if should_include_repo(repo)]
     log_success(f"Repositórios após filtros: {len(filtered_repos)}")
 
-    # Processar cada repositório
-    projects = []
-    total = len(filtered_repos)
+    # Reaproveitar projetos que não mudaram desde o último build
+    previous = read_cache() if incremental and not force_refresh else None
+    reused, changed_repos, removed = plan_incremental(filtered_repos, previous,
+                                                      pipeline.complete)
 
-    print(f"\n📦 Processando {total} repositórios...\n")
+    # Listagem parcial: os projetos que não vieram continuam no portfólio
+    kept, kept_versions = [], {}
+    if not pipeline.complete:
+        kept, kept_versions = unlisted_projects(filtered_repos, read_cache())
+        log_warning(f"Listagem do GitHub incompleta: mantendo {len(kept)} projetos "
+                    f"do build anterior que não foram listados")
 
-    for i, repo in enumerate(filtered_repos, 1):
-        print(f"[{i}/{total}] ", end='')
-        try:
-            project = process_repository(repo)
-            projects.append(project)
-        except Exception as e:
-            log_error(f"Erro ao processar {repo['name']}: {e}")
+    print(f"\n📦 Processando {len(changed_repos)} repositórios "
+          f"({len(reused)} reaproveitados do cache)...\n")
 
-    # Calcular estatísticas
-    log_info("\n📊 Calculando estatísticas...")
-    stats = calculate_stats(projects)
+    # Uma passada pela API alimenta todos os destinos
+    json_sink = JsonSink(filtered_repos, layout, kept, kept_versions)
+    sinks = [json_sink]
+    if sync_db:
+        from update_projects import ProjetoSink
+        sinks.append(ProjetoSink())
 
-    # Salvar cache
-    save_cache(projects, stats)
+    drain(pipeline.stream(filtered_repos, reuse=reused), *sinks)
+    stats = json_sink.stats
 
-    # Salvar dados para frontend
-    save_frontend_data(projects, stats)
+    # Persistir cache HTTP (ETags)
+    http_cache = get_cache()
+    http_cache.save()
+    http_stats = http_cache.stats()
 
     # Exibir resumo
     print("\n" + "="*60)
@@ -508,52 +360,78 @@ def build_portfolio(force_refresh: bool = False):
     print("="*60)
     print(f"\n📊 Resumo:")
     print(f"  • Total de projetos: {stats['total_projects']}")
+    print(f"  • Reaproveitados: {pipeline.reused} | "
+          f"Atualizados: {pipeline.refreshed} | Removidos: {removed}"
+          + (f" | Mantidos (listagem incompleta): {len(kept)}" if kept else ""))
     print(f"  • Total de stars: {stats['total_stars']}")
     print(f"  • Total de forks: {stats['total_forks']}")
     print(f"  • Projetos recentes: {stats['recent_projects']}")
     print(f"  • Última atualização: {stats['last_updated']}")
+    print(f"  • Cache HTTP: {http_stats['hits']} hits (304) / "
+          f"{http_stats['misses']} misses "
+          f"({http_stats['hit_ratio']:.0%}, {http_stats['entries']} URLs)")
     print("\n" + "="*60 + "\n")
 
-    return {'projects': projects, 'stats': stats}
+    return {'projects': json_sink.projects, 'stats': stats}
 
 
-def save_frontend_data(projects: List[Dict], stats: Dict):
+def save_frontend_data(projects: List[Dict], stats: Dict, layout: str = 'single'):
     """
-    Salva dados para uso no frontend
+    Salva dados para uso no frontend (JSON compacto + .gz/.br)
 
     Args:
         projects: Lista de projetos
         stats: Estatísticas
+        layout: 'single' ou 'split' (ver frontend_data.py)
     """
-    os.makedirs('static/data', exist_ok=True)
-
-    data = {
-        'projects': projects,
-        'stats': stats,
-        'generated_at': datetime.now().isoformat()
-    }
-
     try:
-        with open('static/data/projects.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        log_success("Dados salvos para frontend: static/data/projects.json")
+        report = frontend_data.emit(projects, stats, datetime.now().isoformat(), layout)
+        log_success(f"Dados salvos para frontend: static/data/ (layout {layout})")
+        frontend_data.print_report(report)
     except Exception as e:
         log_error(f"Erro ao salvar dados do frontend: {e}")
 
+    # Se o app estático estiver carregado neste processo, descartar o
+    # cache em memória (outros processos detectam a mudança pelo mtime)
+    app_static = sys.modules.get('app_static')
+    if app_static is not None:
+        app_static.invalidate_projects_cache()
+
 
 # ============================================
 # MAIN
 # ============================================
 
 if __name__ == '__main__':
-    import sys
-
     force_refresh = '--force' in sys.argv or '-f' in sys.argv
+    incremental = '--full' not in sys.argv
+    sync_db = '--db' in sys.argv
+    layout = 'split' if '--split' in sys.argv else 'single'
+
+    workers = DEFAULT_WORKERS
+    if '--workers' in sys.argv:
+        try:
+            workers = int(sys.argv[sys.argv.index('--workers') + 1])
+        except (IndexError, ValueError):
+            log_error("Uso: --workers N (N inteiro)")
+            sys.exit(1)
+
+    backend = DEFAULT_BACKEND
+    if '--backend' in sys.argv:
+        try:
+            backend = sys.argv[sys.argv.index('--backend') + 1]
+        except IndexError:
+            backend = ''
+        if backend not in BACKENDS:
+            log_error(f"Uso: --backend {{{'|'.join(BACKENDS)}}}")
+            sys.exit(1)
 
     if force_refresh:
         log_info("Modo force refresh ativado")
 
-    result = build_portfolio(force_refresh=force_refresh)
+    result = build_portfolio(force_refresh=force_refresh, workers=workers,
+                             incremental=incremental, backend=backend, sync_db=sync_db,
+                             layout=layout)
 
     if result:
         print("💡 Próximos passos:")
@@ -0,0 +1,217 @@
+"""
+Proteção barata contra spam no POST /contato
+Tudo roda antes de qualquer acesso ao banco: campo honeypot, limite por
+IP e por e-mail (token bucket) e descarte de mensagens repetidas (hash
+das mensagens recentes em um conjunto limitado).
+
+Autor: Natália Barros
+"""
+
+import time
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+# ============================================
+# TOKEN BUCKET
+# ============================================
+
+
+class MemoryBuckets:
+    """Baldes em memória do processo (LRU limitado a max_keys chaves)"""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, now=None):
+        """
+        Consome uma ficha do balde `key`
+
+        Args:
+            key: Identificador (ex: 'ip:1.2.3.4')
+            rate: Fichas repostas por segundo
+            burst: Capacidade do balde
+            now: Instante atual (para testes)
+
+        Returns:
+            (permitido, segundos até a próxima ficha)
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            permitido = tokens >= 1
+            if permitido:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return permitido, 0.0 if permitido else (1 - tokens) / rate
+
+
+class RedisBuckets:
+    """
+    Baldes compartilhados entre workers em um Redis
+
+    O cálculo roda em um script Lua (atômico no servidor). Usa o relógio
+    do cliente, então os workers precisam de relógios sincronizados.
+    """
+
+    SCRIPT = """
+    local dados = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local tokens = tonumber(dados[1]) or burst
+    local last = tonumber(dados[2]) or now
+    tokens = math.min(burst, tokens + math.max(now - last, 0) * rate)
+    local permitido = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        permitido = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {permitido, tostring(tokens)}
+    """
+
+    def __init__(self, client, prefix='limite:'):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    def take(self, key, rate, burst, now=None):
+        now = time.time() if now is None else now
+        permitido, tokens = self._script(keys=[self.prefix + key], args=[rate, burst, now])
+        tokens = float(tokens)
+        return bool(permitido), 0.0 if permitido else (1 - tokens) / rate
+
+
+def buckets_from_url(url=None, max_keys=10000):
+    """Baldes no Redis (url redis://...) ou em memória se vazia"""
+    if url:
+        import redis  # Dependência opcional
+        return RedisBuckets(redis.Redis.from_url(url))
+    return MemoryBuckets(max_keys=max_keys)
+
+
+# ============================================
+# MENSAGENS REPETIDAS
+# ============================================
+
+
+class RecentDigests:
+    """Conjunto limitado de hashes de mensagens recentes (com validade)"""
+
+    def __init__(self, max_entries=5000, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(*partes):
+        """Hash insensível a maiúsculas e espaços extras"""
+        texto = '\x00'.join(' '.join((p or '').split()).lower() for p in partes)
+        return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).digest()
+
+    def contains(self, digest, now=None):
+        """True se o hash foi registrado dentro do ttl (não registra)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            visto = self._digests.get(digest)
+            return visto is not None and now - visto < self.ttl
+
+    def add(self, digest, now=None):
+        """Registra o hash (chamar só depois que a mensagem foi aceita)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._digests.pop(digest, None)
+            self._digests[digest] = now
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+
+
+# ============================================
+# FILTRO DO FORMULÁRIO
+# ============================================
+
+
+class ContactGuard:
+    """
+    Decide se um POST de contato deve ser aceito
+
+    Args:
+        buckets: MemoryBuckets ou RedisBuckets
+        ip_rate: Mensagens por hora por IP
+        ip_burst: Mensagens seguidas permitidas por IP
+        email_rate: Mensagens por hora por e-mail
+        email_burst: Mensagens seguidas permitidas por e-mail
+        honeypot_field: Campo escondido que só robôs preenchem
+        digests: RecentDigests das mensagens recentes
+    """
+
+    def __init__(self, buckets=None, ip_rate=10, ip_burst=3, email_rate=5, email_burst=2,
+                 honeypot_field='website', digests=None):
+        self.buckets = buckets or MemoryBuckets()
+        self.ip_rate = ip_rate / 3600
+        self.ip_burst = ip_burst
+        self.email_rate = email_rate / 3600
+        self.email_burst = email_burst
+        self.honeypot_field = honeypot_field
+        self.digests = digests or RecentDigests()
+        self.rejections = Counter()
+        self._lock = threading.Lock()
+
+    def _reject(self, motivo, retry_after=0.0):
+        with self._lock:
+            self.rejections[motivo] += 1
+        return motivo, retry_after
+
+    def check_request(self, form, ip):
+        """
+        Verificações que não dependem do conteúdo (antes de validar campos)
+
+        Returns:
+            (motivo, segundos para tentar de novo) ou (None, 0) se aceito
+        """
+        if form.get(self.honeypot_field):
+            return self._reject('honeypot')
+
+        permitido, espera = self.buckets.take(f'ip:{ip}', self.ip_rate, self.ip_burst)
+        if not permitido:
+            return self._reject('limite_ip', espera)
+        return None, 0.0
+
+    def check_message(self, nome, email, assunto, mensagem):
+        """
+        Verificações da mensagem já validada (limite por e-mail e repetição)
+
+        Não registra a mensagem: chame record_message depois que ela for
+        gravada, senão um reenvio após falha seria tratado como repetido.
+
+        Returns:
+            (motivo, segundos para tentar de novo) ou (None, 0) se aceita
+        """
+        email = (email or '').strip().lower()
+        if self.digests.contains(self.digests.digest(email, assunto, mensagem)):
+            return self._reject('duplicada')
+
+        permitido, espera = self.buckets.take(f'email:{email}', self.email_rate, self.email_burst)
+        if not permitido:
+            return self._reject('limite_email', espera)
+        return None, 0.0
+
+    def record_message(self, email, assunto, mensagem):
+        """Registra uma mensagem aceita (reenvios dela passam a ser repetidos)"""
+        email = (email or '').strip().lower()
+        self.digests.add(self.digests.digest(email, assunto, mensagem))
+
+    def count(self, motivo):
+        """Conta uma rejeição feita fora do guard (ex: campos faltando)"""
+        self._reject(motivo)
+
+    def metrics(self):
+        """Rejeições por motivo (deste processo)"""
+        with self._lock:
+            return dict(self.rejections)
@@ -0,0 +1,256 @@
+"""
+Fila de escrita (write-behind) para mensagens de contato
+O POST /contato só grava a mensagem em um spool SQLite local (durável,
+fsync no commit) e retorna; uma thread em segundo plano move as mensagens
+para o banco principal em lotes, com limite de tamanho e de latência.
+
+Garantia: nenhuma mensagem aceita é perdida. Se o processo morrer, o
+spool continua em disco e é drenado pelo próximo worker que iniciar a
+fila (lotes que ele tinha reservado voltam após RESERVA_EXPIRA). Um crash
+entre o commit no banco e a remoção do spool pode gravar o lote duas
+vezes (entrega "pelo menos uma vez").
+
+Autor: Natália Barros
+"""
+
+import os
+import json
+import time
+import uuid
+import atexit
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+# ============================================
+# CONFIGURAÇÕES
+# ============================================
+
+LOTE_PADRAO = 50         # Mensagens por transação no banco principal
+LATENCIA_PADRAO = 2.0    # Segundos máximos entre o POST e a gravação
+ESPERA_MAXIMA_ERRO = 60  # Backoff máximo quando o banco está fora
+RESERVA_EXPIRA = 300     # Segundos até um lote reservado por um worker morto voltar à fila
+
+
+class ContactQueue:
+    """
+    Spool SQLite + thread que grava lotes com `flush_fn`
+
+    Args:
+        path: Arquivo do spool
+        flush_fn: Função que recebe uma lista de dicts e os grava em uma
+            única transação (deve levantar exceção em caso de erro)
+        batch_size: Máximo de mensagens por lote
+        max_latency: Intervalo máximo entre gravações (segundos)
+    """
+
+    def __init__(self, path, flush_fn, batch_size=LOTE_PADRAO, max_latency=LATENCIA_PADRAO):
+        self.path = path
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._pid = None
+        self._thread = None
+        self._conn = None
+        self._pending = 0
+        self.stats = {'enqueued': 0, 'flushed': 0, 'batches': 0, 'failures': 0}
+
+    # ---------- spool ----------
+
+    def _connection(self):
+        """Conexão do processo atual (recriada após fork)"""
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=FULL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS spool ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, dados TEXT NOT NULL, '
+                'reserva TEXT, reservado_em REAL)'
+            )
+            # Spools criados antes das colunas de reserva
+            colunas = {row[1] for row in conn.execute('PRAGMA table_info(spool)')}
+            for coluna, tipo in (('reserva', 'TEXT'), ('reservado_em', 'REAL')):
+                if coluna not in colunas:
+                    conn.execute(f'ALTER TABLE spool ADD COLUMN {coluna} {tipo}')
+            self._conn = conn
+            self._pid = os.getpid()
+            self._thread = None
+            self._pending = 0
+        return self._conn
+
+    def enqueue(self, dados):
+        """
+        Grava a mensagem no spool (durável) e agenda a gravação no banco
+
+        Args:
+            dados: Dict serializável em JSON com os campos do contato
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute('INSERT INTO spool (dados) VALUES (?)', (json.dumps(dados),))
+            self._pending += 1
+            self.stats['enqueued'] += 1
+            cheio = self._pending >= self.batch_size
+        self.start()
+        if cheio:
+            self._wakeup.set()
+
+    def pending(self):
+        """Mensagens ainda no spool (de todos os processos)"""
+        with self._lock:
+            return self._connection().execute('SELECT COUNT(*) FROM spool').fetchone()[0]
+
+    # ---------- gravação ----------
+
+    def flush(self):
+        """
+        Move tudo o que está no spool para o banco, em lotes
+
+        Returns:
+            Quantidade de mensagens gravadas
+        """
+        total = 0
+        while True:
+            gravadas = self._flush_batch()
+            total += gravadas
+            if gravadas < self.batch_size:
+                return total
+
+    def _flush_batch(self):
+        # Nenhum lock (nem o do processo, nem o de escrita do spool) fica
+        # preso enquanto o banco principal grava: enqueue() nunca espera por ele
+        reserva, rows = self._claim()
+        if not rows:
+            return 0
+
+        try:
+            self.flush_fn([json.loads(dados) for _, dados in rows])
+        except Exception:
+            self._release(reserva, 'UPDATE spool SET reserva = NULL, reservado_em = NULL '
+                                   'WHERE reserva = ?')
+            with self._lock:
+                self.stats['failures'] += 1
+            raise
+
+        self._release(reserva, 'DELETE FROM spool WHERE reserva = ?')
+        with self._lock:
+            self.stats['flushed'] += len(rows)
+            self.stats['batches'] += 1
+            self._pending = max(self._pending - len(rows), 0)
+        return len(rows)
+
+    def _claim(self):
+        """
+        Reserva o próximo lote em uma transação curta
+
+        BEGIN IMMEDIATE trava o spool para escrita só durante a reserva:
+        dois workers nunca gravam as mesmas linhas. Reservas mais antigas
+        que RESERVA_EXPIRA (worker que morreu no meio) voltam a valer.
+
+        Returns:
+            Tupla (id da reserva, linhas (id, dados))
+        """
+        reserva = uuid.uuid4().hex
+        agora = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = conn.execute(
+                    'SELECT id, dados FROM spool '
+                    'WHERE reserva IS NULL OR reservado_em < ? ORDER BY id LIMIT ?',
+                    (agora - RESERVA_EXPIRA, self.batch_size)
+                ).fetchall()
+                if rows:
+                    conn.executemany(
+                        'UPDATE spool SET reserva = ?, reservado_em = ? WHERE id = ?',
+                        [(reserva, agora, row_id) for row_id, _ in rows]
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return reserva, rows
+
+    def _release(self, reserva, sql):
+        """Conclui a reserva (apaga ou devolve as linhas) em uma transação curta"""
+        with self._lock:
+            self._connection().execute(sql, (reserva,))
+
+    def _run(self):
+        espera = self.max_latency
+        while not self._stop.is_set():
+            self._wakeup.wait(espera)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                espera = self.max_latency
+            except Exception as e:
+                # Mensagens continuam no spool; tenta de novo com backoff
+                espera = min(espera * 2, ESPERA_MAXIMA_ERRO)
+                logger.error("Erro ao gravar contatos (nova tentativa em %.0fs): %s", espera, e)
+
+    def start(self):
+        """Inicia a thread de gravação deste processo (idempotente)"""
+        with self._lock:
+            self._connection()
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='contact-queue', daemon=True)
+            self._thread.start()
+        # O spool pode ter mensagens de um processo que morreu
+        self._wakeup.set()
+
+    def stop(self, flush=True):
+        """Para a thread e (opcionalmente) grava o que restou"""
+        self._stop.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            thread.join(timeout=5)
+        if flush:
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Contatos mantidos no spool para a próxima execução: %s", e)
+
+    def metrics(self):
+        """Contadores deste processo + tamanho atual do spool"""
+        with self._lock:
+            dados = dict(self.stats)
+        dados['spool'] = self.pending()
+        return dados
+
+
+def create_queue(flush_fn, spool_path, environ=None):
+    """
+    Cria a fila a partir do ambiente e grava o restante ao encerrar
+
+    Variáveis: CONTATOS_SPOOL (arquivo, substitui spool_path), CONTATOS_LOTE
+    (tamanho do lote), CONTATOS_LATENCIA (segundos)
+    """
+    environ = os.environ if environ is None else environ
+    queue = ContactQueue(
+        environ.get('CONTATOS_SPOOL', spool_path),
+        flush_fn,
+        batch_size=int(environ.get('CONTATOS_LOTE', LOTE_PADRAO)),
+        max_latency=float(environ.get('CONTATOS_LATENCIA', LATENCIA_PADRAO)),
+    )
+
+    def encerrar():
+        if queue._thread is not None:
+            queue.stop()
+
+    atexit.register(encerrar)
+    return queue
@@ -0,0 +1,248 @@
+"""
+Configuração do pool de conexões do SQLAlchemy
+Tamanho, overflow, recycle, timeouts e pre-ping vêm de variáveis de
+ambiente; o pool é descartado em cada processo filho após o fork (workers
+do gunicorn) e expõe métricas de uso. Também fornece o INSERT com upsert
+do dialeto (ON CONFLICT) para escritas em massa.
+
+Autor: Natália Barros
+
+Variáveis de ambiente (PostgreSQL):
+    DB_POOL_SIZE              Conexões mantidas abertas por worker (padrão 5)
+    DB_MAX_OVERFLOW           Conexões extras em picos (padrão 5)
+    DB_POOL_RECYCLE           Segundos até reabrir uma conexão (padrão 1800)
+    DB_POOL_TIMEOUT           Segundos esperando uma conexão livre (padrão 10)
+    DB_STATEMENT_TIMEOUT_MS   Tempo máximo de uma query (padrão 0 = sem limite).
+                              Aplicado com SET em cada conexão nova; atrás de
+                              PgBouncer em modo transaction, prefira
+                              ALTER ROLE ... SET statement_timeout
+"""
+
+import os
+import time
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# ============================================
+# OPÇÕES DO ENGINE
+# ============================================
+
+
+def _env_int(environ, name, default):
+    value = environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def engine_options(database_url, environ=None):
+    """
+    Monta SQLALCHEMY_ENGINE_OPTIONS a partir do ambiente
+
+    Args:
+        database_url: URL do banco (só PostgreSQL recebe pool configurado)
+        environ: Variáveis de ambiente (padrão: os.environ)
+
+    Returns:
+        Dict de opções para create_engine
+    """
+    environ = os.environ if environ is None else environ
+
+    if not database_url.startswith('postgresql'):
+        # SQLite local: pool padrão do SQLAlchemy
+        return {}
+
+    options = {
+        'poolclass': MeteredQueuePool,
+        'pool_size': _env_int(environ, 'DB_POOL_SIZE', 5),
+        'max_overflow': _env_int(environ, 'DB_MAX_OVERFLOW', 5),
+        'pool_recycle': _env_int(environ, 'DB_POOL_RECYCLE', 1800),
+        'pool_timeout': _env_int(environ, 'DB_POOL_TIMEOUT', 10),
+        # Testa a conexão antes de usar: evita erros com conexões que o
+        # Heroku/PgBouncer já fechou
+        'pool_pre_ping': True,
+    }
+
+    # statement_timeout não vai como parâmetro de startup (options=-c ...):
+    # PgBouncer e outros poolers recusam a conexão. Ver set_statement_timeout
+    return options
+
+
+def set_statement_timeout(engine, environ=None):
+    """
+    Aplica DB_STATEMENT_TIMEOUT_MS (opcional) a cada conexão nova do PostgreSQL
+
+    Args:
+        engine: Engine do SQLAlchemy (db.engine)
+        environ: Variáveis de ambiente (padrão: os.environ)
+    """
+    environ = os.environ if environ is None else environ
+    timeout = _env_int(environ, 'DB_STATEMENT_TIMEOUT_MS', 0)
+    if not timeout or engine.dialect.name != 'postgresql':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def definir_timeout(dbapi_connection, connection_record):
+        # Fora de transação: um rollback posterior não desfaz o SET
+        autocommit = dbapi_connection.autocommit
+        dbapi_connection.autocommit = True
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'SET statement_timeout = {int(timeout)}')
+        finally:
+            cursor.close()
+            dbapi_connection.autocommit = autocommit
+
+
+# ============================================
+# MÉTRICAS
+# ============================================
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool que mede quanto tempo cada checkout esperou por conexão"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout(time.perf_counter() - start)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class PoolStats:
+    """Contadores do pool (por processo)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self, seconds):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self):
+        """Cópia consistente dos contadores (tempos em ms)"""
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'wait_avg_ms': 1000 * self.wait_total / self.checkouts if self.checkouts else 0.0,
+                'wait_max_ms': 1000 * self.wait_max,
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+            }
+
+
+def instrument(engine):
+    """
+    Registra eventos de métricas e o descarte do pool após fork
+
+    Args:
+        engine: Engine do SQLAlchemy (db.engine)
+    """
+    if not isinstance(engine.pool, MeteredQueuePool):
+        return
+
+    @event.listens_for(engine, 'connect')
+    def contar_conexao(dbapi_connection, connection_record):
+        engine.pool.stats.record_connect()
+
+    @event.listens_for(engine, 'invalidate')
+    def contar_invalidacao(dbapi_connection, connection_record, exception):
+        engine.pool.stats.record_invalidation()
+
+    def descartar_pool_herdado():
+        # O filho não pode usar os sockets abertos pelo processo pai:
+        # close=False só abandona as conexões herdadas, sem fechá-las
+        engine.dispose(close=False)
+        engine.pool.stats.reset()
+
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=descartar_pool_herdado)
+
+
+def pool_metrics(engine):
+    """
+    Estado atual do pool
+
+    Returns:
+        Dict com conexões em uso, overflow e tempos de espera
+    """
+    pool = engine.pool
+    metrics = {'pool': type(pool).__name__, 'status': pool.status()}
+
+    if isinstance(pool, QueuePool):
+        metrics.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+        })
+
+    stats = getattr(pool, 'stats', None)
+    if stats is not None:
+        metrics.update(stats.snapshot())
+
+    return metrics
+
+
+# ============================================
+# UPSERT
+# ============================================
+
+
+def dialect_insert(connection, table):
+    """
+    INSERT do dialeto atual, com on_conflict_do_update/do_nothing
+
+    Args:
+        connection: Conexão (ou engine) do SQLAlchemy
+        table: Tabela do insert
+
+    Returns:
+        Insert de sqlalchemy.dialects.postgresql ou .sqlite
+    """
+    dialects = {'postgresql': postgresql, 'sqlite': sqlite}
+    dialect = dialects.get(connection.dialect.name)
+    if dialect is None:
+        raise NotImplementedError(f"Upsert não suportado para {connection.dialect.name}")
+    return dialect.insert(table)
@@ -6,17 +6,37 @@ Autor: Natália Barros
 """
 
 import os
+import json
+import time
 import shutil
-from flask_frozen import Freezer
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from flask import request, template_rendered
+from flask_frozen import Freezer, patch_url_for, walk_directory
+from jinja2 import meta
 from app_static import app
+import assets
+import frontend_data
 
 # Configurar Freezer
 app.config['FREEZER_DESTINATION'] = 'docs'
 app.config['FREEZER_RELATIVE_URLS'] = True
+# Arquivos criados fora do Freezer (não devem ser removidos como órfãos)
+app.config['FREEZER_DESTINATION_IGNORE'] = ['.nojekyll', 'CNAME', '404.html',
+                                            assets.DIST_DIR + '/*', assets.HEADERS_FILE]
+# Cópias locais dos assets de CDN só entram no site via bundles (assets.py)
+app.config['FREEZER_STATIC_IGNORE'] = ['vendor/']
 # Não definir FREEZER_BASE_URL para usar URLs relativas que funcionam localmente e no GitHub Pages
 
 freezer = Freezer(app)
 
+# Manifesto do build incremental: hash das entradas de cada URL gerada
+MANIFEST_FILE = '.freeze_manifest.json'
+
+# Entradas compartilhadas por todas as páginas renderizadas
+PAGE_INPUTS = ['app_static.py', 'static/data/projects.json', 'static/data/projects.index.json']
+PAGE_INPUT_DIRS = ['static/css', 'static/js', 'static/data/projects']
+
 
 # Não gerar 404.html via generator - será criado manualmente
 
@@ -31,23 +51,342 @@ def clean_docs():
         print("✅ Diretório limpo")
 
 
+# ============================================
+# BUILD INCREMENTAL
+# ============================================
+
+def hash_file(path):
+    """Hash SHA-256 do conteúdo de um arquivo ('' se não existir)"""
+    if not os.path.isfile(path):
+        return ''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest():
+    """Carrega o manifesto do último build incremental"""
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    """Salva o manifesto do build incremental (gravação atômica)"""
+    content = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    with frontend_data.atomic_open(MANIFEST_FILE) as f:
+        f.write(content)
+
+
+def template_chain(name, seen=None):
+    """
+    Resolve um template e todos os que ele estende/inclui
+
+    Args:
+        name: Nome do template (ex: 'index_static.html')
+
+    Returns:
+        Conjunto de caminhos dos arquivos de template
+    """
+    seen = seen if seen is not None else set()
+    if name in seen:
+        return set()
+    seen.add(name)
+
+    source, filename, _ = app.jinja_env.loader.get_source(app.jinja_env, name)
+    files = {filename}
+    for child in meta.find_referenced_templates(app.jinja_env.parse(source)):
+        if child:  # None quando o nome é dinâmico
+            files |= template_chain(child, seen)
+    return files
+
+
+class IncrementalFreeze:
+    """
+    Decide quais URLs precisam ser renderizadas de novo
+
+    Cada URL tem um hash das suas entradas: para páginas, a cadeia de
+    templates + PAGE_INPUTS + assets; para arquivos estáticos, o próprio
+    arquivo. Se o hash não mudou e o arquivo existe, o Freezer pula a URL.
+    """
+
+    def __init__(self):
+        self.previous = load_manifest()
+        self.manifest = {}
+        self.rendered = []
+        self.skipped = []
+        self.timings = {}
+        self.elapsed = 0.0
+        self._templates = {}
+        self._unchanged = set()
+        self._file_hashes = {}
+        self._page_hash = None
+
+    def _hash(self, path):
+        if path not in self._file_hashes:
+            self._file_hashes[path] = hash_file(path)
+        return self._file_hashes[path]
+
+    def page_inputs_hash(self):
+        """Hash das entradas comuns a todas as páginas"""
+        if self._page_hash is None:
+            paths = list(PAGE_INPUTS)
+            for directory in PAGE_INPUT_DIRS:
+                for root, _, files in os.walk(directory):
+                    paths.extend(os.path.join(root, f) for f in files)
+            digest = hashlib.sha256()
+            for path in sorted(paths):
+                digest.update(f"{path}:{self._hash(path)}\n".encode('utf-8'))
+            self._page_hash = digest.hexdigest()
+        return self._page_hash
+
+    def inputs_hash(self, url, templates):
+        """Hash das entradas de uma URL"""
+        static_prefix = app.static_url_path + '/'
+        if url.startswith(static_prefix):
+            source = os.path.join(app.static_folder, url[len(static_prefix):])
+            return 'static:' + self._hash(source)
+
+        if not templates:
+            return None
+
+        digest = hashlib.sha256(self.page_inputs_hash().encode('utf-8'))
+        files = set()
+        for name in templates:
+            files |= template_chain(name)
+        for path in sorted(files):
+            digest.update(f"{path}:{self._hash(path)}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def skip(self, url, path):
+        """Callback FREEZER_SKIP_EXISTING: True se a URL não mudou"""
+        entry = self.previous.get(url)
+        if not entry or not os.path.isfile(path):
+            return False
+        try:
+            current = self.inputs_hash(url, entry.get('templates', []))
+        except Exception:
+            return False
+        if current is None or current != entry.get('inputs'):
+            return False
+        self._unchanged.add(url)
+        return True
+
+    def record_template(self, sender, template, context, **extra):
+        """Sinal template_rendered: anota qual template gerou cada URL"""
+        self._templates.setdefault(request.path, []).append(template.name)
+
+    def finish_url(self, url):
+        """Atualiza o manifesto depois que o Freezer processou a URL"""
+        templates = self._templates.pop(url, [])
+        if url in self._unchanged:
+            # Não renderizou: reaproveitar entrada anterior
+            self.skipped.append(url)
+            entry = dict(self.previous[url])
+        else:
+            self.rendered.append(url)
+            entry = {'templates': sorted(set(templates))} if templates else {}
+        entry['inputs'] = self.inputs_hash(url, entry.get('templates', []))
+        self.manifest[url] = entry
+
+
+def freeze_incremental():
+    """
+    Gera o site renderizando apenas URLs cujas entradas mudaram
+
+    Arquivos só são reescritos quando o conteúdo muda e arquivos órfãos
+    são removidos pelo próprio Freezer (FREEZER_REMOVE_EXTRA_FILES).
+
+    Returns:
+        Instância de IncrementalFreeze com as URLs renderizadas/puladas
+    """
+    state = IncrementalFreeze()
+    app.config['FREEZER_SKIP_EXISTING'] = state.skip
+
+    start = last = time.perf_counter()
+    with template_rendered.connected_to(state.record_template, app):
+        for page in freezer.freeze_yield():
+            now = time.perf_counter()
+            state.finish_url(page.url)
+            if page.url in state.rendered:
+                state.timings[page.url] = now - last
+            last = now
+
+    state.elapsed = time.perf_counter() - start
+    app.config['FREEZER_SKIP_EXISTING'] = False
+    save_manifest(state.manifest)
+    return state
+
+
+# ============================================
+# BUILD PARALELO
+# ============================================
+
+def render_urls(urls):
+    """
+    Renderiza URLs em um processo worker (cada processo tem o seu app)
+
+    Args:
+        urls: Lista de URLs a renderizar
+
+    Returns:
+        Dicionário url → (conteúdo em bytes, templates usados, segundos)
+    """
+    results = {}
+    templates = []
+
+    def record(sender, template, context, **extra):
+        templates.append(template.name)
+
+    client = app.test_client()
+    with template_rendered.connected_to(record, app), patch_url_for(app):
+        for url in urls:
+            templates.clear()
+            start = time.perf_counter()
+            response = client.get(url, follow_redirects=True)
+            if response.status_code != 200:
+                raise ValueError(f'Unexpected status {response.status!r} on URL {url}')
+            results[url] = (response.data, sorted(set(templates)),
+                            time.perf_counter() - start)
+            response.close()
+    return results
+
+
+def freeze_parallel(workers):
+    """
+    Gera o site distribuindo as URLs entre processos
+
+    Os workers apenas renderizam; o processo principal grava os arquivos
+    na ordem das URLs, então o resultado é o mesmo do build sequencial.
+    Apenas URLs dos geradores do Freezer são consideradas (links
+    descobertos via url_for durante a renderização não são seguidos).
+
+    Args:
+        workers: Número de processos
+
+    Returns:
+        Instância de IncrementalFreeze com as URLs renderizadas/puladas
+    """
+    state = IncrementalFreeze()
+    start = time.perf_counter()
+
+    urls = list(dict.fromkeys(freezer.all_urls()))
+    paths = {url: freezer.root / freezer.urlpath_to_filepath(url) for url in urls}
+    pending = [url for url in urls if not state.skip(url, str(paths[url]))]
+
+    results = {}
+    if pending:
+        workers = max(1, min(workers, len(pending)))
+        chunks = [pending[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_results in executor.map(render_urls, chunks):
+                results.update(chunk_results)
+
+    for url in urls:
+        if url in results:
+            content, templates, elapsed = results[url]
+            paths[url].parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(paths[url], content)
+            state._templates[url] = templates
+            state.timings[url] = elapsed
+        state.finish_url(url)
+
+    # Remover arquivos órfãos (mesma regra do Freezer)
+    ignore = app.config['FREEZER_DESTINATION_IGNORE']
+    built = {str(path) for path in paths.values()}
+    for name in walk_directory(freezer.root, ignore=ignore):
+        path = freezer.root / name
+        if str(path) not in built:
+            path.unlink()
+
+    state.elapsed = time.perf_counter() - start
+    save_manifest(state.manifest)
+    return state
+
+
+def print_render_stats(state):
+    """Exibe tempo de renderização por rota e páginas/segundo"""
+    if not state.timings:
+        return
+    print("\n⏱️  Tempo por rota:")
+    for url in sorted(state.timings):
+        print(f"  • {url}: {state.timings[url] * 1000:.1f} ms")
+    pages_per_sec = len(state.rendered) / state.elapsed if state.elapsed else 0
+    print(f"  • Total: {len(state.rendered)} páginas em {state.elapsed:.2f}s "
+          f"({pages_per_sec:.1f} páginas/s)")
+
+
+def write_if_changed(path, content):
+    """Escreve bytes em um arquivo apenas se o conteúdo mudou"""
+    if os.path.isfile(path):
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    with open(path, 'wb') as f:
+        f.write(content)
+    return True
+
+
+def copy_file_if_changed(source, destination):
+    """Copia um arquivo apenas se o conteúdo mudou"""
+    with open(source, 'rb') as f:
+        return write_if_changed(destination, f.read())
+
+
+def sync_directory(source, destination):
+    """
+    Espelha `source` em `destination`: copia o que mudou e remove o que
+    não existe mais na origem
+
+    Returns:
+        (arquivos copiados, arquivos removidos, total de arquivos)
+    """
+    wanted = set()
+    copied = 0
+    for root, _, files in os.walk(source):
+        target_dir = os.path.join(destination, os.path.relpath(root, source))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in files:
+            target = os.path.normpath(os.path.join(target_dir, name))
+            wanted.add(target)
+            if copy_file_if_changed(os.path.join(root, name), target):
+                copied += 1
+
+    removed = 0
+    for root, dirs, files in os.walk(destination, topdown=False):
+        for name in files:
+            path = os.path.normpath(os.path.join(root, name))
+            if path not in wanted:
+                os.remove(path)
+                removed += 1
+        if root != destination and not os.listdir(root):
+            os.rmdir(root)
+
+    return copied, removed, len(wanted)
+
+
 def copy_static_files():
     """
     Copia arquivos estáticos adicionais
     """
     print("📁 Copiando arquivos estáticos...")
 
-    # Criar diretório se não existir
-    os.makedirs('docs/static/data', exist_ok=True)
-
-    # Copiar projects.json se existir
-    if os.path.exists('static/data/projects.json'):
-        shutil.copy('static/data/projects.json', 'docs/static/data/projects.json')
-        print("✅ projects.json copiado")
+    # Publicar static/data no layout que o build_portfolio gerou
+    # (projects.json ou índice + detalhes, com as versões .gz/.br)
+    if os.path.isdir('static/data'):
+        copied, removed, total = sync_directory('static/data', 'docs/static/data')
+        print(f"✅ static/data publicado: {total} arquivos "
+              f"({copied} atualizados, {removed} removidos)")
 
     # Copiar CNAME para GitHub Pages (se existir)
     if os.path.exists('CNAME'):
-        shutil.copy('CNAME', 'docs/CNAME')
+        copy_file_if_changed('CNAME', 'docs/CNAME')
         print("✅ CNAME copiado")
 
 
@@ -56,8 +395,7 @@ def create_nojekyll():
     Cria arquivo .nojekyll para desabilitar Jekyll no GitHub Pages
     """
     nojekyll_path = 'docs/.nojekyll'
-    with open(nojekyll_path, 'w') as f:
-        f.write('')
+    write_if_changed(nojekyll_path, b'')
     print("✅ .nojekyll criado")
 
 
@@ -98,22 +436,49 @@ def create_404():
     print("✅ 404.html criado")
 
 
-def build():
+def build(full=False, workers=1, bundle_assets=True, allow_cdn=False):
     """
     Função principal de build
+
+    Args:
+        full: Se True, apaga docs/ e renderiza todas as URLs (modo antigo).
+            Caso contrário, renderiza apenas URLs cujas entradas mudaram.
+        workers: Número de processos para renderizar as páginas
+        bundle_assets: Se True, troca CSS/JS de CDN por bundles locais
+            minificados com hash no nome (ver assets.py)
+        allow_cdn: Se True, assets de CDN que não puderem ser baixados
+            continuam vindo do CDN; se False, o build falha
     """
     print("\n" + "="*60)
     print("❄️  FREEZING FLASK APP → STATIC SITE")
     print("="*60 + "\n")
 
     try:
-        # Limpar diretório docs
-        clean_docs()
+        # Cópias locais dos assets de CDN antes de tocar em docs/: sem
+        # internet (e sem --cdn) o build falha sem deixar docs/ pela metade
+        if bundle_assets:
+            assets.ensure_vendor(allow_cdn=allow_cdn)
+
+        if full:
+            # Limpar diretório docs
+            clean_docs()
+            if os.path.exists(MANIFEST_FILE):
+                os.remove(MANIFEST_FILE)
+
+        # Índice de busca da página de projetos (dados de builds antigos)
+        if frontend_data.ensure_search_index():
+            print("✅ static/data/search.json gerado a partir dos dados dos projetos")
 
         # Gerar site estático
         print("🔨 Gerando site estático...")
-        freezer.freeze()
+        if workers > 1:
+            state = freeze_parallel(workers)
+        else:
+            state = freeze_incremental()
         print("✅ Site estático gerado em docs/")
+        print(f"  • Renderizadas: {len(state.rendered)} | "
+              f"Sem mudanças: {len(state.skipped)}")
+        print_render_stats(state)
 
         # Copiar arquivos adicionais
         copy_static_files()
@@ -121,6 +486,11 @@ def build():
         # Criar .nojekyll
         create_nojekyll()
 
+        # Bundles de CSS/JS (purge, minificação, hash e CSS crítico)
+        if bundle_assets:
+            print("🎨 Gerando bundles de CSS/JS...")
+            assets.print_report(assets.build_assets('docs'))
+
         # Estatísticas
         total_files = sum([len(files) for _, _, files in os.walk('docs')])
         total_size = sum([
@@ -147,6 +517,10 @@ def build():
 
         return True
 
+    except assets.AssetsError as e:
+        print(f"\n❌ Assets: {e}")
+        return False
+
     except Exception as e:
         print(f"\n❌ Erro durante o build: {e}")
         import traceback
@@ -157,5 +531,15 @@ def build():
 if __name__ == '__main__':
     import sys
 
-    success = build()
+    workers = 1
+    if '--workers' in sys.argv:
+        try:
+            workers = int(sys.argv[sys.argv.index('--workers') + 1])
+        except (IndexError, ValueError):
+            print("❌ Uso: --workers N (N inteiro)")
+            sys.exit(1)
+
+    success = build(full='--full' in sys.argv, workers=workers,
+                    bundle_assets='--no-assets' not in sys.argv,
+                    allow_cdn='--cdn' in sys.argv)
     sys.exit(0 if success else 1)
@@ -0,0 +1,429 @@
+"""
+Emissor dos dados do frontend (static/data)
+Serializa o dataset em JSON compacto, em streaming, e grava junto as
+versões pré-comprimidas (.gz e, se o módulo brotli estiver instalado,
+.br) para o servidor/CDN entregar sem comprimir a cada requisição.
+
+Layouts:
+    single  projects.json com todos os projetos
+    split   projects.index.json (id, título, linguagem e stars de cada
+            projeto) + projects/<id>.json com os detalhes, baixados pelo
+            navegador só para os cards que vão aparecer
+
+No layout split o projects.json completo não é gravado; app_static e
+freeze.py leem os dados com load_data, que aceita os dois layouts. Os
+dois layouts também recebem o search.json, índice invertido usado pela
+busca da página de projetos.
+
+Toda gravação é atômica (arquivo temporário no mesmo diretório, fsync e
+os.replace): quem lê o arquivo durante um build vê a versão antiga ou a
+nova inteira, nunca um JSON truncado.
+
+Autor: Natália Barros
+"""
+
+import os
+import re
+import json
+import gzip
+import shutil
+import tempfile
+import unicodedata
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List
+
+try:
+    import brotli  # Dependência opcional
+except ImportError:
+    brotli = None
+
+# ============================================
+# CONFIGURAÇÕES
+# ============================================
+
+DATA_DIR = 'static/data'
+FULL_FILE = 'projects.json'
+INDEX_FILE = 'projects.index.json'
+SEARCH_FILE = 'search.json'
+SHARDS_DIR = 'projects'
+LAYOUTS = ('single', 'split')
+
+# Campos do índice do layout split (o suficiente para listar e ordenar)
+INDEX_FIELDS = ('id', 'title', 'language', 'stars')
+
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+# Campos indexados para a busca da página de projetos
+SEARCH_FIELDS = ('title', 'name', 'description', 'language', 'technologies', 'topics')
+
+# Palavras comuns (pt/en) que não ajudam a distinguir projetos
+STOPWORDS = frozenset("""
+    a as o os e de da das do dos em no na nos nas um uma uns umas por para com
+    sem que se ao aos the an and or of for with to in on at by is are from
+""".split())
+
+# Mesma regra do JS da página: sequências de letras/dígitos
+SEARCH_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+# ============================================
+# SERIALIZAÇÃO
+# ============================================
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def iter_json(data):
+    """Pedaços (bytes UTF-8) do JSON compacto de `data`, sem montar a string inteira"""
+    for chunk in _encoder.iterencode(data):
+        yield chunk.encode('utf-8')
+
+
+def _fsync_directory(directory):
+    """Persiste a entrada do diretório após o rename (ignorado onde não há suporte)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path: str):
+    """
+    Abre um arquivo temporário (binário) que substitui `path` ao fechar
+
+    O conteúdo só aparece em `path` depois do fsync, com os.replace
+    (atômico no mesmo sistema de arquivos). Se o bloco levantar exceção,
+    o temporário é apagado e `path` fica intacto.
+
+    Args:
+        path: Arquivo de destino
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp',
+                               dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp cria com 0600; o site publicado precisa ser legível
+        mode = os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _fsync_directory(directory)
+
+
+def write_json(path: str, data, compress: bool = True) -> Dict[str, int]:
+    """
+    Grava `data` em JSON compacto e as versões .gz/.br na mesma passada
+
+    Os três arquivos são gravados de forma atômica; o .json é o último a
+    ser substituído, então quem vê o .json novo já encontra .gz/.br novos.
+
+    Args:
+        path: Arquivo de destino
+        data: Objeto serializável
+        compress: Se False, grava só o JSON
+
+    Returns:
+        Bytes gravados por formato ('json', 'gz', 'br')
+    """
+    sizes = {'json': 0}
+    gz = br = None
+    # ExitStack fecha na ordem inversa: .br, .gz e por último o .json
+    with ExitStack() as stack:
+        out = stack.enter_context(atomic_open(path))
+        if compress:
+            # mtime=0: mesmo conteúdo gera o mesmo .gz (build reproduzível)
+            gz = gzip.GzipFile(filename='', mode='wb', fileobj=stack.enter_context(
+                atomic_open(path + '.gz')), compresslevel=9, mtime=0)
+            stack.callback(gz.close)
+            if brotli is not None:
+                br_file = stack.enter_context(atomic_open(path + '.br'))
+                br = brotli.Compressor(mode=brotli.MODE_TEXT)
+                stack.callback(lambda: br_file.write(br.finish()))
+
+        for chunk in iter_json(data):
+            out.write(chunk)
+            sizes['json'] += len(chunk)
+            if gz is not None:
+                gz.write(chunk)
+            if br is not None:
+                br_file.write(br.process(chunk))
+
+    for suffix in COMPRESSED_SUFFIXES:
+        compressed = path + suffix
+        if compress and os.path.exists(compressed) and (suffix != '.br' or brotli is not None):
+            sizes[suffix[1:]] = os.path.getsize(compressed)
+        elif os.path.exists(compressed):
+            # Sobra de um build anterior (ex: brotli desinstalado)
+            os.remove(compressed)
+
+    return sizes
+
+
+def pretty_size(data) -> int:
+    """Bytes do mesmo conteúdo no formato antigo (indent=2)"""
+    return sum(len(chunk.encode('utf-8')) for chunk in
+               json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(data))
+
+
+# ============================================
+# ÍNDICE DE BUSCA
+# ============================================
+
+def fold(text: str) -> str:
+    """Minúsculas e sem acentos ('Automação' → 'automacao')"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Termos de busca de um texto (sem acentos, sem stopwords, 2+ letras)"""
+    return [t for t in SEARCH_TOKEN_RE.findall(fold(text))
+            if len(t) > 1 and t not in STOPWORDS]
+
+
+def build_search_index(projects: List[Dict]) -> Dict:
+    """
+    Índice invertido e ordenações pré-calculadas para a página de projetos
+
+    Os projetos são referenciados pela posição em `ids` (números pequenos
+    deixam as listas menores). Os termos vêm ordenados para o navegador
+    achar prefixos com busca binária (busca enquanto digita).
+
+    Args:
+        projects: Lista de projetos (na ordem de projects.json)
+
+    Returns:
+        Dict com 'ids', 'terms', 'postings' (posições por termo, em
+        paralelo a 'terms'), 'languages', 'recent' e 'orders'
+    """
+    postings = {}
+    languages = {}
+    for position, project in enumerate(projects):
+        for field in SEARCH_FIELDS:
+            value = project.get(field)
+            texts = value if isinstance(value, list) else [value or '']
+            for text in texts:
+                for term in tokenize(text):
+                    positions = postings.setdefault(term, [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+        if project.get('language'):
+            languages.setdefault(project['language'], []).append(position)
+
+    positions = range(len(projects))
+
+    def by(key, reverse=False):
+        return sorted(positions, key=lambda i: key(projects[i]), reverse=reverse)
+
+    terms = sorted(postings)
+    return {
+        'ids': [p['id'] for p in projects],
+        'terms': terms,
+        'postings': [postings[t] for t in terms],
+        'languages': languages,
+        'recent': [i for i in positions if projects[i].get('is_recent')],
+        # Mesmos critérios do seletor "Ordenar por" da página
+        'orders': {
+            'stars': by(lambda p: (p.get('stars', 0), p.get('updated_at') or ''), reverse=True),
+            'forks': by(lambda p: p.get('forks', 0), reverse=True),
+            'updated': by(lambda p: p.get('updated_at') or '', reverse=True),
+            'name': by(lambda p: fold(p.get('title'))),
+        },
+    }
+
+
+def ensure_search_index(directory: str = DATA_DIR) -> bool:
+    """
+    Gera o search.json a partir dos dados se ele faltar ou for mais
+    antigo (dados gerados antes do índice existir)
+
+    A página de projetos referencia o search.json, então o freeze falha
+    com 404 se ele não existir.
+
+    Returns:
+        True se o índice foi (re)gerado
+    """
+    source = data_file(directory)
+    search_path = os.path.join(directory, SEARCH_FILE)
+    if source is None:
+        return False
+    if os.path.isfile(search_path) and os.path.getmtime(search_path) >= os.path.getmtime(source):
+        return False
+
+    data = load_data(directory)
+    write_json(search_path, build_search_index(data.get('projects', [])))
+    return True
+
+
+# ============================================
+# LEITURA
+# ============================================
+
+def data_file(directory: str = DATA_DIR):
+    """
+    Arquivo que identifica o layout gravado: projects.json (single) ou
+    projects.index.json (split, gravado depois dos detalhes)
+
+    Returns:
+        Caminho do arquivo ou None se não há dados
+    """
+    for name in (FULL_FILE, INDEX_FILE):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def load_data(directory: str = DATA_DIR) -> Dict:
+    """
+    Lê os dados do frontend em qualquer um dos layouts
+
+    Returns:
+        Dict com 'projects', 'stats', 'generated_at' e 'layout'
+
+    Raises:
+        FileNotFoundError: Se não há dados em `directory`
+    """
+    source = data_file(directory)
+    if source is None:
+        raise FileNotFoundError(os.path.join(directory, FULL_FILE))
+
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError('formato inesperado')
+
+    if os.path.basename(source) == FULL_FILE:
+        data['layout'] = 'single'
+        return data
+
+    projects = []
+    for entry in data.get('projects', []):
+        with open(os.path.join(directory, SHARDS_DIR, f"{entry['id']}.json"),
+                  'r', encoding='utf-8') as f:
+            projects.append(json.load(f))
+    data['projects'] = projects
+    data['layout'] = 'split'
+    return data
+
+
+# ============================================
+# EMISSOR
+# ============================================
+
+def index_entry(project: Dict) -> Dict:
+    """Resumo de um projeto para o índice do layout split"""
+    return {field: project.get(field) for field in INDEX_FIELDS}
+
+
+def emit(projects: List[Dict], stats: Dict, generated_at: str, layout: str = 'single',
+         directory: str = DATA_DIR) -> Dict[str, Dict[str, int]]:
+    """
+    Grava os dados do frontend no layout pedido
+
+    Arquivos do outro layout que tenham sobrado de builds anteriores são
+    removidos, então `directory` sempre reflete só o último build.
+
+    Args:
+        projects: Lista de projetos
+        stats: Estatísticas gerais
+        generated_at: Data/hora do build (ISO)
+        layout: 'single' ou 'split'
+        directory: Diretório de saída
+
+    Returns:
+        Bytes por arquivo lógico ('search.json' e 'projects.json' ou
+        'projects/*.json' + 'projects.index.json') e formato, incluindo
+        'pretty' (indent=2) para comparação
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Layout desconhecido: {layout} (use {'|'.join(LAYOUTS)})")
+
+    report = {}
+    search = build_search_index(projects)
+    report[SEARCH_FILE] = write_json(os.path.join(directory, SEARCH_FILE), search)
+    report[SEARCH_FILE]['pretty'] = pretty_size(search)
+
+    full_path = os.path.join(directory, FULL_FILE)
+    index_path = os.path.join(directory, INDEX_FILE)
+    shards_path = os.path.join(directory, SHARDS_DIR)
+
+    if layout == 'split':
+        shards = {'files': 0}
+        wanted = set()
+        for project in projects:
+            name = f"{project['id']}.json"
+            wanted.add(name)
+            sizes = write_json(os.path.join(shards_path, name), project)
+            sizes['pretty'] = pretty_size(project)
+            shards['files'] += 1
+            for fmt, size in sizes.items():
+                shards[fmt] = shards.get(fmt, 0) + size
+        report[f'{SHARDS_DIR}/*.json'] = shards
+
+        # Índice por último: quem o lê já encontra todos os detalhes
+        index = {
+            'projects': [index_entry(p) for p in projects],
+            'stats': stats,
+            'generated_at': generated_at,
+        }
+        report[INDEX_FILE] = write_json(index_path, index)
+        report[INDEX_FILE]['pretty'] = pretty_size(index)
+
+        _remove_with_compressed(full_path)
+        # Detalhes de projetos que saíram do portfólio
+        for name in os.listdir(shards_path) if os.path.isdir(shards_path) else []:
+            if name.split('.json')[0] + '.json' not in wanted:
+                os.remove(os.path.join(shards_path, name))
+    else:
+        data = {'projects': projects, 'stats': stats, 'generated_at': generated_at}
+        report[FULL_FILE] = write_json(full_path, data)
+        report[FULL_FILE]['pretty'] = pretty_size(data)
+
+        _remove_with_compressed(index_path)
+        if os.path.isdir(shards_path):
+            shutil.rmtree(shards_path)
+
+    return report
+
+
+def _remove_with_compressed(path: str):
+    """Remove `path` e as versões .gz/.br que tenham sobrado"""
+    for suffix in ('',) + COMPRESSED_SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def print_report(report: Dict[str, Dict[str, int]]):
+    """Tabela de tamanhos: formato antigo (indent=2) x compacto x comprimido"""
+    def kb(value):
+        return f"{value / 1024:.1f} KB" if value is not None else '-'
+
+    print(f"\n📦 Dados do frontend ({DATA_DIR}):")
+    print(f"  {'arquivo':<24} {'indent=2':>10} {'compacto':>10} {'gzip':>10} {'brotli':>10}")
+    for name, sizes in report.items():
+        label = name if 'files' not in sizes else f"{name} ({sizes['files']})"
+        print(f"  {label:<24} {kb(sizes.get('pretty')):>10} {kb(sizes.get('json')):>10} "
+              f"{kb(sizes.get('gz')):>10} {kb(sizes.get('br')):>10}")
+
+    full = report.get(FULL_FILE)
+    if full and full['pretty']:
+        print(f"  • {FULL_FILE}: {full['pretty']} → {full['json']} bytes "
+              f"({1 - full['json'] / full['pretty']:.0%} menor), {full['gz']} bytes com gzip")
+    if brotli is None:
+        print("  • brotli não instalado: arquivos .br não gerados (pip install brotli)")
@@ -0,0 +1,279 @@
+"""
+Cache HTTP persistente para a API do GitHub
+Usa requisições condicionais (ETag / If-None-Match e Last-Modified /
+If-Modified-Since): respostas 304 não contam no rate limit do GitHub e o
+corpo salvo em disco é reaproveitado.
+
+Autor: Natália Barros
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+
+import frontend_data
+
+# ============================================
+# CONFIGURAÇÕES
+# ============================================
+
+HTTP_CACHE_FILE = '.github_http_cache.json'
+HTTP_CACHE_MAX_ENTRIES = 2000  # Número máximo de URLs guardadas
+HTTP_CACHE_MAX_BYTES = 20 * 1024 * 1024  # Tamanho máximo dos corpos (20 MB)
+
+# Headers da requisição que alteram a resposta (entram na chave do cache)
+VARY_HEADERS = ('Accept', 'Authorization')
+
+# Headers que entram na chave só como hash (o arquivo fica em texto puro)
+SECRET_HEADERS = ('Authorization',)
+
+
+# ============================================
+# CACHE
+# ============================================
+
+def _key_value(name: str, value: str) -> str:
+    """Valor do header na chave (hash para headers com credenciais)"""
+    if name in SECRET_HEADERS:
+        return 'sha256:' + hashlib.sha256(value.encode('utf-8')).hexdigest()
+    return value
+
+
+def _has_raw_secret(key: str) -> bool:
+    return any(f" {name}=" in key and f" {name}=sha256:" not in key
+               for name in SECRET_HEADERS)
+
+
+class HTTPCache:
+    """
+    Cache LRU de respostas GET, persistido em um arquivo JSON
+
+    Cada entrada guarda ETag, Last-Modified e o corpo da resposta. Na
+    próxima requisição para a mesma URL os validadores são enviados; se o
+    GitHub responder 304 o corpo salvo é devolvido como uma resposta 200.
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_FILE,
+                 max_entries: int = HTTP_CACHE_MAX_ENTRIES,
+                 max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    # ---------- persistência ----------
+
+    def load(self):
+        """Carrega as entradas salvas em disco (se existirem)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        with self._lock:
+            # O arquivo é salvo do menos para o mais recentemente usado
+            for key, entry in data.get('entries', []):
+                if _has_raw_secret(key):
+                    # Chave de versões antigas com o token em claro
+                    self._dirty = True
+                    continue
+                self._entries[key] = entry
+                self._size += len(entry.get('body', ''))
+            self._evict()
+
+    def save(self):
+        """Grava o cache em disco se algo mudou"""
+        if not self.path:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'entries': list(self._entries.items())}
+            self._dirty = False
+
+        try:
+            # Gravação atômica: um build interrompido não corrompe o cache
+            with frontend_data.atomic_open(self.path) as f:
+                for chunk in frontend_data.iter_json(data):
+                    f.write(chunk)
+        except OSError as e:
+            print(f"Erro ao salvar cache HTTP: {e}")
+
+    # ---------- LRU ----------
+
+    def _evict(self):
+        """Remove entradas menos usadas até respeitar os limites"""
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._size > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._size -= len(entry.get('body', ''))
+            self.evictions += 1
+            self._dirty = True
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: str, response: requests.Response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': response.text,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() in ('content-type', 'link')
+            },
+        }
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.get('body', ''))
+            self._entries[key] = entry
+            self._size += len(entry['body'])
+            self._dirty = True
+            self._evict()
+
+    # ---------- requisições ----------
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None,
+                 headers: Optional[Dict] = None) -> str:
+        """Monta a chave do cache a partir da URL final e headers relevantes"""
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        headers = headers or {}
+        vary = [f"{name}={_key_value(name, headers[name])}"
+                for name in VARY_HEADERS if name in headers]
+        return ' '.join([full_url] + vary)
+
+    def get(self, url: str, params: Optional[Dict] = None,
+            headers: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """
+        GET condicional: usa ETag/Last-Modified salvos e reaproveita o
+        corpo quando o servidor responde 304
+
+        Args:
+            url: URL da requisição
+            params: Query string
+            headers: Headers da requisição
+            **kwargs: Argumentos repassados para requests.get
+
+        Returns:
+            Resposta (respostas vindas do cache têm from_cache=True)
+        """
+        key = self.make_key(url, params, headers)
+        entry = self._lookup(key)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = requests.get(url, params=params, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            with self._lock:
+                self.hits += 1
+            return self._replay(entry, response)
+
+        with self._lock:
+            self.misses += 1
+
+        response.from_cache = False
+        if response.status_code == 200:
+            self._store(key, response)
+
+        return response
+
+    @staticmethod
+    def _replay(entry: Dict, not_modified: requests.Response) -> requests.Response:
+        """Converte um 304 em resposta 200 com o corpo salvo"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = not_modified.url
+        response.encoding = 'utf-8'
+        response._content = entry['body'].encode('utf-8')
+        # Headers atuais (rate limit etc.) + headers de conteúdo salvos
+        response.headers.update(not_modified.headers)
+        response.headers.update(entry.get('headers', {}))
+        response.request = not_modified.request
+        response.from_cache = True
+        return response
+
+    def stats(self) -> Dict:
+        """Contadores de uso do cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'evictions': self.evictions,
+            }
+
+
+# ============================================
+# INSTÂNCIA COMPARTILHADA
+# ============================================
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> HTTPCache:
+    """Retorna o cache HTTP compartilhado pelos scripts de build"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache()
+        return _cache
+
+
+def configure_cache(**kwargs) -> HTTPCache:
+    """
+    Substitui o cache compartilhado (ex.: path=None para não usar disco)
+
+    Args:
+        **kwargs: Argumentos de HTTPCache
+
+    Returns:
+        Novo cache compartilhado
+    """
+    global _cache
+    with _cache_lock:
+        _cache = HTTPCache(**kwargs)
+        return _cache
+
+
+def cached_get(url: str, **kwargs) -> requests.Response:
+    """Atalho para get_cache().get(...)"""
+    return get_cache().get(url, **kwargs)
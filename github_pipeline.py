@@ -0,0 +1,875 @@
+"""
+Pipeline de busca e enriquecimento de repositórios do GitHub
+Compartilhado por build_portfolio.py (cache JSON + dados do frontend) e
+update_projects.py (tabela de projetos do app Flask): uma única passada
+pela API gera registros de projeto que alimentam qualquer número de
+destinos ("sinks").
+
+Autor: Natália Barros
+"""
+
+import os
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import time
+
+from github_cache import get_cache
+
+# ============================================
+# CONFIGURAÇÕES
+# ============================================
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')  # Obrigatório para o backend GraphQL
+DEFAULT_WORKERS = 1  # Número de threads para enriquecer repositórios
+MAX_WORKERS = 16  # Limite de concorrência contra a API do GitHub
+RATE_LIMIT_LOW_WATERMARK = 10  # Abaixo disso, espaçar requisições até o reset
+MAX_RETRIES = 3  # Tentativas após 403/429 por rate limit
+RETRY_BACKOFF = 1.0  # Espera mínima (s) na 1ª nova tentativa sem header; dobra a cada uma
+DEFAULT_BACKEND = 'rest'  # 'rest' (padrão) ou 'graphql'
+GRAPHQL_PAGE_SIZE = 100  # Máximo permitido pela API GraphQL
+
+# Mapeamento de linguagens para tecnologias/frameworks
+TECH_MAPPING = {
+    'Python': ['Python', 'Flask', 'Django', 'FastAPI', 'Pandas'],
+    'JavaScript': ['JavaScript', 'Node.js', 'React', 'Vue.js'],
+    'TypeScript': ['TypeScript', 'Angular', 'Next.js'],
+    'Java': ['Java', 'Spring Boot'],
+    'Go': ['Go', 'Gin'],
+    'Ruby': ['Ruby', 'Rails'],
+    'PHP': ['PHP', 'Laravel'],
+    'C#': ['C#', '.NET'],
+    'HTML': ['HTML5', 'CSS3', 'Bootstrap'],
+    'CSS': ['CSS3', 'Sass'],
+    'Jupyter Notebook': ['Python', 'Jupyter', 'Data Science'],
+    'R': ['R', 'Data Analysis'],
+    'Rust': ['Rust'],
+    'C++': ['C++'],
+    'C': ['C'],
+}
+
+# Mapeamento de linguagens para categorias do portfólio
+CATEGORY_MAPPING = {
+    'Python': 'Web App',
+    'JavaScript': 'Web App',
+    'TypeScript': 'Web App',
+    'Java': 'Backend',
+    'Go': 'Backend',
+    'Jupyter Notebook': 'Data Science',
+    'R': 'Data Science',
+    'HTML': 'Frontend',
+    'CSS': 'Frontend',
+}
+
+# ============================================
+# FUNÇÕES DE LOGGING
+# ============================================
+
+def log_info(message: str):
+    """Log informação"""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] ℹ️  {message}")
+
+
+def log_success(message: str):
+    """Log sucesso"""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] ✅ {message}")
+
+
+def log_error(message: str):
+    """Log erro"""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] ❌ {message}")
+
+
+def log_warning(message: str):
+    """Log aviso"""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] ⚠️  {message}")
+
+
+# ============================================
+# RATE LIMIT
+# ============================================
+
+class RateLimiter:
+    """
+    Controla o ritmo das requisições à API do GitHub a partir dos headers
+    X-RateLimit-Remaining, X-RateLimit-Reset e Retry-After.
+
+    Compartilhado entre threads: quando uma resposta indica que o limite
+    está acabando, todas as threads aguardam antes da próxima requisição.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pause_until = 0.0
+
+    def wait(self):
+        """Bloqueia até que seja permitido fazer a próxima requisição"""
+        with self._lock:
+            delay = self._pause_until - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Adia todas as requisições por alguns segundos"""
+        with self._lock:
+            self._pause_until = max(self._pause_until, time.time() + seconds)
+
+    def update(self, response: requests.Response) -> float:
+        """
+        Ajusta o ritmo com base nos headers da resposta
+
+        Args:
+            response: Resposta da API do GitHub
+
+        Returns:
+            Segundos de pausa aplicados (0 se nenhuma)
+        """
+        headers = response.headers
+        now = time.time()
+        delay = 0.0
+
+        retry_after = headers.get('Retry-After')
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        elif remaining is not None and remaining.isdigit() and reset and reset.isdigit():
+            remaining = int(remaining)
+            until_reset = max(int(reset) - now, 0)
+            if remaining == 0:
+                delay = until_reset
+            elif remaining < RATE_LIMIT_LOW_WATERMARK:
+                # Distribuir as requisições restantes até o reset
+                delay = until_reset / remaining
+
+        if delay > 0:
+            self.pause(delay)
+        return delay
+
+
+rate_limiter = RateLimiter()
+
+
+def retry_delay(attempt: int, delay: float) -> float:
+    """
+    Espera antes de repetir uma requisição recusada por rate limit
+
+    Limites secundários do GitHub podem vir sem Retry-After nem
+    X-RateLimit-Reset; nesse caso aplica backoff exponencial (1s, 2s, 4s...).
+
+    Args:
+        attempt: Tentativa que falhou (0 = primeira)
+        delay: Pausa já aplicada a partir dos headers
+
+    Returns:
+        Segundos de pausa efetivos
+    """
+    backoff = RETRY_BACKOFF * (2 ** attempt)
+    if delay < backoff:
+        rate_limiter.pause(backoff)
+        return backoff
+    return delay
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """Verifica se a resposta foi recusada por rate limit"""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    # Limite secundário: às vezes só a mensagem do corpo o identifica
+    return (response.headers.get('X-RateLimit-Remaining') == '0'
+            or 'Retry-After' in response.headers
+            or 'rate limit' in response.text.lower())
+
+
+def github_get(url: str, **kwargs) -> requests.Response:
+    """
+    GET na API do GitHub respeitando o rate limit compartilhado
+
+    Args:
+        url: URL da API
+        **kwargs: Argumentos repassados para requests.get
+
+    Returns:
+        Resposta da requisição (servida do cache HTTP quando o GitHub
+        responde 304 Not Modified)
+    """
+    kwargs.setdefault('timeout', 10)
+
+    for attempt in range(MAX_RETRIES + 1):
+        rate_limiter.wait()
+        response = get_cache().get(url, **kwargs)
+        delay = rate_limiter.update(response)
+
+        if not is_rate_limited(response) or attempt == MAX_RETRIES:
+            return response
+
+        delay = retry_delay(attempt, delay)
+        log_warning(f"Rate limit atingido, aguardando {delay:.0f}s...")
+
+    return response
+
+
+# ============================================
+# FUNÇÕES DA GITHUB API
+# ============================================
+
+def fetch_github_repos(username: str) -> Tuple[List[Dict], bool]:
+    """
+    Busca todos os repositórios públicos de um usuário do GitHub
+
+    Args:
+        username: Nome de usuário do GitHub
+
+    Returns:
+        Tupla (lista de repositórios, listagem completa?). Se alguma
+        página falhar, a lista tem só as páginas anteriores e o segundo
+        item é False: quem compara com um build anterior não deve tratar
+        os ausentes como removidos.
+    """
+    log_info(f"Buscando repositórios de {username}...")
+
+    repos = []
+    complete = True
+    page = 1
+    per_page = 100
+
+    while True:
+        url = f"{GITHUB_API_URL}/users/{username}/repos"
+        params = {
+            'page': page,
+            'per_page': per_page,
+            'sort': 'updated',
+            'direction': 'desc'
+        }
+
+        try:
+            response = github_get(url, params=params)
+
+            # Verificar rate limit
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if remaining:
+                log_info(f"Rate limit restante: {remaining}")
+
+            response.raise_for_status()
+            page_repos = response.json()
+
+            if not page_repos:
+                break
+
+            repos.extend(page_repos)
+            log_info(f"Página {page}: {len(page_repos)} repositórios")
+
+            page += 1
+
+        except requests.exceptions.RequestException as e:
+            log_error(f"Erro ao buscar repositórios (página {page}): {e}")
+            complete = False
+            break
+
+    if complete:
+        log_success(f"Total de repositórios encontrados: {len(repos)}")
+    else:
+        log_warning(f"Listagem incompleta: {len(repos)} repositórios até a página {page - 1}")
+    return repos, complete
+
+
+def fetch_repo_languages(languages_url: str) -> Dict[str, int]:
+    """
+    Busca as linguagens de um repositório
+
+    Args:
+        languages_url: URL da API de linguagens
+
+    Returns:
+        Dicionário com linguagens e bytes de código
+    """
+    try:
+        response = github_get(languages_url)
+        response.raise_for_status()
+        return response.json()
+    except:
+        return {}
+
+
+def fetch_repo_topics(owner: str, repo: str) -> List[str]:
+    """
+    Busca os topics de um repositório
+
+    Args:
+        owner: Dono do repositório
+        repo: Nome do repositório
+
+    Returns:
+        Lista de topics
+    """
+    try:
+        url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/topics"
+        headers = {'Accept': 'application/vnd.github.mercy-preview+json'}
+        response = github_get(url, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        return data.get('names', [])
+    except:
+        return []
+
+
+# ============================================
+# PROCESSAMENTO DE DADOS
+# ============================================
+
+def should_include_repo(repo: Dict) -> bool:
+    """
+    Verifica se o repositório deve ser incluído no portfólio
+
+    Args:
+        repo: Dados do repositório
+
+    Returns:
+        True se deve incluir, False caso contrário
+    """
+    # Excluir forks
+    if repo.get('fork', False):
+        return False
+
+    # Excluir repositórios arquivados
+    if repo.get('archived', False):
+        return False
+
+    # Excluir repositórios vazios (sem código)
+    if repo.get('size', 0) == 0:
+        return False
+
+    # Excluir repositórios sem descrição (opcional)
+    # if not repo.get('description'):
+    #     return False
+
+    return True
+
+
+def determine_technologies(languages: Dict[str, int]) -> List[str]:
+    """
+    Determina as tecnologias baseado nas linguagens
+
+    Args:
+        languages: Dicionário com linguagens e bytes
+
+    Returns:
+        Lista de tecnologias
+    """
+    technologies = set()
+
+    # Ordenar linguagens por quantidade de bytes (mais usada primeiro)
+    sorted_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)
+
+    for language, _ in sorted_languages[:3]:  # Top 3 linguagens
+        if language in TECH_MAPPING:
+            # Adicionar linguagem principal
+            technologies.add(language)
+            # Adicionar framework comum (se houver)
+            if len(TECH_MAPPING[language]) > 1:
+                technologies.add(TECH_MAPPING[language][1])
+
+    return sorted(list(technologies))
+
+
+def determine_category(languages: Dict[str, int]) -> str:
+    """
+    Determina a categoria pela linguagem mais usada que tem mapeamento
+
+    Args:
+        languages: Dicionário com linguagens e bytes
+
+    Returns:
+        Categoria do projeto
+    """
+    for language, _ in sorted(languages.items(), key=lambda x: x[1], reverse=True):
+        if language in CATEGORY_MAPPING:
+            return CATEGORY_MAPPING[language]
+    return 'Outros'
+
+
+def get_demo_url(repo: Dict) -> Optional[str]:
+    """
+    Tenta encontrar URL de demonstração do projeto
+
+    Args:
+        repo: Dados do repositório
+
+    Returns:
+        URL de demo ou None
+    """
+    # Homepage do repositório
+    if repo.get('homepage') and repo['homepage'].startswith('http'):
+        return repo['homepage']
+
+    # GitHub Pages
+    if repo.get('has_pages', False):
+        owner = repo['owner']['login']
+        name = repo['name']
+        return f"https://{owner}.github.io/{name}"
+
+    return None
+
+
+def format_repo_title(name: str) -> str:
+    """
+    Formata o nome do repositório para um título legível
+
+    Args:
+        name: Nome do repositório
+
+    Returns:
+        Título formatado
+    """
+    # Substituir hífens e underscores por espaços
+    title = name.replace('-', ' ').replace('_', ' ')
+    # Capitalizar cada palavra
+    title = ' '.join(word.capitalize() for word in title.split())
+    return title
+
+
+def process_repository(repo: Dict, languages: Optional[Dict[str, int]] = None,
+                       topics: Optional[List[str]] = None) -> Dict:
+    """
+    Processa um repositório e extrai informações relevantes
+
+    Args:
+        repo: Dados brutos do repositório
+        languages: Linguagens já buscadas (evita a requisição REST)
+        topics: Topics já buscados (evita a requisição REST)
+
+    Returns:
+        Dados processados do projeto
+    """
+    log_info(f"Processando: {repo['name']}")
+
+    # Buscar linguagens
+    if languages is None:
+        languages = fetch_repo_languages(repo['languages_url'])
+
+    # Buscar topics
+    if topics is None:
+        topics = fetch_repo_topics(repo['owner']['login'], repo['name'])
+
+    # Determinar tecnologias
+    technologies = determine_technologies(languages)
+
+    # Se não encontrou tecnologias e tem language principal
+    if not technologies and repo.get('language'):
+        technologies = [repo['language']]
+
+    # Processar datas
+    created_at = datetime.strptime(repo['created_at'], '%Y-%m-%dT%H:%M:%SZ')
+    updated_at = datetime.strptime(repo['updated_at'], '%Y-%m-%dT%H:%M:%SZ')
+
+    # Verificar se foi atualizado recentemente (últimos 30 dias)
+    is_recent = (datetime.now() - updated_at).days <= 30
+
+    project = {
+        'id': repo['id'],
+        'name': repo['name'],
+        'title': format_repo_title(repo['name']),
+        'description': repo.get('description', 'Projeto desenvolvido com dedicação'),
+        'language': repo.get('language', 'Outras'),
+        'languages': list(languages.keys()),
+        'technologies': technologies,
+        'category': determine_category(languages),
+        'github_url': repo['html_url'],
+        'demo_url': get_demo_url(repo),
+        'stars': repo['stargazers_count'],
+        'forks': repo['forks_count'],
+        'watchers': repo['watchers_count'],
+        'created_at': created_at.strftime('%Y-%m-%d'),
+        'updated_at': updated_at.strftime('%Y-%m-%d'),
+        'topics': topics,
+        'has_wiki': repo.get('has_wiki', False),
+        'has_pages': repo.get('has_pages', False),
+        'is_recent': is_recent,
+        'size': repo.get('size', 0),
+    }
+
+    return project
+
+
+def iter_results(repos: List[Dict], workers: int = DEFAULT_WORKERS,
+                 processor=process_repository) -> Iterator[Tuple[Dict, Optional[Dict]]]:
+    """
+    Processa vários repositórios, opcionalmente em paralelo, entregando
+    cada resultado assim que ele (e todos os anteriores) fica pronto
+
+    O ritmo das requisições é controlado pelo rate_limiter compartilhado,
+    então aumentar o número de workers não estoura o limite da API.
+
+    Args:
+        repos: Repositórios filtrados
+        workers: Número máximo de threads simultâneas
+        processor: Função que transforma um repositório em projeto
+
+    Yields:
+        (repositório, projeto ou None se o processamento falhou), na mesma
+        ordem dos repositórios
+    """
+    total = len(repos)
+    workers = max(1, min(workers, MAX_WORKERS, total or 1))
+
+    def process(item):
+        i, repo = item
+        if workers == 1:
+            print(f"[{i}/{total}] ", end='')
+        try:
+            return processor(repo)
+        except Exception as e:
+            log_error(f"Erro ao processar {repo['name']}: {e}")
+            return None
+
+    items = list(enumerate(repos, 1))
+
+    if workers == 1:
+        yield from zip(repos, map(process, items))
+        return
+
+    log_info(f"Usando {workers} workers em paralelo")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # executor.map preserva a ordem de entrada
+        yield from zip(repos, executor.map(process, items))
+
+
+def iter_enriched(repos: List[Dict], workers: int = DEFAULT_WORKERS,
+                  processor=process_repository) -> Iterator[Dict]:
+    """
+    Projetos processados, na ordem dos repositórios (os que falharam são
+    pulados); ver iter_results
+    """
+    for _, project in iter_results(repos, workers=workers, processor=processor):
+        if project is not None:
+            yield project
+
+
+def enrich_repositories(repos: List[Dict], workers: int = DEFAULT_WORKERS,
+                        processor=process_repository) -> List[Dict]:
+    """Versão em lista de iter_enriched"""
+    return list(iter_enriched(repos, workers=workers, processor=processor))
+
+
+# ============================================
+# BACKENDS DE BUSCA
+# ============================================
+
+class RestBackend:
+    """
+    Backend padrão: API REST v3
+    1 requisição por página de repositórios + 2 por repositório
+    (linguagens e topics)
+    """
+
+    name = 'rest'
+    parallel = True
+
+    def __init__(self):
+        self.complete = True  # False se a última listagem parou no meio
+
+    def fetch_repos(self, username: str) -> List[Dict]:
+        repos, self.complete = fetch_github_repos(username)
+        return repos
+
+    def process(self, repo: Dict) -> Dict:
+        return process_repository(repo)
+
+    def enrich(self, repos: List[Dict], workers: int = DEFAULT_WORKERS) -> List[Dict]:
+        return enrich_repositories(repos, workers=workers, processor=self.process)
+
+
+GRAPHQL_REPOS_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER,
+                 privacy: PUBLIC, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        description
+        url
+        homepageUrl
+        isFork
+        isArchived
+        diskUsage
+        hasWikiEnabled
+        createdAt
+        updatedAt
+        pushedAt
+        stargazerCount
+        forkCount
+        owner { login }
+        primaryLanguage { name }
+        languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+        repositoryTopics(first: 100) { nodes { topic { name } } }
+        deployments(environments: ["github-pages"], first: 1) { totalCount }
+      }
+    }
+  }
+}
+"""
+
+
+def graphql_node_to_repo(node: Dict) -> Dict:
+    """
+    Converte um nó GraphQL para o formato de repositório da API REST
+
+    Args:
+        node: Repositório retornado pela API GraphQL
+
+    Returns:
+        Dicionário com as mesmas chaves usadas por process_repository
+    """
+    owner = node['owner']['login']
+    return {
+        'id': node['databaseId'],
+        'name': node['name'],
+        'description': node.get('description'),
+        'html_url': node['url'],
+        'homepage': node.get('homepageUrl') or None,
+        'fork': node.get('isFork', False),
+        'archived': node.get('isArchived', False),
+        'size': node.get('diskUsage') or 0,
+        'has_wiki': node.get('hasWikiEnabled', False),
+        # GraphQL não expõe has_pages; deploys no ambiente github-pages equivalem
+        'has_pages': (node.get('deployments') or {}).get('totalCount', 0) > 0,
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'pushed_at': node.get('pushedAt'),
+        'stargazers_count': node.get('stargazerCount', 0),
+        'forks_count': node.get('forkCount', 0),
+        # Na API REST watchers_count é um alias de stargazers_count
+        'watchers_count': node.get('stargazerCount', 0),
+        'owner': {'login': owner},
+        'language': (node.get('primaryLanguage') or {}).get('name'),
+        'languages_url': f"{GITHUB_API_URL}/repos/{owner}/{node['name']}/languages",
+    }
+
+
+class GraphQLBackend:
+    """
+    Backend em lote: API GraphQL v4
+    Repositórios, linguagens e topics chegam juntos, em ⌈N/100⌉ consultas.
+    Requer GITHUB_TOKEN.
+    """
+
+    name = 'graphql'
+    # Linguagens e topics já vieram na consulta: nenhuma requisição extra
+    parallel = False
+
+    def __init__(self, token: Optional[str] = None):
+        self.token = token or GITHUB_TOKEN
+        self._details = {}
+        self.complete = True  # False se a última listagem parou no meio
+
+    def query(self, variables: Dict) -> Dict:
+        """Executa a consulta GraphQL respeitando o rate limit"""
+        headers = {'Authorization': f'bearer {self.token}'} if self.token else {}
+
+        for attempt in range(MAX_RETRIES + 1):
+            rate_limiter.wait()
+            response = requests.post(
+                f"{GITHUB_API_URL}/graphql",
+                json={'query': GRAPHQL_REPOS_QUERY, 'variables': variables},
+                headers=headers,
+                timeout=30
+            )
+            delay = rate_limiter.update(response)
+            if not is_rate_limited(response) or attempt == MAX_RETRIES:
+                break
+            delay = retry_delay(attempt, delay)
+            log_warning(f"Rate limit atingido, aguardando {delay:.0f}s...")
+
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            raise RuntimeError(payload['errors'][0].get('message', 'Erro GraphQL'))
+        return payload['data']
+
+    def fetch_repos(self, username: str) -> List[Dict]:
+        log_info(f"Buscando repositórios de {username} (GraphQL)...")
+        self.complete = False
+
+        if not self.token:
+            log_error("Backend GraphQL requer a variável de ambiente GITHUB_TOKEN")
+            return []
+
+        repos = []
+        after = None
+        page = 1
+
+        while True:
+            try:
+                data = self.query({'login': username, 'first': GRAPHQL_PAGE_SIZE,
+                                   'after': after})
+            except (requests.exceptions.RequestException, RuntimeError) as e:
+                log_error(f"Erro ao buscar repositórios (página {page}): {e}")
+                break
+
+            connection = data['user']['repositories']
+            for node in connection['nodes']:
+                repo = graphql_node_to_repo(node)
+                self._details[repo['id']] = (
+                    {edge['node']['name']: edge['size']
+                     for edge in node['languages']['edges']},
+                    [item['topic']['name']
+                     for item in node['repositoryTopics']['nodes']],
+                )
+                repos.append(repo)
+
+            log_info(f"Página {page}: {len(connection['nodes'])} repositórios")
+
+            if not connection['pageInfo']['hasNextPage']:
+                self.complete = True
+                break
+            after = connection['pageInfo']['endCursor']
+            page += 1
+
+        if self.complete:
+            log_success(f"Total de repositórios encontrados: {len(repos)}")
+        else:
+            log_warning(f"Listagem incompleta: {len(repos)} repositórios até a página {page - 1}")
+        return repos
+
+    def process(self, repo: Dict) -> Dict:
+        languages, topics = self._details.get(repo['id'], (None, None))
+        return process_repository(repo, languages=languages, topics=topics)
+
+    def enrich(self, repos: List[Dict], workers: int = DEFAULT_WORKERS) -> List[Dict]:
+        return enrich_repositories(repos, workers=1, processor=self.process)
+
+
+BACKENDS = {
+    RestBackend.name: RestBackend,
+    GraphQLBackend.name: GraphQLBackend,
+}
+
+
+def get_backend(name: str = DEFAULT_BACKEND):
+    """
+    Cria o backend de busca pelo nome
+
+    Args:
+        name: 'rest' ou 'graphql'
+
+    Returns:
+        Instância do backend
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {name} (opções: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+# ============================================
+# PIPELINE
+# ============================================
+
+class Pipeline:
+    """
+    Busca → filtro → enriquecimento, com saída em streaming
+
+    Uso:
+        pipeline = Pipeline(backend='rest', workers=8)
+        repos = pipeline.fetch('usuario')
+        drain(pipeline.stream(repos), sink_json, sink_banco)
+
+    Args:
+        backend: 'rest' ou 'graphql'
+        workers: Threads para o enriquecimento (backend REST)
+        include: Filtro de repositórios (padrão: should_include_repo)
+        limit: Máximo de repositórios após o filtro (None = todos)
+    """
+
+    def __init__(self, backend: str = DEFAULT_BACKEND, workers: int = DEFAULT_WORKERS,
+                 include: Callable[[Dict], bool] = should_include_repo,
+                 limit: Optional[int] = None):
+        self.backend = get_backend(backend)
+        self.workers = workers
+        self.include = include
+        self.limit = limit
+        self.complete = True
+        self.fetched = 0
+        self.skipped = 0
+        self.reused = 0
+        self.refreshed = 0
+
+    def fetch(self, username: str) -> List[Dict]:
+        """
+        Lista os repositórios do usuário e aplica o filtro
+
+        Returns:
+            Repositórios selecionados (ordem da listagem do GitHub).
+            `complete` fica False se a listagem falhou no meio; nesse
+            caso repositórios ausentes não significam removidos.
+        """
+        repos = self.backend.fetch_repos(username)
+        self.complete = self.backend.complete
+        selected = [repo for repo in repos if self.include(repo)]
+        if self.limit is not None:
+            selected = selected[:self.limit]
+        self.fetched = len(repos)
+        self.skipped = len(repos) - len(selected)
+        return selected
+
+    def stream(self, repos: List[Dict], reuse: Optional[Dict[int, Dict]] = None) -> Iterator[Dict]:
+        """
+        Gera os projetos enriquecidos, na ordem dos repositórios
+
+        Args:
+            repos: Repositórios selecionados (resultado de fetch)
+            reuse: Projetos já prontos por id (ex: build incremental);
+                esses repositórios não geram requisições
+
+        Yields:
+            Registros de projeto (formato de process_repository)
+        """
+        reuse = reuse or {}
+        pending = [repo for repo in repos if repo['id'] not in reuse]
+        workers = self.workers if self.backend.parallel else 1
+        results = iter_results(pending, workers=workers, processor=self.backend.process)
+
+        # Intercala reaproveitados e recém-processados mantendo a ordem:
+        # iter_results entrega um resultado (None = falhou) por pendente,
+        # na ordem de `repos`, então nada precisa ficar em buffer
+        for repo in repos:
+            if repo['id'] in reuse:
+                self.reused += 1
+                yield reuse[repo['id']]
+                continue
+            _, project = next(results)
+            if project is not None:
+                self.refreshed += 1
+                yield project
+
+
+def drain(records: Iterable[Dict], *sinks) -> List:
+    """
+    Entrega cada registro a todos os sinks e os fecha no final
+
+    Um sink é qualquer objeto com add(registro) e close().
+
+    Args:
+        records: Registros de projeto (ex: Pipeline.stream)
+        *sinks: Destinos
+
+    Returns:
+        Resultados de close() de cada sink
+    """
+    for record in records:
+        for sink in sinks:
+            sink.add(record)
+    return [sink.close() for sink in sinks]
@@ -0,0 +1,269 @@
+"""
+Servidor stub da API do GitHub (REST + GraphQL) para testes offline
+Serve repositórios sintéticos e conta as requisições recebidas, permitindo
+comparar os backends de github_pipeline sem acessar a rede.
+
+Autor: Natália Barros
+Uso: python github_stub_server.py [quantidade_de_repos]
+"""
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+STUB_USERNAME = 'stub-user'
+
+LANGUAGE_POOL = ['Python', 'JavaScript', 'TypeScript', 'HTML', 'CSS', 'Go', 'Shell']
+TOPIC_POOL = ['flask', 'api', 'saas', 'data-science', 'docker', 'react']
+
+
+def make_fixture(count: int = 250, username: str = STUB_USERNAME):
+    """
+    Gera repositórios sintéticos determinísticos
+
+    Args:
+        count: Quantidade de repositórios
+        username: Dono dos repositórios
+
+    Returns:
+        Lista de dicts com dados do repositório, linguagens e topics
+    """
+    repos = []
+    for i in range(count):
+        # Ordem decrescente de updated_at, como a listagem do GitHub
+        day = 28 - (i % 28)
+        month = 12 - (i // 28) % 12
+        timestamp = f"2025-{month:02d}-{day:02d}T12:00:00Z"
+        languages = {
+            LANGUAGE_POOL[(i + k) % len(LANGUAGE_POOL)]: (3 - k) * 1000 + i
+            for k in range(1 + i % 3)
+        }
+        repos.append({
+            'id': 1000 + i,
+            'name': f'repo-{i:04d}',
+            'description': None if i % 5 == 0 else f'Projeto de exemplo {i}',
+            'homepage': f'https://example.com/{i}' if i % 7 == 0 else None,
+            'fork': i % 11 == 0,
+            'archived': i % 13 == 0,
+            'size': 0 if i % 17 == 0 else 100 + i,
+            'has_wiki': i % 2 == 0,
+            'has_pages': i % 9 == 0,
+            'created_at': '2024-01-01T00:00:00Z',
+            'updated_at': timestamp,
+            'pushed_at': timestamp,
+            'stargazers_count': i % 4,
+            'forks_count': i % 3,
+            'language': next(iter(languages)),
+            'owner': username,
+            'languages': languages,
+            'topics': [TOPIC_POOL[(i + k) % len(TOPIC_POOL)] for k in range(i % 3)],
+        })
+    return repos
+
+
+class StubGitHub:
+    """Estado do servidor stub: fixture + contadores de requisições"""
+
+    def __init__(self, repos):
+        self.repos = repos
+        self.by_name = {r['name']: r for r in repos}
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self.server = None
+        self.url = None
+
+    def count(self, kind: str):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def rest_repo(self, repo):
+        owner = repo['owner']
+        return {
+            'id': repo['id'],
+            'name': repo['name'],
+            'description': repo['description'],
+            'html_url': f"https://github.com/{owner}/{repo['name']}",
+            'homepage': repo['homepage'],
+            'fork': repo['fork'],
+            'archived': repo['archived'],
+            'size': repo['size'],
+            'has_wiki': repo['has_wiki'],
+            'has_pages': repo['has_pages'],
+            'created_at': repo['created_at'],
+            'updated_at': repo['updated_at'],
+            'pushed_at': repo['pushed_at'],
+            'stargazers_count': repo['stargazers_count'],
+            'watchers_count': repo['stargazers_count'],
+            'forks_count': repo['forks_count'],
+            'language': repo['language'],
+            'owner': {'login': owner},
+            'languages_url': f"{self.url}/repos/{owner}/{repo['name']}/languages",
+        }
+
+    def graphql_repo(self, repo):
+        owner = repo['owner']
+        return {
+            'databaseId': repo['id'],
+            'name': repo['name'],
+            'description': repo['description'],
+            'url': f"https://github.com/{owner}/{repo['name']}",
+            'homepageUrl': repo['homepage'],
+            'isFork': repo['fork'],
+            'isArchived': repo['archived'],
+            'diskUsage': repo['size'],
+            'hasWikiEnabled': repo['has_wiki'],
+            'createdAt': repo['created_at'],
+            'updatedAt': repo['updated_at'],
+            'pushedAt': repo['pushed_at'],
+            'stargazerCount': repo['stargazers_count'],
+            'forkCount': repo['forks_count'],
+            'owner': {'login': owner},
+            'primaryLanguage': {'name': repo['language']},
+            'languages': {'edges': [
+                {'size': size, 'node': {'name': name}}
+                for name, size in sorted(repo['languages'].items(),
+                                         key=lambda x: x[1], reverse=True)
+            ]},
+            'repositoryTopics': {'nodes': [{'topic': {'name': t}} for t in repo['topics']]},
+            'deployments': {'totalCount': 1 if repo['has_pages'] else 0},
+        }
+
+    def start(self):
+        """Inicia o servidor em uma thread (porta aleatória)"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, data, status=200):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('X-RateLimit-Remaining', '5000')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                parts = parsed.path.strip('/').split('/')
+                query = parse_qs(parsed.query)
+
+                if len(parts) == 3 and parts[0] == 'users' and parts[2] == 'repos':
+                    stub.count('rest_repos')
+                    page = int(query.get('page', ['1'])[0])
+                    per_page = int(query.get('per_page', ['30'])[0])
+                    chunk = stub.repos[(page - 1) * per_page:page * per_page]
+                    return self.send_json([stub.rest_repo(r) for r in chunk])
+
+                if len(parts) == 4 and parts[0] == 'repos' and parts[2] in stub.by_name:
+                    repo = stub.by_name[parts[2]]
+                    if parts[3] == 'languages':
+                        stub.count('rest_languages')
+                        return self.send_json(repo['languages'])
+                    if parts[3] == 'topics':
+                        stub.count('rest_topics')
+                        return self.send_json({'names': repo['topics']})
+
+                self.send_json({'message': 'Not Found'}, status=404)
+
+            def do_POST(self):
+                if urlparse(self.path).path != '/graphql':
+                    return self.send_json({'message': 'Not Found'}, status=404)
+
+                stub.count('graphql')
+                length = int(self.headers.get('Content-Length', 0))
+                variables = json.loads(self.rfile.read(length)).get('variables', {})
+                first = variables.get('first', 100)
+                start = int(variables.get('after') or 0)
+                chunk = stub.repos[start:start + first]
+                end = start + len(chunk)
+
+                self.send_json({'data': {'user': {'repositories': {
+                    'pageInfo': {'hasNextPage': end < len(stub.repos),
+                                 'endCursor': str(end)},
+                    'nodes': [stub.graphql_repo(r) for r in chunk],
+                }}}})
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def run_backend(pipeline, name: str):
+    """Busca e processa todos os repositórios com um backend"""
+    backend = (pipeline.BACKENDS[name](token='stub-token') if name == 'graphql'
+               else pipeline.BACKENDS[name]())
+    repos = [r for r in backend.fetch_repos(STUB_USERNAME) if pipeline.should_include_repo(r)]
+    return backend.enrich(repos, workers=8)
+
+
+def compare_backends(count: int = 250):
+    """
+    Executa os backends REST e GraphQL contra o stub e compara
+    os projetos gerados e o número de requisições
+
+    Args:
+        count: Quantidade de repositórios sintéticos
+
+    Returns:
+        True se ambos produziram os mesmos projetos
+    """
+    import contextlib
+    import io
+    import time
+    import github_pipeline
+    from github_cache import configure_cache
+
+    stub = StubGitHub(make_fixture(count)).start()
+    original_url = github_pipeline.GITHUB_API_URL
+    github_pipeline.GITHUB_API_URL = stub.url
+
+    results = {}
+    try:
+        for name in ('rest', 'graphql'):
+            stub.requests.clear()
+            # Cache HTTP vazio e sem disco: cada backend faz todas as requisições
+            configure_cache(path=None)
+            start = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                projects = run_backend(github_pipeline, name)
+            elapsed = time.time() - start
+            results[name] = (projects, sum(stub.requests.values()), elapsed)
+    finally:
+        github_pipeline.GITHUB_API_URL = original_url
+        stub.stop()
+
+    rest, graphql = results['rest'][0], results['graphql'][0]
+    identical = rest == graphql
+
+    print(f"\n📊 Comparação de backends ({count} repositórios no stub)")
+    for name, (projects, total_requests, elapsed) in results.items():
+        print(f"  • {name:8s}: {len(projects)} projetos, "
+              f"{total_requests} requisições, {elapsed:.2f}s")
+    print(f"  • Resultados idênticos: {'sim' if identical else 'NÃO'}")
+
+    if not identical:
+        for a, b in zip(rest, graphql):
+            if a != b:
+                diff = {k: (a.get(k), b.get(k)) for k in a if a.get(k) != b.get(k)}
+                print(f"  ⚠️  {a['name']}: {diff}")
+                break
+
+    return identical
+
+
+if __name__ == '__main__':
+    import sys
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 250
+    sys.exit(0 if compare_backends(count) else 1)
@@ -0,0 +1,74 @@
+"""
+Configuração do gunicorn para o app Flask (Heroku)
+Por padrão usa workers gthread: cada processo atende várias requisições
+em threads, então uma query lenta ou um cliente lento no POST /contato
+não bloqueia o worker inteiro. GUNICORN_WORKER_CLASS=gevent ativa o modo
+com greenlets (requer `pip install gevent`; psycogreen é recomendado
+para o PostgreSQL) e GUNICORN_WORKER_CLASS=sync volta ao modo antigo.
+
+Autor: Natália Barros
+Uso: gunicorn -c gunicorn.conf.py app:app
+
+Variáveis de ambiente:
+    PORT                    Porta (definida pelo Heroku)
+    WEB_CONCURRENCY         Processos (padrão: 2 × CPUs + 1, no máximo 4)
+    GUNICORN_WORKER_CLASS   gthread (padrão), gevent ou sync
+    GUNICORN_THREADS        Threads por worker gthread (padrão 8)
+    GUNICORN_CONNECTIONS    Greenlets por worker gevent (padrão 100)
+    GUNICORN_TIMEOUT        Segundos até reiniciar um worker travado (padrão 30)
+"""
+
+import os
+import multiprocessing
+
+# ============================================
+# WORKERS
+# ============================================
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY') or min(2 * multiprocessing.cpu_count() + 1, 4))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 8)) if worker_class == 'gthread' else 1
+worker_connections = int(os.environ.get('GUNICORN_CONNECTIONS', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 20
+keepalive = 5
+
+# Reinicia workers periodicamente (com jitter para não reiniciarem juntos)
+max_requests = 2000
+max_requests_jitter = 200
+
+# Cada worker importa o app depois do fork: no modo gevent o monkey patch
+# precisa acontecer antes de o app criar locks e conexões
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+# ============================================
+# POOL DE CONEXÕES POR WORKER
+# ============================================
+
+# Requisições simultâneas por worker: o pool do SQLAlchemy precisa comportar
+# todas (senão as threads ficam esperando DB_POOL_TIMEOUT por uma conexão)
+if worker_class == 'gthread':
+    os.environ.setdefault('DB_POOL_SIZE', str(threads))
+elif worker_class == 'gevent':
+    # Greenlets são muitos e baratos: limita pelo banco, não pelo worker
+    os.environ.setdefault('DB_POOL_SIZE', '10')
+    os.environ.setdefault('DB_MAX_OVERFLOW', '10')
+
+
+def post_worker_init(worker):
+    """Torna o psycopg2 cooperativo no modo gevent (se psycogreen existir)"""
+    if worker_class != 'gevent':
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        worker.log.warning("psycogreen não instalado: queries PostgreSQL bloqueiam o worker gevent")
+        return
+    patch_psycopg()
@@ -4,23 +4,36 @@ Autor: Natália Barros
 Uso: python init_db.py
 """
 
-from app import app, db, Projeto
+from app import (app, db, Projeto, ProjetoTecnologia, ProjetoRelacionado,
+                 incrementar_versao, page_cache)
 from datetime import datetime, timedelta
 import random
+import search
+import relacionados
 
 def criar_tabelas():
     """Cria todas as tabelas do banco de dados"""
     with app.app_context():
         print("🔄 Criando tabelas do banco de dados...")
         db.create_all()
+        search.create_index(db.engine)
         print("✅ Tabelas criadas com sucesso!")
 
 def limpar_dados():
     """Remove todos os dados existentes (cuidado!)"""
     with app.app_context():
         print("🗑️  Limpando dados existentes...")
+        # Exclusão em massa não aplica cascatas (e o SQLite não força FKs):
+        # vínculos primeiro, senão sobram linhas órfãs com ids reaproveitados
+        ProjetoTecnologia.query.delete()
+        ProjetoRelacionado.query.delete()
         Projeto.query.delete()
+        # Exclusão em massa não dispara eventos do ORM: reindexar
+        search.rebuild_index(db.session.connection())
+        relacionados.rebuild(db.session.connection())
+        incrementar_versao(db.session.connection())
         db.session.commit()
+        page_cache.clear()
         print("✅ Dados limpos!")
 
 def criar_projetos_exemplo():
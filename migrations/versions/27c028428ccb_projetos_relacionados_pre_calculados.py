@@ -0,0 +1,110 @@
+"""Projetos relacionados pré-calculados
+
+Revision ID: 27c028428ccb
+Revises: c4e7a9d1b230
+Create Date: 2026-10-18 14:50:58.699698
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '27c028428ccb'
+down_revision = 'c4e7a9d1b230'
+branch_labels = None
+depends_on = None
+
+# Cópia congelada de relacionados.rebuild (como era nesta revisão): o
+# módulo pode mudar depois sem alterar o que esta migração faz
+LIMITE_RELACIONADOS = 3
+PESO_TECNOLOGIAS = 3.0
+PESO_CATEGORIA = 1.0
+PESO_RECENCIA = 0.5
+RECENCIA_DIAS = 365
+
+projetos = sa.table('projetos', sa.column('id', sa.Integer),
+                    sa.column('categoria', sa.String),
+                    sa.column('data_criacao', sa.DateTime))
+vinculos = sa.table('projeto_tecnologia', sa.column('projeto_id', sa.Integer),
+                    sa.column('tecnologia_id', sa.Integer))
+relacionados = sa.table('projetos_relacionados', sa.column('projeto_id', sa.Integer),
+                        sa.column('posicao', sa.Integer),
+                        sa.column('relacionado_id', sa.Integer),
+                        sa.column('pontuacao', sa.Float))
+
+
+def _pontuacao(a, b):
+    comuns = len(a['tecnologias'] & b['tecnologias'])
+    mesma_categoria = a['categoria'] is not None and a['categoria'] == b['categoria']
+    if not comuns and not mesma_categoria:
+        return 0.0
+
+    total = PESO_CATEGORIA if mesma_categoria else 0.0
+    if comuns:
+        total += PESO_TECNOLOGIAS * comuns / len(a['tecnologias'] | b['tecnologias'])
+    if a['data'] and b['data']:
+        dias = abs((a['data'] - b['data']).days)
+        total += PESO_RECENCIA / (1 + dias / RECENCIA_DIAS)
+    return total
+
+
+def _popular(connection):
+    """Calcula os relacionados de todos os projetos já existentes"""
+    tecnologias = {}
+    for projeto_id, tecnologia_id in connection.execute(
+        sa.select(vinculos.c.projeto_id, vinculos.c.tecnologia_id)
+    ):
+        tecnologias.setdefault(projeto_id, set()).add(tecnologia_id)
+
+    atributos = {
+        row.id: {
+            'categoria': row.categoria,
+            'data': row.data_criacao,
+            'tecnologias': frozenset(tecnologias.get(row.id, ())),
+        }
+        for row in connection.execute(
+            sa.select(projetos.c.id, projetos.c.categoria, projetos.c.data_criacao)
+        )
+    }
+
+    linhas = []
+    for projeto_id, atual in atributos.items():
+        candidatos = []
+        for outro_id, outro in atributos.items():
+            if outro_id == projeto_id:
+                continue
+            nota = _pontuacao(atual, outro)
+            if nota > 0:
+                candidatos.append((nota, outro_id))
+        candidatos.sort(reverse=True)
+        linhas.extend(
+            {'projeto_id': projeto_id, 'posicao': posicao,
+             'relacionado_id': outro_id, 'pontuacao': nota}
+            for posicao, (nota, outro_id) in enumerate(candidatos[:LIMITE_RELACIONADOS])
+        )
+    if linhas:
+        connection.execute(relacionados.insert(), linhas)
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('projetos_relacionados',
+    sa.Column('projeto_id', sa.Integer(), nullable=False),
+    sa.Column('posicao', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('relacionado_id', sa.Integer(), nullable=False),
+    sa.Column('pontuacao', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['projeto_id'], ['projetos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['relacionado_id'], ['projetos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('projeto_id', 'posicao')
+    )
+    # ### end Alembic commands ###
+
+    # Popula o ranking dos projetos já existentes
+    _popular(op.get_bind())
+
+
+def downgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('projetos_relacionados')
+    # ### end Alembic commands ###
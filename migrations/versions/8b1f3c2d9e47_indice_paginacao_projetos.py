@@ -0,0 +1,26 @@
+"""Índice para paginação por cursor em /api/projetos
+
+Revision ID: 8b1f3c2d9e47
+Revises: 39956eb81739
+Create Date: 2026-10-18 15:02:11.418203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1f3c2d9e47'
+down_revision = '39956eb81739'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('projetos', schema=None) as batch_op:
+        batch_op.create_index('ix_projetos_data_criacao_id', ['data_criacao', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('projetos', schema=None) as batch_op:
+        batch_op.drop_index('ix_projetos_data_criacao_id')
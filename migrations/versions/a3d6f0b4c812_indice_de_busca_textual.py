@@ -0,0 +1,106 @@
+"""Índice de busca textual dos projetos
+
+Revision ID: a3d6f0b4c812
+Revises: f5e1145ada47
+Create Date: 2026-10-18 16:05:12.532871
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d6f0b4c812'
+down_revision = 'f5e1145ada47'
+branch_labels = None
+depends_on = None
+
+# DDL e indexação como eram nesta revisão (independentes de search.py)
+SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projetos_fts USING fts5(
+        titulo, descricao, tecnologias,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+POSTGRES_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'pt_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION pt_unaccent (COPY = portuguese);
+            ALTER TEXT SEARCH CONFIGURATION pt_unaccent
+                ALTER MAPPING FOR hword, hword_part, word
+                WITH unaccent, portuguese_stem;
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS projetos_busca (
+        projeto_id INTEGER PRIMARY KEY REFERENCES projetos(id) ON DELETE CASCADE,
+        vetor tsvector NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_projetos_busca_vetor ON projetos_busca USING GIN (vetor)",
+]
+
+SQLITE_INSERT = (
+    "INSERT INTO projetos_fts (rowid, titulo, descricao, tecnologias) "
+    "VALUES (:id, :titulo, :descricao, :tecnologias)"
+)
+
+POSTGRES_INSERT = """
+    INSERT INTO projetos_busca (projeto_id, vetor) VALUES (:id,
+        setweight(to_tsvector('pt_unaccent', coalesce(:titulo, '')), 'A') ||
+        setweight(to_tsvector('pt_unaccent', coalesce(:tecnologias, '')), 'B') ||
+        setweight(to_tsvector('pt_unaccent', coalesce(:descricao, '')), 'C'))
+"""
+
+# Remove tags HTML da descrição antes de indexar
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+def upgrade():
+    # FTS5 (SQLite) ou projetos_busca + GIN (PostgreSQL), já populado
+    connection = op.get_bind()
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        statements, insert = SQLITE_SETUP, SQLITE_INSERT
+    elif dialect == 'postgresql':
+        statements, insert = POSTGRES_SETUP, POSTGRES_INSERT
+    else:
+        return
+
+    for statement in statements:
+        connection.execute(sa.text(statement))
+
+    rows = connection.execute(sa.text(
+        "SELECT id, titulo, descricao, tecnologias FROM projetos"
+    )).mappings().all()
+    documentos = [
+        {
+            'id': row['id'],
+            'titulo': row['titulo'] or '',
+            'descricao': TAG_RE.sub(' ', row['descricao'] or ''),
+            'tecnologias': row['tecnologias'] or '',
+        }
+        for row in rows
+    ]
+    if documentos:
+        connection.execute(sa.text(insert), documentos)
+
+
+def downgrade():
+    connection = op.get_bind()
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        connection.execute(sa.text("DROP TABLE IF EXISTS projetos_fts"))
+    elif dialect == 'postgresql':
+        connection.execute(sa.text("DROP TABLE IF EXISTS projetos_busca"))
+        connection.execute(sa.text("DROP TEXT SEARCH CONFIGURATION IF EXISTS pt_unaccent"))
@@ -0,0 +1,29 @@
+"""Contador de versão dos dados para ETags
+
+Revision ID: c4e7a9d1b230
+Revises: 8b1f3c2d9e47
+Create Date: 2026-10-18 15:20:43.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a9d1b230'
+down_revision = '8b1f3c2d9e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    versao_dados = op.create_table('versao_dados',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('versao', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(versao_dados, [{'id': 1, 'versao': 1}])
+
+
+def downgrade():
+    op.drop_table('versao_dados')
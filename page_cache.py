@@ -0,0 +1,247 @@
+"""
+Cache de páginas renderizadas no servidor
+Backend em memória (LRU por processo) por padrão e backend compatível com
+Redis opcional (compartilhado entre workers). Entradas são marcadas com
+tags para invalidação direcionada quando projetos mudam.
+
+Autor: Natália Barros
+"""
+
+import math
+import time
+import pickle
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import g, make_response, request, session
+
+# ============================================
+# BACKENDS
+# ============================================
+
+
+class LRUBackend:
+    """
+    Cache em memória do processo (cada worker do gunicorn tem o seu)
+
+    Como a invalidação só alcança o próprio processo, as entradas têm TTL
+    para limitar por quanto tempo outros workers servem páginas antigas.
+    Cada entrada guarda as próprias tags: ao sair do cache (invalidação,
+    despejo pelo LRU ou expiração) a chave também sai dos sets de tags.
+    """
+
+    def __init__(self, max_entries=500):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, key):
+        """Remove a entrada e a chave dos sets de tags (com o lock)"""
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        for tag in item[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires, _ = item
+            if expires and expires < time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None, tags=()):
+        with self._lock:
+            self._drop(key)
+            tags = frozenset(tags)
+            self._entries[key] = (value, time.time() + ttl if ttl else None, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class RedisBackend:
+    """
+    Cache compartilhado em um servidor Redis
+
+    Aceita qualquer cliente compatível com redis-py (ex: fakeredis nos
+    testes). Cada tag é um sorted set com as chaves que dependem dela,
+    pontuadas pelo instante em que expiram: cada gravação descarta as
+    chaves já expiradas e o próprio set expira junto com a entrada mais
+    duradoura, então tags de páginas que não existem mais não se acumulam.
+    """
+
+    def __init__(self, client, prefix='pagina:'):
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag):
+        # 'tags:' (sorted set); versões anteriores usavam sets em 'tag:'
+        return f'{self.prefix}tags:{tag}'
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None, tags=()):
+        now = time.time()
+        expires = now + ttl if ttl else float('inf')
+        tag_keys = [self._tag_key(tag) for tag in tags]
+
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, pickle.dumps(value), ex=ttl)
+        for tag_key in tag_keys:
+            pipe.zadd(tag_key, {self.prefix + key: expires})
+            pipe.zremrangebyscore(tag_key, '-inf', now)
+            pipe.zrange(tag_key, -1, -1, withscores=True)
+        results = pipe.execute()
+
+        if not tag_keys:
+            return
+        # Validade do set = a da entrada que expira por último
+        pipe = self.client.pipeline()
+        for i, tag_key in enumerate(tag_keys):
+            latest = results[3 + 3 * i]
+            last = latest[0][1] if latest else expires
+            if last == float('inf'):
+                pipe.persist(tag_key)
+            else:
+                pipe.expireat(tag_key, math.ceil(last))
+        pipe.execute()
+
+    def invalidate_tags(self, tags):
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = self.client.zrange(tag_key, 0, -1)
+            pipe = self.client.pipeline()
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(tag_key)
+            pipe.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f'{self.prefix}*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+def backend_from_url(url=None, max_entries=500):
+    """
+    Cria o backend a partir de uma URL (redis://...) ou LRU se vazia
+
+    Args:
+        url: URL do Redis (opcional)
+        max_entries: Tamanho do LRU em memória
+    """
+    if url:
+        import redis  # Dependência opcional
+        return RedisBackend(redis.Redis.from_url(url))
+    return LRUBackend(max_entries=max_entries)
+
+
+# ============================================
+# CACHE DE PÁGINAS
+# ============================================
+
+
+class PageCache:
+    """Decorator de cache de páginas + métricas de acerto por rota"""
+
+    def __init__(self, backend=None):
+        self.backend = backend or LRUBackend()
+        self.enabled = True
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint, view_args, args):
+        """Chave: endpoint + argumentos da rota + query string normalizada"""
+        rota = ','.join(f'{k}={v}' for k, v in sorted(view_args.items()))
+        query = '&'.join(
+            f'{k}={v.strip()}' for k, v in sorted(args.items(multi=True)) if v.strip()
+        )
+        return f'{endpoint}|{rota}|{query}'
+
+    def _count(self, endpoint, hit):
+        with self._lock:
+            metrics = self._metrics.setdefault(endpoint, {'hits': 0, 'misses': 0})
+            metrics['hits' if hit else 'misses'] += 1
+
+    def tag(self, *tags):
+        """Adiciona tags à página sendo renderizada (chamar dentro da view)"""
+        g.setdefault('page_cache_tags', set()).update(tags)
+
+    def cached(self, tags=(), ttl=60):
+        """
+        Decorator que guarda a resposta 200 renderizada pela view
+
+        Args:
+            tags: Tags fixas da rota (usadas na invalidação)
+            ttl: Segundos de validade (None = até ser invalidada)
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # Páginas com mensagens flash são específicas da sessão
+                if not self.enabled or session.get('_flashes'):
+                    return view(*args, **kwargs)
+
+                key = self.make_key(request.endpoint, kwargs, request.args)
+                cached = self.backend.get(key)
+                if cached is not None:
+                    self._count(request.endpoint, True)
+                    body, mimetype = cached
+                    response = make_response(body)
+                    response.mimetype = mimetype
+                    return response
+
+                self._count(request.endpoint, False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    page_tags = set(tags) | g.pop('page_cache_tags', set())
+                    self.backend.set(key, (response.get_data(), response.mimetype),
+                                     ttl=ttl, tags=page_tags)
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        """Remove as páginas marcadas com qualquer uma das tags"""
+        if tags:
+            self.backend.invalidate_tags(tags)
+
+    def clear(self):
+        """Remove todas as páginas do cache"""
+        self.backend.clear()
+
+    def metrics(self):
+        """Hits, misses e taxa de acerto por rota"""
+        with self._lock:
+            return {
+                endpoint: dict(m, hit_ratio=m['hits'] / (m['hits'] + m['misses']))
+                for endpoint, m in self._metrics.items()
+                if m['hits'] + m['misses']
+            }
@@ -0,0 +1,248 @@
+"""
+Projetos relacionados pré-calculados
+A similaridade entre projetos (tecnologias em comum, categoria e
+proximidade das datas) é calculada na escrita e gravada na tabela
+projetos_relacionados; a página de detalhes só faz uma busca pela chave
+primária (projeto_id, posicao), sem ORDER BY random() a cada visita.
+
+Autor: Natália Barros
+"""
+
+import sqlalchemy as sa
+
+# ============================================
+# CONFIGURAÇÕES
+# ============================================
+
+LIMITE_RELACIONADOS = 3
+
+PESO_TECNOLOGIAS = 3.0  # × índice de Jaccard das tecnologias
+PESO_CATEGORIA = 1.0    # mesma categoria
+PESO_RECENCIA = 0.5     # × 1 / (1 + dias entre as datas / RECENCIA_DIAS)
+RECENCIA_DIAS = 365
+
+# Tabelas "leves" (evita importar os modelos de app.py)
+projetos = sa.table('projetos', sa.column('id', sa.Integer),
+                    sa.column('categoria', sa.String),
+                    sa.column('data_criacao', sa.DateTime))
+vinculos = sa.table('projeto_tecnologia', sa.column('projeto_id', sa.Integer),
+                    sa.column('tecnologia_id', sa.Integer))
+relacionados = sa.table('projetos_relacionados', sa.column('projeto_id', sa.Integer),
+                        sa.column('posicao', sa.Integer),
+                        sa.column('relacionado_id', sa.Integer),
+                        sa.column('pontuacao', sa.Float))
+
+
+# ============================================
+# SIMILARIDADE
+# ============================================
+
+def carregar_atributos(connection):
+    """
+    Lê categoria, data e tecnologias de todos os projetos
+
+    Returns:
+        Dict id → {'categoria', 'data', 'tecnologias': frozenset}
+    """
+    tecnologias = {}
+    for projeto_id, tecnologia_id in connection.execute(
+        sa.select(vinculos.c.projeto_id, vinculos.c.tecnologia_id)
+    ):
+        tecnologias.setdefault(projeto_id, set()).add(tecnologia_id)
+
+    return {
+        row.id: {
+            'categoria': row.categoria,
+            'data': row.data_criacao,
+            'tecnologias': frozenset(tecnologias.get(row.id, ())),
+        }
+        for row in connection.execute(
+            sa.select(projetos.c.id, projetos.c.categoria, projetos.c.data_criacao)
+        )
+    }
+
+
+def pontuacao(a, b):
+    """
+    Similaridade entre dois projetos (0 = não relacionados)
+
+    Só tecnologias em comum ou mesma categoria tornam projetos
+    relacionados; a proximidade das datas serve de desempate.
+    """
+    comuns = len(a['tecnologias'] & b['tecnologias'])
+    mesma_categoria = a['categoria'] is not None and a['categoria'] == b['categoria']
+    if not comuns and not mesma_categoria:
+        return 0.0
+
+    total = PESO_CATEGORIA if mesma_categoria else 0.0
+    if comuns:
+        total += PESO_TECNOLOGIAS * comuns / len(a['tecnologias'] | b['tecnologias'])
+    if a['data'] and b['data']:
+        dias = abs((a['data'] - b['data']).days)
+        total += PESO_RECENCIA / (1 + dias / RECENCIA_DIAS)
+    return total
+
+
+def ranking(projeto_id, atributos, limite=LIMITE_RELACIONADOS):
+    """
+    Projetos mais parecidos com `projeto_id`
+
+    Args:
+        projeto_id: Projeto de referência
+        atributos: Resultado de carregar_atributos
+        limite: Quantidade de relacionados
+
+    Returns:
+        Lista de (relacionado_id, pontuacao), do mais para o menos parecido
+    """
+    atual = atributos[projeto_id]
+    candidatos = []
+    for outro_id, outro in atributos.items():
+        if outro_id == projeto_id:
+            continue
+        nota = pontuacao(atual, outro)
+        if nota > 0:
+            candidatos.append((nota, outro_id))
+    # Empate: projeto mais novo (maior id) primeiro
+    candidatos.sort(reverse=True)
+    return [(outro_id, nota) for nota, outro_id in candidatos[:limite]]
+
+
+# ============================================
+# PERSISTÊNCIA
+# ============================================
+
+def _gravar_listas(connection, listas):
+    """
+    Substitui os rankings gravados
+
+    Args:
+        listas: Dict projeto_id → lista de (relacionado_id, pontuacao)
+    """
+    if not listas:
+        return
+    connection.execute(relacionados.delete().where(
+        relacionados.c.projeto_id.in_(list(listas))
+    ))
+    linhas = [
+        {'projeto_id': projeto_id, 'posicao': posicao,
+         'relacionado_id': relacionado_id, 'pontuacao': nota}
+        for projeto_id, lista in listas.items()
+        for posicao, (relacionado_id, nota) in enumerate(lista)
+    ]
+    if linhas:
+        connection.execute(relacionados.insert(), linhas)
+
+
+def _gravar(connection, ids, atributos):
+    _gravar_listas(connection, {projeto_id: ranking(projeto_id, atributos)
+                                for projeto_id in ids if projeto_id in atributos})
+
+
+def carregar_rankings(connection):
+    """
+    Lê os rankings gravados
+
+    Returns:
+        Dict projeto_id → lista de (relacionado_id, pontuacao), na ordem
+    """
+    rankings = {}
+    for row in connection.execute(
+        sa.select(relacionados.c.projeto_id, relacionados.c.relacionado_id,
+                  relacionados.c.pontuacao)
+        .order_by(relacionados.c.projeto_id, relacionados.c.posicao)
+    ):
+        rankings.setdefault(row.projeto_id, []).append((row.relacionado_id, row.pontuacao))
+    return rankings
+
+
+def rebuild(connection):
+    """Recalcula os relacionados de todos os projetos (após operações em massa)"""
+    atributos = carregar_atributos(connection)
+    connection.execute(relacionados.delete())
+    _gravar(connection, set(atributos), atributos)
+
+
+def refresh(connection, alterados=(), removidos=()):
+    """
+    Atualiza os rankings depois de projetos novos, alterados ou excluídos
+
+    Só os alterados são comparados com todos os outros (O(N) cada). Para
+    os demais projetos, a nova nota de cada alterado é comparada com o
+    ranking gravado: ela entra no lugar do pior relacionado quando é
+    maior. O ranking completo só é refeito para os alterados e para
+    projetos que listavam um removido ou um alterado cuja nota caiu (o
+    substituto pode ser qualquer outro projeto).
+
+    Args:
+        connection: Conexão da transação atual
+        alterados: Ids de projetos novos ou com categoria/tecnologias/data alteradas
+        removidos: Ids de projetos excluídos
+
+    Returns:
+        Conjunto de ids cujos relacionados mudaram
+    """
+    alterados, removidos = set(alterados), set(removidos)
+    if not alterados and not removidos:
+        return set()
+
+    atributos = carregar_atributos(connection)
+    alterados = {projeto_id for projeto_id in alterados if projeto_id in atributos}
+    rankings = carregar_rankings(connection)
+
+    if removidos:
+        connection.execute(relacionados.delete().where(
+            relacionados.c.projeto_id.in_(list(removidos))
+        ))
+
+    # Nota nova de cada alterado contra cada projeto: O(|alterados| × N),
+    # na mesma ordem de argumentos de ranking(outro_id)
+    notas = {
+        alterado: {outro_id: pontuacao(outro, atributos[alterado])
+                   for outro_id, outro in atributos.items() if outro_id != alterado}
+        for alterado in alterados
+    }
+
+    refazer = set(alterados)
+    novas = {}
+    for projeto_id in atributos.keys() - alterados:
+        lista = rankings.get(projeto_id, [])
+        # Com ON DELETE CASCADE o removido já pode ter sumido da lista,
+        # deixando-a incompleta
+        if removidos and (len(lista) < LIMITE_RELACIONADOS
+                          or any(relacionado_id in removidos for relacionado_id, _ in lista)):
+            refazer.add(projeto_id)
+            continue
+
+        atual = dict(lista)
+        mudou = False
+        for alterado in alterados:
+            nota = notas[alterado][projeto_id]
+            if alterado in atual:
+                if nota < atual[alterado]:
+                    # Pode ter saído do ranking: o substituto é desconhecido
+                    refazer.add(projeto_id)
+                    break
+                if nota != atual[alterado]:
+                    atual[alterado] = nota
+                    mudou = True
+            elif nota > 0:
+                # Mesmo critério de ranking(): nota e, no empate, maior id
+                pior = min(((n, i) for i, n in atual.items()), default=None)
+                if len(atual) < LIMITE_RELACIONADOS or (nota, alterado) > pior:
+                    atual[alterado] = nota
+                    if len(atual) > LIMITE_RELACIONADOS:
+                        del atual[pior[1]]
+                    mudou = True
+        else:
+            if mudou:
+                ordenados = sorted(((n, i) for i, n in atual.items()), reverse=True)
+                novas[projeto_id] = [(i, n) for n, i in ordenados]
+
+    for projeto_id in refazer:
+        nova = ranking(projeto_id, atributos)
+        if projeto_id in alterados or nova != rankings.get(projeto_id, []):
+            novas[projeto_id] = nova
+
+    _gravar_listas(connection, novas)
+    return set(novas) | alterados
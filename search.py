@@ -0,0 +1,252 @@
+"""
+Busca textual de projetos
+SQLite (desenvolvimento): tabela virtual FTS5 com remoção de acentos
+PostgreSQL (produção): tabela tsvector + índice GIN com configuração
+'portuguese' + unaccent
+
+Autor: Natália Barros
+"""
+
+import re
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# Pesos por coluna: título > tecnologias > descrição
+SEARCHABLE_COLUMNS = ('titulo', 'descricao', 'tecnologias')
+
+SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projetos_fts USING fts5(
+        titulo, descricao, tecnologias,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+POSTGRES_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'pt_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION pt_unaccent (COPY = portuguese);
+            ALTER TEXT SEARCH CONFIGURATION pt_unaccent
+                ALTER MAPPING FOR hword, hword_part, word
+                WITH unaccent, portuguese_stem;
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS projetos_busca (
+        projeto_id INTEGER PRIMARY KEY REFERENCES projetos(id) ON DELETE CASCADE,
+        vetor tsvector NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_projetos_busca_vetor ON projetos_busca USING GIN (vetor)",
+]
+
+POSTGRES_VECTOR = """
+    setweight(to_tsvector('pt_unaccent', coalesce(:titulo, '')), 'A') ||
+    setweight(to_tsvector('pt_unaccent', coalesce(:tecnologias, '')), 'B') ||
+    setweight(to_tsvector('pt_unaccent', coalesce(:descricao, '')), 'C')
+"""
+
+# Remove tags HTML da descrição antes de indexar
+TAG_RE = re.compile(r'<[^>]+>')
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_index_available = set()
+
+
+def _dialect(bind):
+    return bind.dialect.name
+
+
+def index_exists(connection):
+    """Verifica se o índice de busca existe (resultado positivo é memorizado)"""
+    dialect = _dialect(connection)
+    if dialect in _index_available:
+        return True
+
+    if dialect == 'sqlite':
+        found = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'projetos_fts'"
+        )).first() is not None
+    elif dialect == 'postgresql':
+        found = connection.execute(text(
+            "SELECT to_regclass('projetos_busca')"
+        )).scalar() is not None
+    else:
+        found = False
+
+    if found:
+        _index_available.add(dialect)
+    return found
+
+
+def create_index(engine):
+    """
+    Cria a estrutura de busca (idempotente) e indexa todos os projetos
+
+    Args:
+        engine: Engine do SQLAlchemy
+    """
+    with engine.begin() as connection:
+        setup_index(connection)
+
+
+def setup_index(connection):
+    """
+    Versão de create_index para uma conexão já aberta (ex: migrations,
+    com op.get_bind())
+
+    Args:
+        connection: Conexão do SQLAlchemy (dentro de uma transação)
+    """
+    dialect = _dialect(connection)
+    statements = {'sqlite': SQLITE_SETUP, 'postgresql': POSTGRES_SETUP}.get(dialect)
+    if statements is None:
+        logger.warning("Busca textual não suportada para %s", dialect)
+        return
+
+    for statement in statements:
+        connection.execute(text(statement))
+    rebuild_index(connection)
+
+
+def drop_index(connection):
+    """Remove a estrutura de busca (downgrade da migration)"""
+    dialect = _dialect(connection)
+    if dialect == 'sqlite':
+        connection.execute(text("DROP TABLE IF EXISTS projetos_fts"))
+    elif dialect == 'postgresql':
+        connection.execute(text("DROP TABLE IF EXISTS projetos_busca"))
+        connection.execute(text("DROP TEXT SEARCH CONFIGURATION IF EXISTS pt_unaccent"))
+    _index_available.discard(dialect)
+
+
+def rebuild_index(connection):
+    """Reindexa todos os projetos (após operações em massa)"""
+    if not index_exists(connection):
+        return
+
+    rows = connection.execute(text(
+        "SELECT id, titulo, descricao, tecnologias FROM projetos"
+    )).mappings().all()
+
+    if _dialect(connection) == 'sqlite':
+        connection.execute(text("DELETE FROM projetos_fts"))
+    else:
+        connection.execute(text("DELETE FROM projetos_busca"))
+
+    for row in rows:
+        _write_row(connection, row)
+
+
+def _document(row):
+    return {
+        'id': row['id'],
+        'titulo': row['titulo'] or '',
+        'descricao': TAG_RE.sub(' ', row['descricao'] or ''),
+        'tecnologias': row['tecnologias'] or '',
+    }
+
+
+def _write_row(connection, row):
+    doc = _document(row)
+    if _dialect(connection) == 'sqlite':
+        connection.execute(text("DELETE FROM projetos_fts WHERE rowid = :id"), doc)
+        connection.execute(text(
+            "INSERT INTO projetos_fts (rowid, titulo, descricao, tecnologias) "
+            "VALUES (:id, :titulo, :descricao, :tecnologias)"
+        ), doc)
+    else:
+        connection.execute(text(
+            "INSERT INTO projetos_busca (projeto_id, vetor) "
+            f"VALUES (:id, {POSTGRES_VECTOR}) "
+            f"ON CONFLICT (projeto_id) DO UPDATE SET vetor = {POSTGRES_VECTOR}"
+        ), doc)
+
+
+def sync_projeto(connection, projeto):
+    """Atualiza o índice de um projeto (chamado nos eventos do ORM)"""
+    if not index_exists(connection):
+        return
+    _write_row(connection, {
+        'id': projeto.id,
+        'titulo': projeto.titulo,
+        'descricao': projeto.descricao,
+        'tecnologias': projeto.tecnologias,
+    })
+
+
+def remove_projeto(connection, projeto_id):
+    """Remove um projeto do índice"""
+    if not index_exists(connection):
+        return
+    if _dialect(connection) == 'sqlite':
+        connection.execute(text("DELETE FROM projetos_fts WHERE rowid = :id"),
+                           {'id': projeto_id})
+    else:
+        connection.execute(text("DELETE FROM projetos_busca WHERE projeto_id = :id"),
+                           {'id': projeto_id})
+
+
+def _fts5_query(busca):
+    """Converte a busca do usuário em consulta FTS5 segura (prefixos, AND)"""
+    tokens = TOKEN_RE.findall(busca)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_ids(engine, busca, limit=None):
+    """
+    Busca projetos por relevância
+
+    Args:
+        engine: Engine do SQLAlchemy
+        busca: Texto digitado pelo usuário
+        limit: Máximo de resultados (None = todos; a página /projetos
+            lista todos os resultados da busca)
+
+    Returns:
+        Lista de ids ordenada por relevância, ou None se o índice não
+        estiver disponível (o chamador deve usar a busca com LIKE)
+    """
+    dialect = _dialect(engine)
+    if dialect not in ('sqlite', 'postgresql'):
+        return None
+
+    limite = '' if limit is None else ' LIMIT :limit'
+
+    try:
+        with engine.connect() as connection:
+            if not index_exists(connection):
+                return None
+
+            if dialect == 'sqlite':
+                query = _fts5_query(busca)
+                if not query:
+                    return []
+                rows = connection.execute(text(
+                    "SELECT rowid FROM projetos_fts WHERE projetos_fts MATCH :q "
+                    "ORDER BY bm25(projetos_fts, 10.0, 1.0, 5.0)" + limite
+                ), {'q': query, 'limit': limit})
+            else:
+                rows = connection.execute(text(
+                    "SELECT projeto_id FROM projetos_busca, "
+                    "websearch_to_tsquery('pt_unaccent', :q) AS consulta "
+                    "WHERE vetor @@ consulta "
+                    "ORDER BY ts_rank(vetor, consulta) DESC" + limite
+                ), {'q': busca, 'limit': limit})
+
+            return [row[0] for row in rows]
+
+    except DBAPIError as e:
+        logger.warning("Busca textual indisponível, usando LIKE: %s", e)
+        _index_available.discard(dialect)
+        return None
@@ -0,0 +1,126 @@
+"""
+Testes da fila de contatos (contact_queue.py)
+Falha no banco, reservas de workers mortos e dois workers no mesmo spool.
+
+Autor: Natália Barros
+Uso: python -m pytest tests/
+"""
+
+import os
+import sys
+import time
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contact_queue
+from contact_queue import ContactQueue, RESERVA_EXPIRA
+
+
+@pytest.fixture(autouse=True)
+def sem_thread(monkeypatch):
+    # A thread de gravação drenaria o spool sozinha; aqui o flush é manual
+    monkeypatch.setattr(ContactQueue, 'start', lambda self: None)
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return str(tmp_path / 'spool.db')
+
+
+def reservas(queue):
+    return queue._connection().execute(
+        'SELECT COUNT(*) FROM spool WHERE reserva IS NOT NULL'
+    ).fetchone()[0]
+
+
+# ============================================
+# FALHA NO BANCO
+# ============================================
+
+def test_falha_no_flush_devolve_o_lote(spool):
+    def banco_fora(lote):
+        raise RuntimeError('banco fora')
+
+    queue = ContactQueue(spool, banco_fora, batch_size=10)
+    for i in range(5):
+        queue.enqueue({'n': i})
+
+    with pytest.raises(RuntimeError):
+        queue.flush()
+
+    assert queue.pending() == 5
+    assert reservas(queue) == 0
+    assert queue.stats['failures'] == 1
+
+    gravadas = []
+    queue.flush_fn = gravadas.extend
+    assert queue.flush() == 5
+    assert [dados['n'] for dados in gravadas] == [0, 1, 2, 3, 4]
+    assert queue.pending() == 0
+
+
+# ============================================
+# RESERVAS
+# ============================================
+
+def test_reserva_expirada_volta_para_a_fila(spool, monkeypatch):
+    gravadas = []
+    queue = ContactQueue(spool, gravadas.extend, batch_size=10)
+    for i in range(3):
+        queue.enqueue({'n': i})
+
+    # Worker que reservou o lote e morreu antes de gravar
+    agora = time.time()
+    monkeypatch.setattr(contact_queue.time, 'time', lambda: agora - RESERVA_EXPIRA - 1)
+    _, rows = ContactQueue(spool, None, batch_size=10)._claim()
+    assert len(rows) == 3
+    monkeypatch.setattr(contact_queue.time, 'time', lambda: agora)
+
+    assert queue.flush() == 3
+    assert [dados['n'] for dados in gravadas] == [0, 1, 2]
+    assert queue.pending() == 0
+
+
+def test_reserva_recente_nao_e_regravada(spool):
+    gravadas = []
+    queue = ContactQueue(spool, gravadas.extend, batch_size=10)
+    queue.enqueue({'n': 0})
+
+    # Outro worker ainda está gravando este lote
+    ContactQueue(spool, None, batch_size=10)._claim()
+
+    assert queue.flush() == 0
+    assert gravadas == []
+    assert queue.pending() == 1
+
+
+# ============================================
+# DOIS WORKERS NO MESMO SPOOL
+# ============================================
+
+def test_dois_workers_nunca_gravam_a_mesma_linha(spool):
+    gravadas = []
+    lock = threading.Lock()
+
+    def banco(lote):
+        time.sleep(0.005)  # Janela para o outro worker reservar
+        with lock:
+            gravadas.extend(dados['n'] for dados in lote)
+
+    primeiro = ContactQueue(spool, banco, batch_size=7)
+    segundo = ContactQueue(spool, banco, batch_size=7)
+    for i in range(200):
+        primeiro.enqueue({'n': i})
+
+    threads = [threading.Thread(target=q.flush) for q in (primeiro, segundo)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(gravadas) == list(range(200))
+    assert primeiro.stats['batches'] > 0 and segundo.stats['batches'] > 0
+    assert primeiro.pending() == 0
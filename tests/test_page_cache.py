@@ -0,0 +1,128 @@
+"""
+Testes dos backends do cache de páginas (page_cache.py)
+O backend Redis roda contra o fakeredis (pip install fakeredis).
+
+Autor: Natália Barros
+Uso: python -m pytest tests/
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_cache import LRUBackend, RedisBackend
+
+
+# ============================================
+# LRU EM MEMÓRIA
+# ============================================
+
+def test_lru_invalida_por_tag():
+    cache = LRUBackend()
+    cache.set('a', 1, tags=('projetos',))
+    cache.set('b', 2, tags=('projetos', 'projeto:1'))
+    cache.set('c', 3, tags=('index',))
+
+    cache.invalidate_tags(['projeto:1'])
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert cache._tags == {'projetos': {'a'}, 'index': {'c'}}
+
+
+def test_lru_despejo_remove_chave_das_tags():
+    cache = LRUBackend(max_entries=3)
+    for i in range(100):
+        cache.set(f'/projetos?busca={i}', i, tags=('projetos',))
+
+    assert len(cache._entries) == 3
+    assert cache._tags == {'projetos': {'/projetos?busca=97', '/projetos?busca=98',
+                                        '/projetos?busca=99'}}
+
+
+def test_lru_expiracao_remove_chave_das_tags(monkeypatch):
+    cache = LRUBackend()
+    cache.set('a', 1, ttl=10, tags=('projetos', 'index'))
+
+    agora = time.time()
+    monkeypatch.setattr(time, 'time', lambda: agora + 11)
+
+    assert cache.get('a') is None
+    assert cache._entries == {}
+    assert cache._tags == {}
+
+
+def test_lru_regravar_troca_as_tags():
+    cache = LRUBackend()
+    cache.set('a', 1, tags=('projeto:1',))
+    cache.set('a', 2, tags=('projeto:2',))
+
+    assert cache._tags == {'projeto:2': {'a'}}
+    cache.invalidate_tags(['projeto:1'])
+    assert cache.get('a') == 2
+
+
+# ============================================
+# REDIS (FAKEREDIS)
+# ============================================
+
+@pytest.fixture
+def redis_backend():
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisBackend(fakeredis.FakeRedis())
+
+
+def test_redis_invalida_por_tag(redis_backend):
+    redis_backend.set('a', ('html-a', 'text/html'), ttl=60, tags=('projetos',))
+    redis_backend.set('b', ('html-b', 'text/html'), ttl=60, tags=('projeto:1',))
+
+    redis_backend.invalidate_tags(['projetos'])
+
+    assert redis_backend.get('a') is None
+    assert redis_backend.get('b') == ('html-b', 'text/html')
+    assert not redis_backend.client.exists('pagina:tags:projetos')
+
+
+def test_redis_tags_expiram_com_a_entrada(redis_backend):
+    client = redis_backend.client
+    redis_backend.set('a', 1, ttl=60, tags=('projetos',))
+    redis_backend.set('b', 1, ttl=600, tags=('projetos',))
+    redis_backend.set('c', 1, ttl=60, tags=('projetos',))
+
+    # O set da tag vive até a entrada mais duradoura expirar
+    assert 590 < client.ttl('pagina:tags:projetos') <= 601
+    assert client.ttl('pagina:tags:projetos') >= client.ttl('pagina:b')
+
+
+def test_redis_tag_sem_ttl_nao_expira(redis_backend):
+    client = redis_backend.client
+    redis_backend.set('a', 1, ttl=60, tags=('sobre',))
+    redis_backend.set('b', 1, ttl=None, tags=('sobre',))
+
+    assert client.ttl('pagina:tags:sobre') == -1
+
+
+def test_redis_gravacao_descarta_chaves_expiradas(redis_backend, monkeypatch):
+    client = redis_backend.client
+    for i in range(50):
+        redis_backend.set(f'/projetos?busca={i}', i, ttl=60, tags=('projetos',))
+    assert client.zcard('pagina:tags:projetos') == 50
+
+    agora = time.time()
+    monkeypatch.setattr(time, 'time', lambda: agora + 61)
+    redis_backend.set('/projetos', 'nova', ttl=60, tags=('projetos',))
+
+    assert client.zrange('pagina:tags:projetos', 0, -1) == [b'pagina:/projetos']
+
+
+def test_redis_clear(redis_backend):
+    redis_backend.set('a', 1, ttl=60, tags=('projetos',))
+    redis_backend.clear()
+
+    assert redis_backend.get('a') is None
+    assert redis_backend.client.keys('pagina:*') == []
@@ -4,223 +4,289 @@ Autor: Natália Barros
 Uso: python update_projects.py [username]
 """
 
-import requests
 import sys
-from app import app, db, Projeto
+import time
+from app import (app, db, Projeto, ProjetoTecnologia, sincronizar_tecnologias_em_massa,
+                 incrementar_versao, page_cache)
 from datetime import datetime
-
-# Mapeamento de linguagens para tecnologias/frameworks comuns
-TECH_MAPPING = {
-    'Python': ['Python', 'Flask', 'Django', 'FastAPI'],
-    'JavaScript': ['JavaScript', 'Node.js', 'Express', 'React'],
-    'TypeScript': ['TypeScript', 'Angular', 'Vue.js'],
-    'Java': ['Java', 'Spring Boot', 'Maven'],
-    'Go': ['Go', 'Gin', 'Echo'],
-    'Ruby': ['Ruby', 'Ruby on Rails'],
-    'PHP': ['PHP', 'Laravel', 'Symfony'],
-    'C#': ['C#', '.NET', 'ASP.NET'],
-    'HTML': ['HTML5', 'CSS3', 'Bootstrap'],
-    'CSS': ['CSS3', 'Sass', 'Tailwind'],
-}
-
-# Mapeamento de linguagens para categorias
-CATEGORY_MAPPING = {
-    'Python': 'Web App',
-    'JavaScript': 'Web App',
-    'TypeScript': 'Web App',
-    'Java': 'Backend',
-    'Go': 'Backend',
-    'Jupyter Notebook': 'Data Science',
-    'R': 'Data Science',
-    'HTML': 'Frontend',
-    'CSS': 'Frontend',
-}
-
-def buscar_repositorios_github(username):
+from sqlalchemy import select
+from github_cache import get_cache
+from github_pipeline import Pipeline, drain, should_include_repo
+import database
+import relacionados
+import search
+
+def criar_descricao(projeto):
     """
-    Busca todos os repositórios públicos de um usuário do GitHub
+    Cria uma descrição formatada do projeto
 
     Args:
-        username (str): Nome de usuário do GitHub
+        projeto (dict): Registro do pipeline (github_pipeline.process_repository)
 
     Returns:
-        list: Lista de repositórios
+        str: Descrição HTML formatada
     """
-    url = f'https://api.github.com/users/{username}/repos'
-    params = {
-        'sort': 'updated',
-        'per_page': 100
-    }
+    descricao_base = projeto.get('description') or 'Projeto desenvolvido com dedicação e boas práticas.'
+
+    descricao_html = f'''
+    <p>{descricao_base}</p>
+
+    <h5>Informações do Repositório:</h5>
+    <ul>
+        <li><strong>Stars:</strong> {projeto.get('stars', 0)} ⭐</li>
+        <li><strong>Forks:</strong> {projeto.get('forks', 0)} 🍴</li>
+        <li><strong>Última atualização:</strong> {projeto.get('updated_at', 'N/A')}</li>
+    </ul>
+
+    <p>Este projeto demonstra conhecimento em desenvolvimento de software,
+    seguindo padrões de qualidade e boas práticas de programação.</p>
+    '''
 
-    try:
-        print(f"🔍 Buscando repositórios de {username}...")
-        response = requests.get(url, params=params)
-        response.raise_for_status()
+    return descricao_html
 
-        repos = response.json()
-        print(f"✅ Encontrados {len(repos)} repositórios!")
-        return repos
+# Campos atualizados em projetos que já existem (destaque e imagem são
+# definidos só na criação para preservar ajustes manuais)
+CAMPOS_SINCRONIZADOS = ('titulo', 'descricao', 'descricao_curta', 'tecnologias',
+                        'github_url', 'demo_url', 'categoria', 'data_criacao')
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Erro ao buscar repositórios: {e}")
-        return []
+def chave_url(url):
+    """URL do repositório normalizada para comparação ('…/Repo/' → '…/repo')"""
+    url = (url or '').strip().lower().rstrip('/')
+    return url[:-4] if url.endswith('.git') else url
 
-def obter_linguagens_repo(languages_url):
+def montar_projeto(projeto):
     """
-    Obtém as linguagens usadas em um repositório
+    Converte um registro do pipeline em dados da tabela de projetos
 
     Args:
-        languages_url (str): URL da API de linguagens
+        projeto (dict): Registro do pipeline (github_pipeline.process_repository)
 
     Returns:
-        list: Lista de linguagens
+        dict: Colunas do projeto
     """
-    try:
-        response = requests.get(languages_url)
-        response.raise_for_status()
-        languages = response.json()
-        return list(languages.keys())
-    except:
-        return []
-
-def determinar_tecnologias(languages):
+    return {
+        'github_id': projeto['id'],
+        'titulo': projeto['title'],
+        'descricao': criar_descricao(projeto),
+        'descricao_curta': (projeto.get('description') or 'Projeto do GitHub')[:200],
+        'tecnologias': ', '.join(projeto['technologies']) or 'Outras tecnologias',
+        'github_url': projeto['github_url'],
+        'demo_url': projeto.get('demo_url'),
+        'categoria': projeto['category'],
+        'destaque': projeto.get('stars', 0) > 5,  # Destaque se tem 5+ stars
+        'data_criacao': datetime.strptime(projeto['created_at'], '%Y-%m-%d'),
+    }
+
+def calcular_diff(novos, existentes, remover_ausentes=False):
     """
-    Determina as tecnologias baseado nas linguagens
+    Compara os projetos vindos do GitHub com os do banco
 
     Args:
-        languages (list): Lista de linguagens
+        novos (dict): github_id → colunas do projeto (montar_projeto)
+        existentes (dict): github_id → linha do banco
+        remover_ausentes (bool): Remover importados que não vieram do GitHub
 
     Returns:
-        str: String de tecnologias separadas por vírgula
+        dict: Listas 'inserir', 'atualizar', 'remover' e 'inalterados'
     """
-    tecnologias = set()
-
-    for lang in languages:
-        if lang in TECH_MAPPING:
-            # Adiciona a linguagem principal
-            tecnologias.add(lang)
-            # Adiciona frameworks comuns (primeiro da lista)
-            if len(TECH_MAPPING[lang]) > 1:
-                tecnologias.add(TECH_MAPPING[lang][1])
+    diff = {'inserir': [], 'atualizar': [], 'remover': [], 'inalterados': []}
 
-    return ', '.join(sorted(tecnologias)) if tecnologias else 'Outras tecnologias'
+    for github_id, dados in novos.items():
+        atual = existentes.get(github_id)
+        if atual is None:
+            diff['inserir'].append(dados)
+        elif any(getattr(atual, campo) != dados[campo] for campo in CAMPOS_SINCRONIZADOS):
+            diff['atualizar'].append(dados)
+        else:
+            diff['inalterados'].append(dados)
 
-def determinar_categoria(languages):
-    """
-    Determina a categoria baseado nas linguagens
+    if remover_ausentes:
+        diff['remover'] = [atual for github_id, atual in existentes.items()
+                           if github_id not in novos]
 
-    Args:
-        languages (list): Lista de linguagens
+    return diff
 
-    Returns:
-        str: Categoria do projeto
+def aplicar_diff(diff, adotados):
     """
-    for lang in languages:
-        if lang in CATEGORY_MAPPING:
-            return CATEGORY_MAPPING[lang]
+    Aplica o diff em uma única transação, com upsert nativo do banco
 
-    return 'Outros'
+    Escrita em massa não passa pelos eventos do ORM, então tecnologias,
+    busca, relacionados e versão dos dados são atualizados aqui.
 
-def criar_descricao(repo):
+    Args:
+        diff (dict): Resultado de calcular_diff
+        adotados (dict): id → github_id de projetos antigos (sem github_id)
+            reconhecidos pelo título
     """
-    Cria uma descrição formatada do projeto
+    tabela = Projeto.__table__
+    conexao = db.session.connection()
+
+    if adotados:
+        conexao.execute(
+            tabela.update().where(tabela.c.id == db.bindparam('projeto_id')),
+            [{'projeto_id': projeto_id, 'github_id': github_id}
+             for projeto_id, github_id in adotados.items()]
+        )
+
+    gravar = diff['inserir'] + diff['atualizar']
+    alterados = set()
+    if gravar:
+        upsert = database.dialect_insert(conexao, tabela)
+        conexao.execute(
+            upsert.on_conflict_do_update(
+                index_elements=['github_id'],
+                set_={campo: upsert.excluded[campo] for campo in CAMPOS_SINCRONIZADOS}
+            ),
+            gravar
+        )
+        ids = dict(conexao.execute(
+            select(tabela.c.github_id, tabela.c.id)
+            .where(tabela.c.github_id.in_([p['github_id'] for p in gravar]))
+        ).all())
+        sincronizar_tecnologias_em_massa(
+            conexao, {ids[p['github_id']]: p['tecnologias'] for p in gravar}
+        )
+        alterados = set(ids.values())
+
+    removidos = {p.id for p in diff['remover']}
+    if removidos:
+        vinculos = ProjetoTecnologia.__table__
+        conexao.execute(vinculos.delete().where(vinculos.c.projeto_id.in_(list(removidos))))
+        conexao.execute(tabela.delete().where(tabela.c.id.in_(list(removidos))))
+
+    if alterados or removidos:
+        search.rebuild_index(conexao)
+        relacionados.refresh(conexao, alterados, removidos)
+        incrementar_versao(conexao)
+
+    db.session.commit()
+
+    if alterados or removidos:
+        page_cache.invalidate('index', 'projetos',
+                              *(f'projeto:{i}' for i in alterados | removidos))
+
+class ProjetoSink:
+    """
+    Sink do pipeline que sincroniza a tabela de projetos
 
-    Args:
-        repo (dict): Dados do repositório
+    Acumula os registros e, no close(), carrega os projetos existentes em
+    uma query, calcula o diff em memória e grava tudo em uma transação.
 
-    Returns:
-        str: Descrição HTML formatada
+    Args:
+        remover_ausentes (bool): Remover projetos importados que não
+            vieram nesta passada
     """
-    descricao_base = repo.get('description', 'Projeto desenvolvido com dedicação e boas práticas.')
 
-    descricao_html = f'''
-    <p>{descricao_base}</p>
-
-    <h5>Informações do Repositório:</h5>
-    <ul>
-        <li><strong>Stars:</strong> {repo.get('stargazers_count', 0)} ⭐</li>
-        <li><strong>Forks:</strong> {repo.get('forks_count', 0)} 🍴</li>
-        <li><strong>Última atualização:</strong> {repo.get('updated_at', 'N/A')}</li>
-    </ul>
+    def __init__(self, remover_ausentes=False):
+        self.remover_ausentes = remover_ausentes
+        self.novos = {}
+        self.diff = None
+        self.tempo = 0.0
+
+    def add(self, projeto):
+        self.novos[projeto['id']] = montar_projeto(projeto)
+
+    def close(self):
+        with app.app_context():
+            inicio = time.perf_counter()
+
+            # Uma query para todos os projetos existentes
+            linhas = db.session.execute(
+                select(Projeto.id, Projeto.github_id,
+                       *(getattr(Projeto, c) for c in CAMPOS_SINCRONIZADOS))
+            ).all()
+            existentes = {linha.github_id: linha for linha in linhas if linha.github_id is not None}
+
+            # Projetos importados antes do github_id: reconhece pela URL do
+            # GitHub (gravada nas duas versões do importador) e, sem ela,
+            # pelo título sem diferenciar maiúsculas (a regra de
+            # capitalização mudou de str.title() para format_repo_title)
+            antigos = [linha for linha in linhas if linha.github_id is None]
+            por_url = {chave_url(linha.github_url): linha for linha in antigos if linha.github_url}
+            por_titulo = {linha.titulo.casefold(): linha for linha in antigos if linha.titulo}
+            adotados = {}
+            for github_id, dados in self.novos.items():
+                if github_id in existentes:
+                    continue
+                antigo = (por_url.get(chave_url(dados['github_url']))
+                          or por_titulo.get(dados['titulo'].casefold()))
+                if antigo is not None and antigo.id not in adotados:
+                    adotados[antigo.id] = github_id
+                    existentes[github_id] = antigo
+
+            diff = calcular_diff(self.novos, existentes, self.remover_ausentes)
+
+            for rotulo, chave, icone in (('Novo', 'inserir', '✅'),
+                                         ('Atualizado', 'atualizar', '🔄'),
+                                         ('Removido', 'remover', '🗑️ ')):
+                for projeto in diff[chave]:
+                    titulo = projeto['titulo'] if isinstance(projeto, dict) else projeto.titulo
+                    print(f"  {icone} {rotulo}: {titulo}")
 
-    <p>Este projeto demonstra conhecimento em desenvolvimento de software,
-    seguindo padrões de qualidade e boas práticas de programação.</p>
-    '''
+            try:
+                aplicar_diff(diff, adotados)
+            except Exception as e:
+                db.session.rollback()
+                print(f"  ❌ Erro ao gravar projetos (nenhuma alteração aplicada): {e}")
+                return None
 
-    return descricao_html
+            self.diff = diff
+            self.tempo = time.perf_counter() - inicio
+            return diff
 
-def importar_projetos(username, limite=10, apenas_com_descricao=True):
+def importar_projetos(username, limite=10, apenas_com_descricao=True, remover_ausentes=False):
     """
-    Importa projetos do GitHub para o banco de dados
+    Sincroniza projetos do GitHub com o banco de dados
+
+    Usa o mesmo pipeline de build_portfolio.py (mesmas tecnologias e
+    categorias) e grava tudo em uma transação; executar de novo sem
+    mudanças no GitHub não altera nada.
 
     Args:
         username (str): Nome de usuário do GitHub
         limite (int): Número máximo de projetos a importar
         apenas_com_descricao (bool): Importar apenas repos com descrição
+        remover_ausentes (bool): Remover projetos importados que não estão
+            mais entre os repositórios selecionados
     """
-    repos = buscar_repositorios_github(username)
+    inicio = time.perf_counter()
+
+    def incluir(repo):
+        return should_include_repo(repo) and (repo.get('description') or not apenas_com_descricao)
+
+    pipeline = Pipeline(include=incluir, limit=limite)
+    repos = pipeline.fetch(username)
 
     if not repos:
         print("❌ Nenhum repositório encontrado.")
         return
 
-    with app.app_context():
-        projetos_importados = 0
-        projetos_pulados = 0
-
-        print(f"\n📦 Importando até {limite} projetos...")
-
-        for repo in repos[:limite]:
-            # Filtrar repositórios
-            if apenas_com_descricao and not repo.get('description'):
-                projetos_pulados += 1
-                continue
-
-            if repo.get('fork'):  # Pular forks
-                projetos_pulados += 1
-                continue
+    if remover_ausentes and not pipeline.complete:
+        print("⚠️  Listagem do GitHub incompleta: nenhum projeto será removido nesta execução")
+        remover_ausentes = False
 
-            # Verificar se já existe
-            titulo = repo['name'].replace('-', ' ').replace('_', ' ').title()
-            existe = Projeto.query.filter_by(titulo=titulo).first()
+    print(f"\n📦 Obtendo linguagens de {len(repos)} repositórios...")
+    sink = ProjetoSink(remover_ausentes)
+    diff, = drain(pipeline.stream(repos), sink)
+    if diff is None:
+        return
 
-            if existe:
-                print(f"  ⏭️  Pulado (já existe): {titulo}")
-                projetos_pulados += 1
-                continue
+    tempo_github = time.perf_counter() - inicio - sink.tempo
 
-            # Obter linguagens
-            languages = obter_linguagens_repo(repo['languages_url'])
+    http_cache = get_cache()
+    http_cache.save()
+    http_stats = http_cache.stats()
 
-            # Criar projeto
-            try:
-                projeto = Projeto(
-                    titulo=titulo,
-                    descricao=criar_descricao(repo),
-                    descricao_curta=repo.get('description', 'Projeto do GitHub')[:200],
-                    tecnologias=determinar_tecnologias(languages),
-                    github_url=repo['html_url'],
-                    demo_url=repo.get('homepage') if repo.get('homepage') else None,
-                    categoria=determinar_categoria(languages),
-                    destaque=repo.get('stargazers_count', 0) > 5,  # Destaque se tem 5+ stars
-                    data_criacao=datetime.strptime(repo['created_at'], '%Y-%m-%dT%H:%M:%SZ')
-                )
-
-                db.session.add(projeto)
-                db.session.commit()
-
-                print(f"  ✅ Importado: {titulo}")
-                projetos_importados += 1
-
-            except Exception as e:
-                print(f"  ❌ Erro ao importar {titulo}: {e}")
-                db.session.rollback()
-
-        print(f"\n{'='*60}")
-        print(f"✨ Importação concluída!")
-        print(f"  • Projetos importados: {projetos_importados}")
-        print(f"  • Projetos pulados: {projetos_pulados}")
-        print(f"{'='*60}\n")
+    print(f"\n{'='*60}")
+    print(f"✨ Importação concluída!")
+    print(f"  • Novos: {len(diff['inserir'])}")
+    print(f"  • Atualizados: {len(diff['atualizar'])}")
+    print(f"  • Removidos: {len(diff['remover'])}")
+    print(f"  • Inalterados: {len(diff['inalterados'])}")
+    print(f"  • Pulados (forks/arquivados/sem descrição): {pipeline.skipped}")
+    print(f"  • Tempo: GitHub {tempo_github:.2f}s | banco {sink.tempo * 1000:.0f}ms")
+    print(f"  • Cache HTTP: {http_stats['hits']} hits / {http_stats['misses']} misses")
+    print(f"{'='*60}\n")
 
 def main():
     """Função principal"""
@@ -246,8 +312,11 @@ def main():
     apenas_com_desc = input("Importar apenas repos com descrição? (s/n, padrão: s): ").lower()
     apenas_com_descricao = apenas_com_desc != 'n'
 
+    remover = input("Remover projetos importados que não estão mais na lista? (s/n, padrão: n): ").lower()
+    remover_ausentes = remover == 's'
+
     # Importar
-    importar_projetos(username, limite, apenas_com_descricao)
+    importar_projetos(username, limite, apenas_com_descricao, remover_ausentes)
 
     print("💡 Dica: Execute 'python app.py' para ver seus projetos no portfólio!\n")
 